@@ -31,8 +31,9 @@ NEW_WHEEL_FIXTURE = os.path.join(FIXTURES_DIR, "twine-6.2.0-py3-none-any.whl")
 def build_archive(path, name, archive_format, files):
     filepath = path / f"{name}.{archive_format}"
 
-    if archive_format == "tar.gz":
-        with tarfile.open(filepath, "x:gz") as archive:
+    archive_type, _, compression = archive_format.partition(".")
+    if archive_type == "tar":
+        with tarfile.open(filepath, f"x:{compression}") as archive:
             for mname, content in files.items():
                 if isinstance(content, tarfile.TarInfo):
                     content.name = mname
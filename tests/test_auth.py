@@ -1,8 +1,10 @@
 import base64
+import concurrent.futures
 import getpass
 import logging
 import platform
 import re
+import threading
 import time
 import typing as t
 
@@ -366,7 +368,7 @@ class MockSession:
 
 
 def test_trusted_publish_authenticator_refreshes_token(monkeypatch, config):
-    def make_session():
+    def make_session(concurrency=1):
         return MockSession(
             get_response_list=[
                 MockResponse(status_code=200, json={"audience": "fake-aud"})
@@ -406,7 +408,7 @@ def test_trusted_publish_authenticator_refreshes_token(monkeypatch, config):
 
 
 def test_trusted_publish_authenticator_reuses_token(monkeypatch, config):
-    def make_session():
+    def make_session(concurrency=1):
         return MockSession(
             get_response_list=[
                 MockResponse(status_code=200, json={"audience": "fake-aud"})
@@ -445,6 +447,84 @@ def test_trusted_publish_authenticator_reuses_token(monkeypatch, config):
     )
 
 
+def test_trusted_publishing_reuses_session(monkeypatch, config):
+    """Make every token request with the same session."""
+    sessions = []
+
+    def make_session(concurrency=1):
+        session = MockSession(
+            get_response_list=[
+                MockResponse(status_code=200, json={"audience": "fake-aud"})
+            ]
+            * 2,
+            post_response_list=[
+                MockResponse(
+                    status_code=200,
+                    json={"success": True, "token": "new-token", "expires": 0},
+                ),
+            ]
+            * 2,
+        )
+        sessions.append(session)
+        return session
+
+    monkeypatch.setattr(auth, "detect_credential", lambda audience: "oidc-token")
+    monkeypatch.setattr(auth.utils, "make_requests_session", make_session)
+
+    config.update({"repository": utils.TEST_REPOSITORY})
+    res = auth.Resolver(config, auth.CredentialInput(username="__token__"))
+    assert res.make_trusted_publishing_token() == "new-token"
+    # The token expired immediately, so it's refreshed.
+    assert res.make_trusted_publishing_token() == "new-token"
+
+    assert len(sessions) == 1
+    assert sessions[0].post_counter == 2
+
+
+def test_trusted_publishing_refreshes_token_once_concurrently(monkeypatch, config):
+    """Make a single new token when concurrent uploads need one."""
+    session = MockSession(
+        get_response_list=[
+            MockResponse(status_code=200, json={"audience": "fake-aud"})
+        ],
+        post_response_list=[
+            MockResponse(
+                status_code=200,
+                json={
+                    "success": True,
+                    "token": "new-token",
+                    "expires": int(time.time()) + 900,
+                },
+            ),
+        ],
+    )
+    jobs = 8
+    barrier = threading.Barrier(jobs)
+
+    def detect_credential(audience):
+        # Give the other uploads time to find that the token has expired.
+        time.sleep(0.05)
+        return "oidc-token"
+
+    def make_token(_):
+        barrier.wait()
+        return res.make_trusted_publishing_token()
+
+    monkeypatch.setattr(auth, "detect_credential", detect_credential)
+    monkeypatch.setattr(auth.utils, "make_requests_session", lambda c=1: session)
+
+    config.update({"repository": utils.TEST_REPOSITORY})
+    res = auth.Resolver(config, auth.CredentialInput(username="__token__"))
+    res._tp_token = auth.TrustedPublishingToken(success=True, token="old-token")
+    res._expires = int(time.time())
+
+    with concurrent.futures.ThreadPoolExecutor(jobs) as executor:
+        tokens = list(executor.map(make_token, range(jobs)))
+
+    assert tokens == ["new-token"] * jobs
+    assert session.get_counter == session.post_counter == 1
+
+
 def test_inability_to_make_token_raises_error():
     class MockResolver:
         def make_trusted_publishing_token(self) -> None:
@@ -15,8 +15,12 @@ import logging
 
 import pretend
 import pytest
+import readme_renderer.rst
 
 from tests import helpers
+from twine import cache
+from twine import exceptions
+from twine import package as package_file
 from twine.commands import check
 
 
@@ -197,13 +201,160 @@ def test_passes_markdown_description(content_type, tmp_path, capsys, caplog):
     assert not caplog.record_tuples
 
 
+def test_does_not_hash_distributions(monkeypatch, capsys):
+    """Only read the metadata of a distribution, not its digests."""
+    monkeypatch.setattr(
+        package_file.HashManager, "hash", pretend.raiser(AssertionError("hashed"))
+    )
+
+    assert not check.check([helpers.WHEEL_FIXTURE])
+
+
+def test_check_in_parallel(tmp_path, capsys, caplog):
+    """Display the results of checking in parallel in the order of the dists."""
+    header = """\
+        Metadata-Version: 2.1
+        Name: test-package
+        Version: 1.2.3
+        """
+    rst_header = header + "Description-Content-Type: text/x-rst\n"
+    metadata_by_name = {
+        "passes": rst_header + "\n        test-package\n        ============\n",
+        "fails": rst_header + "\n\n        ============\n",
+        "warns": header,
+    }
+    sdists = []
+    for name, metadata in metadata_by_name.items():
+        (tmp_path / name).mkdir()
+        sdists.append(build_sdist_with_metadata(tmp_path / name, metadata))
+
+    assert check.check(sdists)
+    serial_output = capsys.readouterr().out
+    serial_records = caplog.record_tuples
+    caplog.clear()
+
+    assert check.check(sdists, jobs=3)
+
+    assert capsys.readouterr().out == serial_output
+    assert caplog.record_tuples == serial_records
+    assert [line.split(": ")[-1] for line in serial_output.splitlines()] == [
+        "PASSED",
+        "FAILED",
+        "PASSED with warnings",
+    ]
+
+
+def test_fails_invalid_jobs():
+    with pytest.raises(exceptions.InvalidConfiguration, match="jobs"):
+        check.check([helpers.WHEEL_FIXTURE], jobs=0)
+
+
+@pytest.fixture
+def render(monkeypatch):
+    """Record the descriptions that are rendered."""
+    render = pretend.call_recorder(readme_renderer.rst.render)
+    monkeypatch.setattr(readme_renderer.rst, "render", render)
+    return render
+
+
+def build_sdists_with_description(path, description, count=2):
+    sdists = []
+    for i in range(count):
+        (path / str(i)).mkdir()
+        metadata = f"""\
+        Metadata-Version: 2.1
+        Name: test-package
+        Version: 1.2.{i}
+        Description-Content-Type: text/x-rst
+
+        {description}
+        """
+        sdists.append(build_sdist_with_metadata(path / str(i), metadata))
+    return sdists
+
+
+def test_renders_identical_descriptions_once(render, tmp_path, capsys, caplog):
+    """Replay the warnings of an identical description that's already rendered."""
+    sdists = build_sdists_with_description(tmp_path, "\n        ============")
+
+    assert check.check(sdists)
+
+    assert len(render.calls) == 1
+    assert capsys.readouterr().out.count("FAILED") == 2
+    error = (
+        "twine.commands.check",
+        logging.ERROR,
+        "`long_description` has syntax errors in markup "
+        "and would not be rendered on PyPI.\n"
+        "line 2: Warning: Transition at the end of the document.",
+    )
+    assert caplog.record_tuples == [error, error]
+
+
+def test_render_cache_in_each_run(render, tmp_path):
+    """Render descriptions again in another run, without the render cache."""
+    sdists = build_sdists_with_description(tmp_path, "A test package.", count=1)
+
+    assert not check.check(sdists)
+    assert not check.check(sdists)
+
+    assert len(render.calls) == 2
+
+
+def test_render_cache_across_runs(render, tmp_path, monkeypatch, capsys):
+    """Reuse the results of rendering from an earlier run in the cache directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    sdists = build_sdists_with_description(tmp_path, "\n        ============", 1)
+
+    assert check.check(sdists, render_cache=True)
+    first_output = capsys.readouterr().out
+    assert check.check(sdists, render_cache=True)
+
+    assert len(render.calls) == 1
+    assert capsys.readouterr().out == first_output
+    assert (tmp_path / "cache" / "twine" / "renders").is_dir()
+
+
+def test_render_cache_ignores_invalid_entries(tmp_path):
+    """Ignore a cache entry that can't be used."""
+    render_cache = check._RenderCache(str(tmp_path))
+    key = check._RenderCache.key("description", "text/x-rst", {})
+    render_cache.set(key, True, "")
+    with open(cache.entry_path(str(tmp_path), key), "w") as f:
+        f.write('{"ok": "yes", "warnings": ""}')
+
+    assert check._RenderCache(str(tmp_path)).get(key) is None
+    assert render_cache.get(key) == (True, "")
+
+
+def test_render_cache_key():
+    """Key rendering results by the description, content type, and parameters."""
+    key = check._RenderCache.key("description", "text/x-rst", {})
+
+    assert key == check._RenderCache.key("description", "text/x-rst", {})
+    assert key != check._RenderCache.key("other description", "text/x-rst", {})
+    assert key != check._RenderCache.key("description", "text/markdown", {})
+    assert key != check._RenderCache.key(
+        "description", "text/x-rst", {"charset": "utf-8"}
+    )
+
+
 def test_main(monkeypatch):
     check_result = pretend.stub()
-    check_stub = pretend.call_recorder(lambda a, strict=False: check_result)
+    check_stub = pretend.call_recorder(
+        lambda a, strict=False, jobs=1, render_cache=False: check_result
+    )
     monkeypatch.setattr(check, "check", check_stub)
 
     assert check.main(["dist/*"]) == check_result
-    assert check_stub.calls == [pretend.call(["dist/*"], strict=False)]
+    assert check_stub.calls == [
+        pretend.call(["dist/*"], strict=False, jobs=1, render_cache=False)
+    ]
+
+    assert check.main(["--jobs", "4", "--render-cache", "dist/*"]) == check_result
+    assert check_stub.calls[-1] == pretend.call(
+        ["dist/*"], strict=False, jobs=4, render_cache=True
+    )
 
 
 def test_check_expands_glob(monkeypatch):
@@ -11,6 +11,10 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import argparse
+import os
+import pstats
+
 import pretend
 import pytest
 
@@ -27,6 +31,31 @@ def test_dispatch_to_subcommand(monkeypatch):
     assert replaced_main.calls == [pretend.call(["path/to/file"])]
 
 
+def test_profile_subcommand(monkeypatch, tmp_path):
+    """Write the stats of profiling the subcommand."""
+    monkeypatch.setattr(cli, "args", argparse.Namespace())
+    replaced_main = pretend.call_recorder(lambda args: None)
+    monkeypatch.setattr(upload, "main", replaced_main)
+    path = tmp_path / "twine.prof"
+
+    cli.dispatch(["--profile", str(path), "upload", "path/to/file"])
+
+    assert replaced_main.calls == [pretend.call(["path/to/file"])]
+    assert pstats.Stats(str(path)).total_calls > 0
+
+
+def test_profile_from_environment(monkeypatch, tmp_path):
+    """Profile the subcommand when TWINE_PROFILE is set."""
+    monkeypatch.setattr(cli, "args", argparse.Namespace())
+    monkeypatch.setattr(upload, "main", lambda args: None)
+    path = tmp_path / "twine.prof"
+    monkeypatch.setenv("TWINE_PROFILE", str(path))
+
+    cli.dispatch(["upload", "path/to/file"])
+
+    assert os.path.exists(path)
+
+
 def test_catches_enoent():
     with pytest.raises(SystemExit):
         cli.dispatch(["non-existent-command"])
@@ -0,0 +1,187 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import email.parser
+import email.policy
+import threading
+import time
+
+import pretend
+import pytest
+import requests
+
+from tests import helpers
+from twine import multipart
+
+
+def parse_form(body, content_type):
+    """Parse a multipart/form-data body into a list of (name, filename, content)."""
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body
+    )
+    return [
+        (part.get_param("name", header="content-disposition"), part.get_filename())
+        + (part.get_payload(decode=True),)
+        for part in message.iter_parts()
+    ]
+
+
+def test_encodes_fields():
+    """Encode strings, bytes, and files as form fields."""
+    with open(helpers.WHEEL_FIXTURE, "rb") as fp:
+        contents = fp.read()
+        fp.seek(0)
+
+        body = multipart.MultipartBody(
+            [
+                ("name", "twine"),
+                ("gpg_signature", ("twine.whl.asc", b"signature")),
+                ("content", ("twine.whl", fp, "application/octet-stream")),
+                ("sha256_digest", "abc"),
+            ]
+        )
+        data = b"".join(body)
+
+    assert len(data) == len(body)
+    assert body.content_type == f"multipart/form-data; boundary={body.boundary}"
+    assert parse_form(data, body.content_type) == [
+        ("name", None, b"twine"),
+        ("gpg_signature", "twine.whl.asc", b"signature"),
+        ("content", "twine.whl", contents),
+        ("sha256_digest", None, b"abc"),
+    ]
+
+
+def test_streams_in_chunks():
+    """Combine small fields, and split files into chunks of the given size."""
+    with open(helpers.WHEEL_FIXTURE, "rb") as fp:
+        body = multipart.MultipartBody(
+            [("name", "twine"), ("content", ("twine.whl", fp))], chunk_size=1000
+        )
+        chunks = list(body)
+
+    assert all(len(chunk) == 1000 for chunk in chunks[:-1])
+    assert 0 < len(chunks[-1]) <= 1000
+    assert sum(len(chunk) for chunk in chunks) == len(body)
+
+
+def test_throttles_callback(monkeypatch):
+    """Report progress at most once per interval, and once at the end."""
+    clock = iter([0, 0.05, 0.1, 0.15, 0.2, 0.25, 0.3])
+    monkeypatch.setattr(multipart.time, "monotonic", lambda: next(clock))
+    callback = pretend.call_recorder(lambda bytes_read: None)
+
+    body = multipart.MultipartBody(
+        [("content", ("file", b"x" * 4000))], chunk_size=1000, callback=callback
+    )
+    chunks = list(body)
+
+    assert len(chunks) == 5
+    assert callback.calls == [
+        pretend.call(2000),
+        pretend.call(4000),
+        pretend.call(len(body)),
+    ]
+
+
+def test_sent_with_content_length():
+    """Send the body with a Content-Length header, rather than chunked."""
+    body = multipart.MultipartBody([("name", "twine")])
+    request = requests.Request(
+        "POST",
+        "https://upload.pypi.org/legacy/",
+        data=body,
+        headers={"Content-Type": body.content_type},
+    ).prepare()
+
+    assert request.headers["Content-Length"] == str(len(body))
+    assert "Transfer-Encoding" not in request.headers
+
+
+def test_seek():
+    """Produce the rest of the body from an offset, including within a file."""
+    with open(helpers.WHEEL_FIXTURE, "rb") as fp:
+        body = multipart.MultipartBody(
+            [("name", "twine"), ("content", ("twine.whl", fp))], chunk_size=1000
+        )
+        data = b"".join(body)
+
+        for offset in [0, 10, 200, 5000, len(data) - 1, len(data)]:
+            body.seek(offset)
+            assert len(body) == len(data) - offset
+            assert b"".join(body) == data[offset:]
+            assert body.bytes_read == len(data)
+
+
+def test_token_bucket(monkeypatch):
+    """Wait for enough tokens, allowing a burst of the capacity."""
+    clock = [0.0]
+
+    def sleep(seconds):
+        clock[0] += seconds
+
+    monkeypatch.setattr(multipart.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(multipart.time, "sleep", sleep)
+    bucket = multipart.TokenBucket(1000)
+
+    bucket.acquire(1000)
+    assert clock[0] == 0
+    bucket.acquire(500)
+    assert clock[0] == 0.5
+    # Bigger than the capacity, so tokens are borrowed.
+    bucket.acquire(2000)
+    assert clock[0] == 2.5
+    clock[0] += 10
+    bucket.acquire(1000)
+    assert clock[0] == 12.5
+
+
+@pytest.mark.parametrize(
+    "rate, chunk_size",
+    [
+        (1, 1),
+        (1024, 102),
+        (100_000, 10_000),
+        (100 * 1024 * 1024, multipart.MultipartBody.DEFAULT_CHUNK_SIZE),
+    ],
+)
+def test_token_bucket_chunk_size(rate, chunk_size):
+    """Send a chunk about every tenth of a second, however low the rate."""
+    assert multipart.TokenBucket(rate).chunk_size == chunk_size
+
+
+def test_token_bucket_shared_by_threads():
+    """Limit the total rate of every thread."""
+    bucket = multipart.TokenBucket(1_000_000, capacity=0)
+
+    def send():
+        for _ in range(10):
+            bucket.acquire(10_000)
+
+    threads = [threading.Thread(target=send) for _ in range(2)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert time.monotonic() - start >= 0.19
+
+
+def test_rate_limited_body():
+    """Take tokens for each chunk, before producing it."""
+    bucket = pretend.stub(acquire=pretend.call_recorder(lambda amount: None))
+    body = multipart.MultipartBody(
+        [("content", ("file", b"x" * 4000))], chunk_size=1000, rate_limiter=bucket
+    )
+    chunks = list(body)
+
+    assert bucket.acquire.calls == [pretend.call(len(chunk)) for chunk in chunks]
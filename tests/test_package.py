@@ -11,7 +11,10 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import hashlib
 import json
+import logging
+import shutil
 import string
 
 import packaging
@@ -22,6 +25,7 @@ from packaging import version
 
 from twine import exceptions
 from twine import package as package_file
+from twine import sdist
 
 from . import helpers
 
@@ -307,6 +311,184 @@ def test_hash_manager():
     assert hasher.hexdigest() == TWINE_4_0_2_WHEEL_HEXDIGEST
 
 
+def test_digest_cache_skips_hashing(tmp_path, monkeypatch):
+    """Use the cached digests of an unchanged file instead of hashing it."""
+    filename = tmp_path / "twine-4.0.2-py3-none-any.whl"
+    shutil.copy("tests/fixtures/twine-4.0.2-py3-none-any.whl", filename)
+    digest_cache = package_file.DigestCache(str(tmp_path / "cache"))
+
+    package = package_file.PackageFile.from_filename(
+        str(filename), None, digest_cache=digest_cache
+    )
+    assert package.sha2_digest == TWINE_4_0_2_WHEEL_HEXDIGEST.sha2
+    assert digest_cache.get(str(filename)) == TWINE_4_0_2_WHEEL_HEXDIGEST
+
+    monkeypatch.setattr(
+        package_file.HashManager, "hash", pretend.raiser(AssertionError("hashed"))
+    )
+    package = package_file.PackageFile.from_filename(
+        str(filename), None, hash_file=False, digest_cache=digest_cache
+    )
+    assert package.sha2_digest == TWINE_4_0_2_WHEEL_HEXDIGEST.sha2
+    assert package.blake2_256_digest == TWINE_4_0_2_WHEEL_HEXDIGEST.blake2
+
+
+def test_digest_cache_invalidated_by_changes(tmp_path):
+    """Ignore a cached digest once the file has changed."""
+    filename = tmp_path / "dist.whl"
+    filename.write_bytes(b"original")
+    digest_cache = package_file.DigestCache(str(tmp_path / "cache"))
+    digest_cache.set(str(filename), TWINE_4_0_2_WHEEL_HEXDIGEST)
+    assert digest_cache.get(str(filename)) == TWINE_4_0_2_WHEEL_HEXDIGEST
+
+    filename.write_bytes(b"modified")
+    assert digest_cache.get(str(filename)) is None
+
+
+@pytest.mark.parametrize("entry", ["not json", "[]", '{"fingerprint": {}}'])
+def test_digest_cache_ignores_invalid_entries(entry, tmp_path):
+    """Ignore cache entries that can't be used."""
+    filename = tmp_path / "dist.whl"
+    filename.write_bytes(b"content")
+    digest_cache = package_file.DigestCache(str(tmp_path / "cache"))
+    digest_cache.set(str(filename), TWINE_4_0_2_WHEEL_HEXDIGEST)
+
+    with open(digest_cache._entry_path(str(filename)), "w") as f:
+        f.write(entry)
+
+    assert digest_cache.get(str(filename)) is None
+
+
+def test_digest_cache_write_failure(tmp_path, caplog):
+    """Log, rather than fail, when the cache can't be written."""
+    caplog.set_level(logging.INFO, "twine")
+    filename = tmp_path / "dist.whl"
+    filename.write_bytes(b"content")
+    not_a_directory = tmp_path / "cache"
+    not_a_directory.write_text("")
+    digest_cache = package_file.DigestCache(str(not_a_directory))
+
+    digest_cache.set(str(filename), TWINE_4_0_2_WHEEL_HEXDIGEST)
+
+    assert digest_cache.get(str(filename)) is None
+    assert caplog.messages[0].startswith("Unable to write cache entry")
+
+
+def test_digests_computed_on_first_access(monkeypatch):
+    """Only hash the file when its digests are used."""
+    hash_calls = []
+    original_hash = package_file.HashManager.hash
+
+    def hash(self):
+        hash_calls.append(self.filename)
+        original_hash(self)
+
+    monkeypatch.setattr(package_file.HashManager, "hash", hash)
+
+    filename = "tests/fixtures/twine-4.0.2-py3-none-any.whl"
+    package = package_file.PackageFile.from_filename(filename, None)
+    assert hash_calls == []
+
+    result = package.metadata_dictionary()
+    assert result["sha256_digest"] == TWINE_4_0_2_WHEEL_HEXDIGEST.sha2
+    assert package.blake2_256_digest == TWINE_4_0_2_WHEEL_HEXDIGEST.blake2
+    assert hash_calls == [filename]
+
+
+def test_package_without_hashing():
+    """Omit the digests from the metadata when the file isn't hashed."""
+    filename = "tests/fixtures/twine-4.0.2-py3-none-any.whl"
+    package = package_file.PackageFile.from_filename(filename, None, hash_file=False)
+
+    result = package.metadata_dictionary()
+    assert "sha256_digest" not in result
+    assert "blake2_256_digest" not in result
+
+
+def test_hash_manager_mmap(monkeypatch):
+    """Generate the same hexdigest when hashing a memory-mapped file."""
+    monkeypatch.setattr(package_file.HashManager, "MMAP_THRESHOLD", 0)
+    monkeypatch.setattr(
+        package_file.HashManager,
+        "_hash_buffered",
+        pretend.raiser(AssertionError("read in chunks")),
+    )
+
+    hasher = package_file.HashManager("tests/fixtures/twine-4.0.2-py3-none-any.whl")
+    hasher.hash()
+    assert hasher.hexdigest() == TWINE_4_0_2_WHEEL_HEXDIGEST
+
+
+def test_hash_manager_small_buffer(monkeypatch):
+    """Generate the same hexdigest when reading a file in many chunks."""
+    monkeypatch.setattr(package_file.HashManager, "BUFFER_SIZE", 1000)
+
+    hasher = package_file.HashManager("tests/fixtures/twine-4.0.2-py3-none-any.whl")
+    hasher.hash()
+    assert hasher.hexdigest() == TWINE_4_0_2_WHEEL_HEXDIGEST
+
+
+@pytest.mark.parametrize("exception_class", [OSError, ValueError])
+def test_hash_manager_mmap_unavailable(exception_class, monkeypatch):
+    """Fall back to reading the file in chunks when it can't be memory-mapped."""
+    monkeypatch.setattr(package_file.HashManager, "MMAP_THRESHOLD", 0)
+    monkeypatch.setattr(
+        package_file.mmap, "mmap", pretend.raiser(exception_class("no mmap"))
+    )
+
+    hasher = package_file.HashManager("tests/fixtures/twine-4.0.2-py3-none-any.whl")
+    hasher.hash()
+    assert hasher.hexdigest() == TWINE_4_0_2_WHEEL_HEXDIGEST
+
+
+def test_hash_manager_empty_file(tmp_path, monkeypatch):
+    """Hash an empty file, which can't be memory-mapped."""
+    monkeypatch.setattr(package_file.HashManager, "MMAP_THRESHOLD", 0)
+    filename = tmp_path / "empty.whl"
+    filename.write_bytes(b"")
+
+    hasher = package_file.HashManager(str(filename))
+    hasher.hash()
+    assert hasher.hexdigest().sha2 == hashlib.sha256(b"").hexdigest()
+
+
+@pytest.mark.parametrize("mmap_threshold", [0, float("inf")])
+def test_hash_manager_threaded(mmap_threshold, monkeypatch):
+    """Generate the same hexdigest when computing each digest on its own thread."""
+    monkeypatch.setattr(package_file.HashManager, "THREADED_THRESHOLD", 0)
+    monkeypatch.setattr(package_file.HashManager, "MMAP_THRESHOLD", mmap_threshold)
+    monkeypatch.setattr(package_file.HashManager, "BUFFER_SIZE", 1000)
+    monkeypatch.setattr(
+        package_file.HashManager,
+        "update",
+        pretend.raiser(AssertionError("hashed serially")),
+    )
+
+    filename = "tests/fixtures/twine-4.0.2-py3-none-any.whl"
+    hasher = package_file.HashManager(filename, threaded=True)
+    hasher.hash()
+    assert hasher.hexdigest() == TWINE_4_0_2_WHEEL_HEXDIGEST
+
+
+def test_hash_manager_not_threaded_by_default():
+    """Only hash on separate threads when it's requested."""
+    filename = "tests/fixtures/twine-4.0.2-py3-none-any.whl"
+    assert not package_file.HashManager(filename).threaded
+
+
+def test_fips_hash_manager_threaded(monkeypatch):
+    """Hash serially when BLAKE2 is unavailable, even if threading is requested."""
+    monkeypatch.setattr(package_file.HashManager, "THREADED_THRESHOLD", 0)
+    replaced_blake2b = pretend.raiser(ValueError("fipsmode"))
+    monkeypatch.setattr(package_file.hashlib, "blake2b", replaced_blake2b)
+
+    filename = "tests/fixtures/twine-4.0.2-py3-none-any.whl"
+    hasher = package_file.HashManager(filename, threaded=True)
+    hasher.hash()
+    hashes = TWINE_4_0_2_WHEEL_HEXDIGEST._replace(blake2=None)
+    assert hasher.hexdigest() == hashes
+
+
 @pytest.mark.parametrize("exception_class", [TypeError, ValueError])
 def test_fips_hash_manager_blake2(exception_class, monkeypatch):
     """Generate hexdigest without BLAKE2 when hashlib is using FIPS mode."""
@@ -417,6 +599,45 @@ def test_package_from_sdist():
     assert p.python_version == "source"
 
 
+@pytest.mark.parametrize("archive_format", ["tar.bz2", "tar.xz"])
+def test_package_from_compressed_sdist(archive_format, tmp_path):
+    filename = helpers.build_archive(
+        tmp_path,
+        "test-1.2.3",
+        archive_format,
+        {
+            "test-1.2.3/PKG-INFO": (
+                "Metadata-Version: 1.1\nName: test\nVersion: 1.2.3\n"
+            ),
+        },
+    )
+    p = package_file.PackageFile.from_filename(str(filename), comment=None)
+    assert p.python_version == "source"
+    assert p.safe_name == "test"
+
+
+def test_package_from_registered_sdist_format(monkeypatch, tmp_path):
+    """Read sdists with a format that was registered after importing twine."""
+    monkeypatch.setattr(sdist, "FORMATS", dict(sdist.FORMATS))
+
+    class TarSDist(sdist.TarSDist):
+        COMPRESSION = ""
+
+    sdist.register_format(".tar", TarSDist)
+    filename = helpers.build_archive(
+        tmp_path,
+        "test-1.2.3",
+        "tar",
+        {
+            "test-1.2.3/PKG-INFO": (
+                "Metadata-Version: 1.1\nName: test\nVersion: 1.2.3\n"
+            ),
+        },
+    )
+    p = package_file.PackageFile.from_filename(str(filename), comment=None)
+    assert p.python_version == "source"
+
+
 def test_package_from_unrecognized_file_error():
     filename = "twine/package.py"
     with pytest.raises(exceptions.InvalidDistribution) as err:
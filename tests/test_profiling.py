@@ -0,0 +1,68 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pstats
+import threading
+
+import pytest
+
+from twine import profiling
+
+
+def test_span_without_profiling():
+    """Do nothing when a command isn't being profiled."""
+    with profiling.span("phase"):
+        pass
+
+    assert profiling._spans is None
+
+
+def test_run_writes_stats(tmp_path):
+    """Write the stats of the command, including spans from every thread."""
+    path = tmp_path / "twine.prof"
+
+    def upload():
+        with profiling.span("upload"):
+            pass
+
+    def command(value):
+        with profiling.span("phase"):
+            thread = threading.Thread(target=upload)
+            thread.start()
+            thread.join()
+        with profiling.span("phase"):
+            pass
+        return value
+
+    assert profiling.run(str(path), command, "result") == "result"
+
+    stats = pstats.Stats(str(path)).stats
+    calls, _, internal, cumulative, _ = stats[(profiling.SPAN_FILENAME, 0, "phase")]
+    assert calls == 2
+    assert internal == 0
+    assert cumulative > 0
+    assert stats[(profiling.SPAN_FILENAME, 0, "upload")][0] == 1
+    assert profiling._spans is None
+
+
+def test_run_writes_stats_after_failure(tmp_path):
+    """Write the stats when the command fails."""
+    path = tmp_path / "twine.prof"
+
+    def command():
+        with profiling.span("phase"):
+            raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        profiling.run(str(path), command)
+
+    stats = pstats.Stats(str(path)).stats
+    assert (profiling.SPAN_FILENAME, 0, "phase") in stats
@@ -0,0 +1,49 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from twine import progress
+
+
+def tasks(upload_progress):
+    return [
+        (task.description, task.completed, task.total)
+        for task in upload_progress._progress.tasks
+    ]
+
+
+def test_tracks_uploads_in_total():
+    """Count the progress of each upload towards the total, scaled to its file."""
+    upload_progress = progress.UploadProgress(2, 3000, disable=True)
+
+    with upload_progress.track("a.whl", 1100, 1000) as update_a:
+        with upload_progress.track("b.tar.gz", 2200, 2000) as update_b:
+            update_a(550)
+            update_b(1100)
+            assert tasks(upload_progress) == [
+                ("Total (0/2 files)", 1500, 3000),
+                ("a.whl", 550, 1100),
+                ("b.tar.gz", 1100, 2200),
+            ]
+        upload_progress.finish(2000)
+
+    upload_progress.finish(1000)
+    assert tasks(upload_progress) == [("Total (2/2 files)", 3000, 3000)]
+
+
+def test_ignores_abandoned_uploads():
+    """Ignore the progress of an upload after its row is removed, e.g. when stalled."""
+    upload_progress = progress.UploadProgress(1, 1000, disable=True)
+
+    with upload_progress.track("a.whl", 1000, 1000) as update:
+        update(100)
+    update(500)
+
+    assert tasks(upload_progress) == [("Total (0/1 files)", 0, 1000)]
@@ -0,0 +1,76 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+
+import pytest
+
+from twine import report
+
+from . import helpers
+
+
+@pytest.mark.parametrize(
+    "body_started, body_finished, expected",
+    [
+        (None, None, {"connect": 10}),
+        (1, None, {"connect": 1, "transfer": 9}),
+        (1, 4, {"connect": 1, "transfer": 3, "response": 6}),
+    ],
+)
+def test_add_request(body_started, body_finished, expected):
+    """Split a request into the phases that happened before it ended."""
+    timings = report.Timings()
+    timings.add_request(0, body_started, body_finished, 10)
+
+    assert timings.seconds == expected
+
+
+def test_phases_accumulate():
+    """Add the time of a phase that happens more than once."""
+    timings = report.Timings()
+    timings.add("connect", 1.5)
+    timings.add("connect", 2)
+
+    assert timings.seconds == {"connect": 3.5}
+
+
+def test_write(tmp_path):
+    """Write the timings of each distribution, with phases in order."""
+    timings = report.Timings()
+    timings.add("response", 2)
+    timings.add("parse", 0.5)
+    timings.bytes_sent = 1024
+    timings.outcome = "uploaded"
+    path = tmp_path / "report.json"
+
+    report.write(
+        str(path),
+        "https://upload.pypi.org/legacy/",
+        {helpers.WHEEL_FIXTURE: timings},
+        3,
+    )
+
+    assert json.loads(path.read_text()) == {
+        "repository": "https://upload.pypi.org/legacy/",
+        "seconds": 3,
+        "distributions": [
+            {
+                "filename": "twine-4.0.2-py3-none-any.whl",
+                "size": os.path.getsize(helpers.WHEEL_FIXTURE),
+                "outcome": "uploaded",
+                "bytes_sent": 1024,
+                "retries": 0,
+                "seconds": {"parse": 0.5, "response": 2},
+            }
+        ],
+    }
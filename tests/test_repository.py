@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import logging
+import threading
+import time
 from contextlib import contextmanager
 
 import packaging
@@ -20,8 +22,11 @@ import pytest
 import requests
 from packaging import version
 
+from twine import exceptions
 from twine import package
+from twine import report
 from twine import repository
+from twine import retry
 from twine import utils
 
 
@@ -115,30 +120,30 @@ def response_with(**kwattrs):
 
 
 def test_package_is_uploaded_404s(default_repo):
-    """Return False when the project API response status isn't 200."""
+    """Return False when the release API response status isn't 200."""
     default_repo.session = pretend.stub(
-        get=lambda url, headers: response_with(status_code=404)
+        get=lambda url, headers, timeout: response_with(status_code=404)
     )
-    package = pretend.stub(safe_name="fake", version="2.12.0")
+    package = pretend.stub(safe_name="fake", version="2.12.0", basefilename="fake.whl")
 
     assert default_repo.package_is_uploaded(package) is False
 
 
-def test_package_is_uploaded_200s_with_no_releases(default_repo):
-    """Return False when the list of releases for a project is empty."""
+def test_package_is_uploaded_200s_with_no_files(default_repo):
+    """Return False when the list of files for a release is empty."""
     default_repo.session = pretend.stub(
-        get=lambda url, headers: response_with(
-            status_code=200, _content=b'{"releases": {}}', _content_consumed=True
+        get=lambda url, headers, timeout: response_with(
+            status_code=200, _content=b'{"urls": []}', _content_consumed=True
         ),
     )
-    package = pretend.stub(safe_name="fake", version="2.12.0")
+    package = pretend.stub(safe_name="fake", version="2.12.0", basefilename="fake.whl")
 
     assert default_repo.package_is_uploaded(package) is False
 
 
-def test_package_is_uploaded_with_releases_using_cache(default_repo):
-    """Return True when the package is in the releases cache."""
-    default_repo._releases_json_data = {"fake": {"0.1": [{"filename": "fake.whl"}]}}
+def test_package_is_uploaded_with_files_using_cache(default_repo):
+    """Return True when the package is in the cache of uploaded files."""
+    default_repo._uploaded_files = {("fake", "0.1"): {"fake.whl": None}}
     package = pretend.stub(
         safe_name="fake",
         version="0.1",
@@ -148,15 +153,17 @@ def test_package_is_uploaded_with_releases_using_cache(default_repo):
     assert default_repo.package_is_uploaded(package) is True
 
 
-def test_package_is_uploaded_with_releases_not_using_cache(default_repo):
-    """Return True when the package is in the list of releases for a project."""
-    default_repo.session = pretend.stub(
-        get=lambda url, headers: response_with(
+def test_package_is_uploaded_with_files_not_using_cache(default_repo):
+    """Return True when the package is in the list of files for a release."""
+    get = pretend.call_recorder(
+        lambda url, headers, timeout: response_with(
             status_code=200,
-            _content=b'{"releases": {"0.1": [{"filename": "fake.whl"}]}}',
+            _content=b'{"urls": [{"filename": "fake.whl"}]}',
             _content_consumed=True,
-        ),
+        )
     )
+    default_repo.session = pretend.stub(get=get)
+    default_repo._uploaded_files = {("fake", "0.1"): {}}
     package = pretend.stub(
         safe_name="fake",
         version="0.1",
@@ -164,14 +171,21 @@ def test_package_is_uploaded_with_releases_not_using_cache(default_repo):
     )
 
     assert default_repo.package_is_uploaded(package, bypass_cache=True) is True
+    assert get.calls == [
+        pretend.call(
+            "https://pypi.python.org/pypi/fake/0.1/json",
+            headers={"Accept": "application/json"},
+            timeout=None,
+        )
+    ]
 
 
 def test_package_is_uploaded_different_filenames(default_repo):
-    """Return False when the package is not in the list of releases for a project."""
+    """Return False when the package is not in the list of files for a release."""
     default_repo.session = pretend.stub(
-        get=lambda url, headers: response_with(
+        get=lambda url, headers, timeout: response_with(
             status_code=200,
-            _content=b'{"releases": {"0.1": [{"filename": "fake.whl"}]}}',
+            _content=b'{"urls": [{"filename": "fake.whl"}]}',
             _content_consumed=True,
         ),
     )
@@ -184,6 +198,173 @@ def test_package_is_uploaded_different_filenames(default_repo):
     assert default_repo.package_is_uploaded(package) is False
 
 
+def test_prefetch_uploaded_filenames(default_repo):
+    """Fetch the uploaded files once per release."""
+    get = pretend.call_recorder(
+        lambda url, headers, timeout: response_with(
+            status_code=200,
+            _content=b'{"urls": [{"filename": "fake-0.1.tar.gz"}]}',
+            _content_consumed=True,
+        )
+    )
+    default_repo.session = pretend.stub(get=get)
+    packages = [
+        pretend.stub(safe_name="fake", version="0.1", basefilename=filename)
+        for filename in ["fake-0.1.tar.gz", "fake-0.1-py3-none-any.whl"]
+    ]
+
+    default_repo.prefetch_uploaded_filenames(packages)
+    assert [default_repo.package_is_uploaded(p) for p in packages] == [True, False]
+    assert len(get.calls) == 1
+
+
+def test_uploaded_filenames_cached_by_etag(default_repo, tmp_path):
+    """Reuse the uploaded files from an earlier run when they haven't changed."""
+    default_repo.release_cache_dir = str(tmp_path)
+    responses = [
+        response_with(
+            status_code=200,
+            headers={"ETag": '"v1"'},
+            _content=b'{"urls": [{"filename": "fake.whl"}]}',
+            _content_consumed=True,
+        ),
+        response_with(status_code=304),
+    ]
+    get = pretend.call_recorder(lambda url, headers, timeout: responses.pop(0))
+    default_repo.session = pretend.stub(get=get)
+    package = pretend.stub(safe_name="fake", version="0.1", basefilename="fake.whl")
+
+    assert default_repo.package_is_uploaded(package) is True
+    assert default_repo.package_is_uploaded(package, bypass_cache=True) is True
+
+    assert "If-None-Match" not in get.calls[0].kwargs["headers"]
+    assert get.calls[1].kwargs["headers"]["If-None-Match"] == '"v1"'
+
+
+TWINE_4_0_2_WHEEL_SHA256 = (
+    "929bc3c280033347a00f847236564d1c52a3e61b1ac2516c97c48f3ceab756d8"
+)
+
+
+@pytest.fixture
+def simple_index_repo():
+    return repository.Repository(
+        repository_url="https://example.com/upload/",
+        username="username",
+        password="password",
+        index_url="https://example.com/simple",
+    )
+
+
+@pytest.mark.parametrize(
+    "content_type, content",
+    [
+        (
+            "application/vnd.pypi.simple.v1+json",
+            b'{"meta": {"api-version": "1.0"}, "name": "twine", "files": ['
+            b'{"filename": "twine-4.0.2-py3-none-any.whl", "url": "/f/twine.whl",'
+            b' "hashes": {"sha256": "%s"}},'
+            b'{"filename": "twine-4.0.2.tar.gz", "url": "/f/twine.tar.gz",'
+            b' "hashes": {}}]}',
+        ),
+        (
+            "text/html",
+            b"<!DOCTYPE html><html><body>"
+            b'<a href="/f/twine-4.0.2-py3-none-any.whl#sha256=%s">'
+            b"twine-4.0.2-py3-none-any.whl</a><br>"
+            b'<a href="/f/twine-4.0.2.tar.gz"></a><br>'
+            b"</body></html>",
+        ),
+    ],
+    ids=["json", "html"],
+)
+def test_package_is_uploaded_to_simple_index(simple_index_repo, content_type, content):
+    """Find uploaded files, and their digests, in a JSON or HTML simple index."""
+    sha256 = TWINE_4_0_2_WHEEL_SHA256
+    get = pretend.call_recorder(
+        lambda url, headers, timeout: response_with(
+            status_code=200,
+            headers={"Content-Type": content_type},
+            _content=content.replace(b"%s", sha256.encode()),
+            _content_consumed=True,
+            encoding="utf-8",
+        )
+    )
+    simple_index_repo.session = pretend.stub(get=get)
+
+    uploaded = package.PackageFile.from_filename(
+        "tests/fixtures/twine-4.0.2-py3-none-any.whl", None
+    )
+    not_uploaded = package.PackageFile.from_filename(
+        "tests/fixtures/twine-6.2.0-py3-none-any.whl", None
+    )
+    # The name of an uploaded file without a digest is enough.
+    no_digest = pretend.stub(
+        safe_name="twine", version="4.0.2", basefilename="twine-4.0.2.tar.gz"
+    )
+
+    simple_index_repo.prefetch_uploaded_filenames([uploaded, not_uploaded])
+    assert simple_index_repo.package_is_uploaded(uploaded) is True
+    assert simple_index_repo.package_is_uploaded(not_uploaded) is False
+    assert simple_index_repo.package_is_uploaded(no_digest) is True
+
+    assert get.calls == [
+        pretend.call(
+            "https://example.com/simple/twine/",
+            headers={"Accept": "application/vnd.pypi.simple.v1+json, text/html;q=0.1"},
+            timeout=None,
+        )
+    ]
+
+
+def test_package_is_uploaded_with_different_digest(simple_index_repo):
+    """Fail for a file with the name of an uploaded file, but other contents."""
+    simple_index_repo._uploaded_files = {
+        ("twine", None): {"twine-4.0.2-py3-none-any.whl": "0" * 64}
+    }
+    uploaded = package.PackageFile.from_filename(
+        "tests/fixtures/twine-4.0.2-py3-none-any.whl", None, hash_file=False
+    )
+
+    with pytest.raises(
+        exceptions.PackageIntegrityMismatch,
+        match="twine-4.0.2-py3-none-any.whl has already been uploaded with different",
+    ):
+        simple_index_repo.package_is_uploaded(uploaded)
+    # The file was hashed to compare it.
+    assert uploaded.sha2_digest is not None
+
+
+@pytest.mark.parametrize(
+    "uploaded_files",
+    [
+        {},
+        {"twine-4.0.2-py3-none-any.whl": None},
+        {"twine-4.0.2-py3-none-any.whl": TWINE_4_0_2_WHEEL_SHA256},
+    ],
+)
+def test_verify_package_integrity(simple_index_repo, uploaded_files):
+    """Pass when there's no uploaded file or digest, or the digests match."""
+    simple_index_repo._uploaded_files = {("twine", None): uploaded_files}
+    uploaded = package.PackageFile.from_filename(
+        "tests/fixtures/twine-4.0.2-py3-none-any.whl", None
+    )
+
+    simple_index_repo.verify_package_integrity(uploaded)
+
+
+def test_verify_package_integrity_without_index(default_repo):
+    """Don't look up uploaded files for repositories that don't list them."""
+    default_repo.url = "https://example.com/upload/"
+    default_repo.session = pretend.stub()
+
+    default_repo.verify_package_integrity(
+        package.PackageFile.from_filename(
+            "tests/fixtures/twine-4.0.2-py3-none-any.whl", None
+        )
+    )
+
+
 @pytest.mark.parametrize("disable_progress_bar", [True, False])
 def test_disable_progress_bar_is_forwarded_to_rich(
     monkeypatch, tmpdir, disable_progress_bar, default_repo
@@ -203,7 +384,9 @@ def test_disable_progress_bar_is_forwarded_to_rich(
     default_repo.disable_progress_bar = disable_progress_bar
 
     default_repo.session = pretend.stub(
-        post=lambda url, data, allow_redirects, headers: response_with(status_code=200)
+        post=lambda url, data, allow_redirects, headers, timeout: response_with(
+            status_code=200
+        )
     )
 
     fakefile = tmpdir.join("fake.whl")
@@ -218,54 +401,524 @@ def test_disable_progress_bar_is_forwarded_to_rich(
         basefilename="fake.whl",
         filename=str(fakefile),
         metadata_dictionary=dictfunc,
+        timings=report.Timings(),
     )
 
     default_repo.upload(package)
 
 
-def test_upload_retry(tmpdir, default_repo, caplog):
-    """Print retry messages when the upload response indicates a server error."""
-    default_repo.disable_progress_bar = True
+@pytest.fixture
+def sleep(monkeypatch):
+    sleep = pretend.call_recorder(lambda seconds: None)
+    monkeypatch.setattr(repository.time, "sleep", sleep)
+    monkeypatch.setattr(retry.random, "random", lambda: 0.5)
+    return sleep
 
-    default_repo.session = pretend.stub(
-        post=lambda url, data, allow_redirects, headers: response_with(
-            status_code=500, reason="Internal server error"
-        )
-    )
 
+@pytest.fixture
+def fake_package(tmpdir):
     fakefile = tmpdir.join("fake.whl")
     fakefile.write(".")
 
-    package = pretend.stub(
+    return pretend.stub(
         safe_name="fake",
         metadata=pretend.stub(version="2.12.0"),
         basefilename="fake.whl",
         filename=str(fakefile),
         metadata_dictionary=lambda: {"name": "fake"},
+        set_digests=lambda hexdigest=None: hexdigest,
+        timings=report.Timings(),
     )
 
-    # Upload with default max_redirects of 5
-    default_repo.upload(package)
 
+def test_upload_retry(default_repo, fake_package, sleep, caplog):
+    """Print retry messages when the upload response indicates a server error."""
+    default_repo.disable_progress_bar = True
+
+    default_repo.session = pretend.stub(
+        post=lambda url, data, allow_redirects, headers, timeout: response_with(
+            status_code=500, reason="Internal server error"
+        )
+    )
+
+    # Upload with the default of 5 retries
+    default_repo.upload(fake_package)
+
+    # The delay doubles, and half of it is skipped as jitter.
+    delays = [0.5, 1, 2, 4, 8]
     assert caplog.messages == [
         (
             'Received "500: Internal server error"\n'
-            f"Package upload appears to have failed. Retry {i} of 5."
+            f"Package upload appears to have failed. Retry {i} of 5"
+            f" in {delay:.1f} seconds."
         )
-        for i in range(1, 6)
+        for i, delay in enumerate(delays, 1)
     ]
+    assert sleep.calls == [pretend.call(delay) for delay in delays]
 
     caplog.clear()
 
-    # Upload with custom max_redirects of 3
-    default_repo.upload(package, 3)
+    # Upload with a custom number of retries
+    default_repo.upload(fake_package, max_retries=3)
 
     assert caplog.messages == [
         (
             'Received "500: Internal server error"\n'
-            f"Package upload appears to have failed. Retry {i} of 3."
+            f"Package upload appears to have failed. Retry {i} of 3"
+            f" in {delay:.1f} seconds."
         )
-        for i in range(1, 4)
+        for i, delay in enumerate(delays[:3], 1)
+    ]
+
+
+def test_upload_max_redirects_deprecated(default_repo, fake_package, sleep):
+    """Make at most ``max_redirects`` attempts, including the first."""
+    default_repo.disable_progress_bar = True
+    post = pretend.call_recorder(
+        lambda url, data, allow_redirects, headers, timeout: response_with(
+            status_code=500, reason="Internal server error"
+        )
+    )
+    default_repo.session = pretend.stub(post=post)
+
+    with pytest.warns(DeprecationWarning, match="max_redirects is deprecated"):
+        resp = default_repo.upload(fake_package, 3)
+
+    assert resp.status_code == 500
+    assert len(post.calls) == 3
+
+
+def test_upload_timings(default_repo, fake_package, sleep):
+    """Record the phases, bytes, and retries of every attempt of an upload."""
+    default_repo.disable_progress_bar = True
+    responses = iter([500, 200])
+
+    def post(url, data, allow_redirects, headers, timeout):
+        for _ in data:
+            pass
+        return response_with(status_code=next(responses))
+
+    default_repo.session = pretend.stub(post=post)
+
+    default_repo.upload(fake_package)
+
+    timings = fake_package.timings
+    assert timings.retries == 1
+    assert timings.bytes_sent > 0
+    assert timings.bytes_sent % 2 == 0
+    assert list(timings.seconds) == ["connect", "transfer", "response"]
+
+
+def test_upload_retry_after(default_repo, fake_package, sleep):
+    """Wait for the Retry-After of a response, when it's longer than the backoff."""
+    default_repo.disable_progress_bar = True
+    responses = iter(
+        [
+            response_with(status_code=503, headers={"Retry-After": "30"}),
+            response_with(status_code=429, headers={"Retry-After": "0"}),
+            response_with(status_code=200),
+        ]
+    )
+    default_repo.session = pretend.stub(
+        post=lambda url, data, allow_redirects, headers, timeout: next(responses)
+    )
+
+    assert default_repo.upload(fake_package).status_code == 200
+    assert sleep.calls == [pretend.call(30), pretend.call(1)]
+
+
+def test_upload_retry_connection_errors(default_repo, fake_package, sleep, caplog):
+    """Retry uploads that time out, with the policy's timeout for each attempt."""
+    default_repo.disable_progress_bar = True
+    default_repo.retry_policy = retry.RetryPolicy(
+        max_retries=1, attempt_timeout=(5, 30)
+    )
+    post = pretend.call_recorder(
+        pretend.raiser(requests.ReadTimeout("Read timed out."))
+    )
+    default_repo.session = pretend.stub(post=post)
+
+    with pytest.raises(requests.ReadTimeout):
+        default_repo.upload(fake_package)
+
+    assert len(post.calls) == 2
+    assert all(call.kwargs["timeout"] == (5, 30) for call in post.calls)
+    assert caplog.messages == [
+        "ReadTimeout: Read timed out.\n"
+        "Package upload appears to have failed. Retry 1 of 1 in 0.5 seconds."
+    ]
+
+
+def test_upload_retry_deadline(default_repo, fake_package, sleep, monkeypatch):
+    """Stop retrying when the next retry would start after the deadline."""
+    clock = [0.0]
+
+    def advance(seconds):
+        clock[0] += seconds
+
+    monkeypatch.setattr(repository.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(repository.time, "sleep", advance)
+
+    default_repo.disable_progress_bar = True
+    default_repo.retry_policy = retry.RetryPolicy(deadline=5)
+    post = pretend.call_recorder(
+        lambda url, data, allow_redirects, headers, timeout: response_with(
+            status_code=502
+        )
+    )
+    default_repo.session = pretend.stub(post=post)
+
+    assert default_repo.upload(fake_package).status_code == 502
+    # The retries are after 0.5, 1.5, and 3.5 seconds, and the next after 7.5.
+    assert len(post.calls) == 4
+
+
+def test_timeout_limited_by_deadline(monkeypatch):
+    """Limit the timeout of every request by the time left until the deadline."""
+    clock = [100.0]
+    monkeypatch.setattr(repository.time, "monotonic", lambda: clock[0])
+    repo = repository.Repository(
+        utils.DEFAULT_REPOSITORY, None, None, timeout=(10, 300), deadline=60
+    )
+
+    assert repo._timeout() == (10, 60)
+    assert repo._timeout((5, None)) == (5, 60)
+
+    clock[0] = 155.0
+    assert repo._timeout() == (5, 5)
+
+    clock[0] = 160.0
+    with pytest.raises(exceptions.DeadlineExceeded, match="60 seconds"):
+        repo._timeout()
+
+
+@pytest.fixture
+def watched_repo(monkeypatch):
+    monkeypatch.setattr(repository.Repository, "WATCHDOG_INTERVAL", 0.01)
+    return repository.Repository(
+        utils.DEFAULT_REPOSITORY,
+        "username",
+        "password",
+        disable_progress_bar=True,
+        retry_policy=retry.RetryPolicy(max_retries=0),
+    )
+
+
+def test_upload_stalled(watched_repo, fake_package):
+    """Abandon an upload when none of it has been sent for the stall timeout."""
+    watched_repo.stall_timeout = 0.05
+    unblock = threading.Event()
+
+    def post(url, data, allow_redirects, headers, timeout):
+        # Connect, but don't send any of the body.
+        unblock.wait()
+
+    watched_repo.session = pretend.stub(post=post)
+
+    with pytest.raises(exceptions.UploadStalled, match="no data was sent for 0.05"):
+        watched_repo.upload(fake_package)
+    unblock.set()
+
+
+def test_upload_stall_timeout_excludes_response(watched_repo, fake_package):
+    """Wait for the read timeout, rather than the stall timeout, for the response."""
+    watched_repo.stall_timeout = 0.05
+
+    def post(url, data, allow_redirects, headers, timeout):
+        for _ in data:
+            pass
+        time.sleep(0.1)
+        return response_with(status_code=200)
+
+    watched_repo.session = pretend.stub(post=post)
+
+    assert watched_repo.upload(fake_package).status_code == 200
+
+
+def test_upload_slow_but_steady(watched_repo, tmpdir):
+    """Don't abandon an upload that's sent slowly, but without stalling."""
+    watched_repo.stall_timeout = 0.2
+    fakefile = tmpdir.join("fake.whl")
+    fakefile.write_binary(b"x" * 1024 * 1024)
+    slow_package = pretend.stub(
+        safe_name="fake",
+        metadata=pretend.stub(version="2.12.0"),
+        basefilename="fake.whl",
+        filename=str(fakefile),
+        metadata_dictionary=lambda: {"name": "fake"},
+        set_digests=lambda hexdigest=None: hexdigest,
+        timings=report.Timings(),
+    )
+
+    def post(url, data, allow_redirects, headers, timeout):
+        # Send the body at about 2 MiB/s, so a 1 MiB chunk would take longer than
+        # the stall timeout.
+        for chunk in data:
+            time.sleep(len(chunk) / (2 * 1024 * 1024))
+        return response_with(status_code=200)
+
+    watched_repo.session = pretend.stub(post=post)
+
+    assert watched_repo.upload(slow_package).status_code == 200
+
+
+def test_upload_deadline(watched_repo, fake_package):
+    """Abandon an upload that's still being sent when the deadline passes."""
+    watched_repo._deadline = time.monotonic() + 0.05
+    watched_repo.deadline = 0.05
+    unblock = threading.Event()
+
+    def post(url, data, allow_redirects, headers, timeout):
+        assert timeout[1] <= 0.05
+        unblock.wait()
+
+    watched_repo.session = pretend.stub(post=post)
+
+    with pytest.raises(exceptions.DeadlineExceeded):
+        watched_repo.upload(fake_package)
+    unblock.set()
+
+
+def test_upload_max_rate(monkeypatch):
+    """Send smaller chunks, at the maximum rate, for a rate-limited repository."""
+    monkeypatch.setattr(repository.multipart.time, "sleep", lambda seconds: None)
+    repo = repository.Repository(
+        utils.DEFAULT_REPOSITORY,
+        "username",
+        "password",
+        disable_progress_bar=True,
+        max_rate=100_000,
+    )
+    acquire = pretend.call_recorder(repo.rate_limiter.acquire)
+    monkeypatch.setattr(repo.rate_limiter, "acquire", acquire)
+    chunk_sizes = []
+
+    def post(url, data, allow_redirects, headers, timeout):
+        chunk_sizes.extend(len(chunk) for chunk in data)
+        return response_with(status_code=200)
+
+    repo.session = pretend.stub(post=post)
+    filename = "tests/fixtures/twine-4.0.2-py3-none-any.whl"
+    repo.upload(package.PackageFile.from_filename(filename, None))
+
+    assert max(chunk_sizes) == 10_000
+    assert acquire.calls == [pretend.call(size) for size in chunk_sizes]
+
+
+def test_upload_hashes_while_sending(default_repo):
+    """Send the digests after the file contents, when it wasn't hashed beforehand."""
+    default_repo.disable_progress_bar = True
+    bodies = []
+
+    def post(url, data, allow_redirects, headers, timeout):
+        bodies.append(b"".join(data))
+        return response_with(status_code=200)
+
+    default_repo.session = pretend.stub(post=post)
+
+    filename = "tests/fixtures/twine-4.0.2-py3-none-any.whl"
+    package_file = package.PackageFile.from_filename(filename, None, hash_file=False)
+    assert package_file.sha2_digest is None
+
+    default_repo.upload(package_file)
+
+    hasher = package.HashManager(filename)
+    hasher.hash()
+    expected = hasher.hexdigest()
+    with open(filename, "rb") as fp:
+        contents = fp.read()
+
+    body = bodies[0]
+    sha256_field = b'name="sha256_digest"\r\n\r\n' + expected.sha2.encode()
+    blake2_field = b'name="blake2_256_digest"\r\n\r\n' + expected.blake2.encode()
+    assert body.index(contents) < body.index(sha256_field)
+    assert body.index(contents) < body.index(blake2_field)
+    assert package_file.sha2_digest == expected.sha2
+    assert package_file.blake2_256_digest == expected.blake2
+
+    # A retry sends the digests up front.
+    default_repo.upload(package_file)
+
+    body = bodies[1]
+    assert body.index(sha256_field) < body.index(contents)
+
+
+def test_upload_hashes_while_sending_without_blake2(default_repo, monkeypatch):
+    """Only send the sha256 digest after the file contents when FIPS is enabled."""
+    monkeypatch.setattr(
+        package.hashlib, "blake2b", pretend.raiser(ValueError("fipsmode"))
+    )
+    default_repo.disable_progress_bar = True
+    bodies = []
+
+    def post(url, data, allow_redirects, headers, timeout):
+        bodies.append(b"".join(data))
+        return response_with(status_code=200)
+
+    default_repo.session = pretend.stub(post=post)
+
+    filename = "tests/fixtures/twine-4.0.2-py3-none-any.whl"
+    package_file = package.PackageFile.from_filename(filename, None, hash_file=False)
+    default_repo.upload(package_file)
+
+    assert b'name="sha256_digest"' in bodies[0]
+    assert b'name="blake2_256_digest"' not in bodies[0]
+    assert package_file.sha2_digest is not None
+    assert package_file.blake2_256_digest is None
+
+
+def test_upload_hashes_while_sending_fills_digest_cache(default_repo, tmp_path):
+    """Cache the digests computed while sending the file, for later uploads."""
+    default_repo.disable_progress_bar = True
+
+    def post(url, data, allow_redirects, headers, timeout):
+        # Read the whole body, as if it were sent.
+        list(data)
+        return response_with(status_code=200)
+
+    default_repo.session = pretend.stub(post=post)
+    digest_cache = package.DigestCache(str(tmp_path))
+
+    filename = "tests/fixtures/twine-4.0.2-py3-none-any.whl"
+    package_file = package.PackageFile.from_filename(
+        filename, None, hash_file=False, digest_cache=digest_cache
+    )
+    assert package_file.sha2_digest is None
+
+    default_repo.upload(package_file)
+
+    hasher = package.HashManager(filename)
+    hasher.hash()
+    assert digest_cache.get(filename) == hasher.hexdigest()
+
+
+class ResumableUploadServer(requests.adapters.BaseAdapter):
+    """A reference server for resumable uploads, mounted on a session.
+
+    The connection is dropped after receiving each offset in ``interruptions``,
+    keeping the data received before it.
+    """
+
+    def __init__(self, interruptions=(), supported=True):
+        super().__init__()
+        self.interruptions = list(interruptions)
+        self.supported = supported
+        self.uploads = {}
+        self.requests = []
+        self.completed = []
+
+    def respond(self, request, status_code, headers=None):
+        resp = requests.Response()
+        resp.status_code = status_code
+        resp.headers = requests.structures.CaseInsensitiveDict(headers or {})
+        resp._content = b""
+        resp.request = request
+        resp.url = request.url
+        return resp
+
+    def send(self, request, **kwargs):
+        self.requests.append(
+            (request.method, request.url, request.headers.get("Upload-Offset"))
+        )
+        if request.method == "POST":
+            if request.headers.get("Upload-Complete") != "?0":
+                self.completed.append(b"".join(request.body))
+                return self.respond(request, 200)
+            if not self.supported:
+                return self.respond(request, 400)
+            upload_url = f"https://example.com/uploads/{len(self.uploads)}"
+            self.uploads[upload_url] = bytearray()
+            return self.respond(request, 201, {"Location": upload_url})
+
+        data = self.uploads[request.url]
+        if request.method == "HEAD":
+            return self.respond(request, 204, {"Upload-Offset": str(len(data))})
+
+        assert request.method == "PATCH"
+        if int(request.headers["Upload-Offset"]) != len(data):
+            return self.respond(request, 409)
+        for chunk in request.body:
+            if self.interruptions and len(data) + len(chunk) > self.interruptions[0]:
+                data += chunk[: self.interruptions.pop(0) - len(data)]
+                raise requests.ConnectionError("Connection reset by peer")
+            data += chunk
+        self.completed.append(bytes(data))
+        return self.respond(request, 200)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def resumable_repo():
+    repo = repository.Repository(
+        "https://example.com/legacy/",
+        "username",
+        "password",
+        disable_progress_bar=True,
+        resumable=True,
+    )
+    yield repo
+    repo.close()
+
+
+def upload_to(repo, server):
+    repo.session.mount("https://", server)
+    filename = "tests/fixtures/twine-4.0.2-py3-none-any.whl"
+    package_file = package.PackageFile.from_filename(filename, None, hash_file=False)
+    resp = repo.upload(package_file)
+
+    with open(filename, "rb") as fp:
+        assert fp.read() in server.completed[0]
+    assert b'name="sha256_digest"' in server.completed[0]
+    return resp
+
+
+def test_resumable_upload_resumes_after_interruptions(resumable_repo, caplog):
+    """Resume an interrupted upload from the offset received by the server."""
+    server = ResumableUploadServer(interruptions=[1000, 5000])
+
+    resp = upload_to(resumable_repo, server)
+
+    assert resp.status_code == 200
+    upload_url = "https://example.com/uploads/0"
+    assert server.requests == [
+        ("POST", "https://example.com/legacy/", None),
+        ("PATCH", upload_url, "0"),
+        ("HEAD", upload_url, None),
+        ("PATCH", upload_url, "1000"),
+        ("HEAD", upload_url, None),
+        ("PATCH", upload_url, "5000"),
+    ]
+    assert caplog.messages == [
+        "Upload interrupted. Resuming from byte 1000 (1 of 5).",
+        "Upload interrupted. Resuming from byte 5000 (2 of 5).",
+    ]
+
+
+def test_resumable_upload_gives_up(resumable_repo):
+    """Raise the connection error when the upload is interrupted too often."""
+    server = ResumableUploadServer(interruptions=range(100, 1000, 100))
+    resumable_repo.retry_policy = retry.RetryPolicy(max_retries=0)
+
+    with pytest.raises(requests.ConnectionError):
+        upload_to(resumable_repo, server)
+
+    methods = [method for method, _, _ in server.requests]
+    assert methods.count("PATCH") == repository.Repository.MAX_RESUMES + 1
+
+
+def test_resumable_upload_unsupported(resumable_repo, caplog):
+    """Upload in a single request when the repository doesn't create the upload."""
+    server = ResumableUploadServer(supported=False)
+
+    resp = upload_to(resumable_repo, server)
+
+    assert resp.status_code == 200
+    assert [method for method, _, _ in server.requests] == ["POST", "POST"]
+    assert caplog.messages == [
+        "https://example.com/legacy/ doesn't support resumable uploads."
+        " Uploading in a single request."
     ]
 
 
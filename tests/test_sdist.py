@@ -1,5 +1,6 @@
 import os
 import pathlib
+import secrets
 import tarfile
 
 import pytest
@@ -22,7 +23,7 @@ def example_sdist(request):
     return sdist.SDist(file_name)
 
 
-@pytest.fixture(params=["tar.gz", "zip"])
+@pytest.fixture(params=["tar.gz", "tar.bz2", "tar.xz", "zip"])
 def archive_format(request):
     return request.param
 
@@ -167,10 +168,192 @@ def test_multiple_top_level(archive_format, tmp_path):
 
     with pytest.raises(
         exceptions.InvalidDistribution,
-        match=r"^Too many top-level.*test-1.2.3.(tar.gz|zip)$",
+        match=r"^Too many top-level.*test-1.2.3.(tar.gz|tar.bz2|tar.xz|zip)$",
     ):
         sdist.SDist(str(filepath)).read()
 
 
+def test_multiple_top_level_before_pkg_info(tmp_path):
+    """Raise an exception when a member before PKG-INFO is in another directory."""
+    filepath = build_archive(
+        tmp_path,
+        "test-1.2.3",
+        "tar.gz",
+        {
+            "test-1.2.3/README": "README",
+            "test-2.0.0/README": "README",
+            "test-1.2.3/PKG-INFO": """
+                Metadata-Version: 1.1
+                Name: test
+                Version: 1.2.3
+             """,
+        },
+    )
+
+    with pytest.raises(exceptions.InvalidDistribution, match="^Too many top-level"):
+        sdist.SDist(str(filepath)).read()
+
+
+def test_multiple_top_level_after_scan_limit(monkeypatch, tmp_path):
+    """Stop reading the archive after the members following PKG-INFO."""
+    monkeypatch.setattr(sdist.TarSDist, "SCAN_LIMIT", 1024)
+    filepath = build_archive(
+        tmp_path,
+        "test-1.2.3",
+        "tar.gz",
+        {
+            "test-1.2.3/PKG-INFO": """
+                Metadata-Version: 1.1
+                Name: test
+                Version: 1.2.3
+             """,
+            "test-1.2.3/README": "README" * 1024,
+            "test-2.0.0/README": "README",
+        },
+    )
+
+    metadata = sdist.SDist(str(filepath)).read()
+    assert b"Name: test" in metadata
+
+
+def test_read_members_in_current_directory(tmp_path):
+    """Read PKG-INFO from an archive with members named like ``./test-1.2.3``."""
+    filepath = build_archive(
+        tmp_path,
+        "test-1.2.3",
+        "tar.gz",
+        {
+            "./test-1.2.3/README": "README",
+            "./test-1.2.3/PKG-INFO": """
+                Metadata-Version: 1.1
+                Name: test
+                Version: 1.2.3
+             """,
+        },
+    )
+
+    metadata = sdist.SDist(str(filepath)).read()
+    assert b"Name: test" in metadata
+
+
+@pytest.mark.parametrize("archive_format", ["tar.gz", "tar.bz2", "tar.xz"])
+def test_truncated(archive_format, tmp_path):
+    """Raise an exception when a compressed tar archive is truncated."""
+    filepath = build_archive(
+        tmp_path,
+        "test-1.2.3",
+        archive_format,
+        {
+            "test-1.2.3/README": "README" * 1024,
+            "test-1.2.3/PKG-INFO": """
+                Metadata-Version: 1.1
+                Name: test
+                Version: 1.2.3
+             """,
+        },
+    )
+    filepath.write_bytes(filepath.read_bytes()[:100])
+
+    with pytest.raises(
+        exceptions.InvalidDistribution, match="^Invalid distribution file"
+    ):
+        sdist.SDist(str(filepath)).read()
+
+
+def test_truncated_after_scan_limit(monkeypatch, tmp_path):
+    """Read PKG-INFO from an archive that's truncated after the scanned members."""
+    monkeypatch.setattr(sdist.TarSDist, "SCAN_LIMIT", 1024)
+    filepath = build_archive(
+        tmp_path,
+        "test-1.2.3",
+        "tar.gz",
+        {
+            "test-1.2.3/PKG-INFO": """
+                Metadata-Version: 1.1
+                Name: test
+                Version: 1.2.3
+             """,
+            # Incompressible, so the truncated archive ends in this member
+            "test-1.2.3/README": secrets.token_hex(64 * 1024),
+        },
+    )
+    contents = filepath.read_bytes()
+    filepath.write_bytes(contents[: len(contents) // 2])
+
+    metadata = sdist.SDist(str(filepath)).read()
+    assert b"Name: test" in metadata
+
+
+def test_read_zst(tmp_path):
+    """Read PKG-INFO from a .tar.zst sdist with zstandard."""
+    zstandard = pytest.importorskip("zstandard")
+    tar_path = build_archive(
+        tmp_path,
+        "test-1.2.3",
+        "tar",
+        {
+            "test-1.2.3/PKG-INFO": """
+                Metadata-Version: 1.1
+                Name: test
+                Version: 1.2.3
+             """,
+        },
+    )
+    filepath = tmp_path / "test-1.2.3.tar.zst"
+    filepath.write_bytes(zstandard.compress(tar_path.read_bytes()))
+
+    metadata = sdist.SDist(str(filepath)).read()
+    assert b"Name: test" in metadata
+
+
+def test_read_zst_invalid(tmp_path):
+    """Raise an exception when a .tar.zst sdist can't be decompressed."""
+    pytest.importorskip("zstandard")
+    filepath = tmp_path / "test-1.2.3.tar.zst"
+    filepath.write_bytes(b"not zstd data" * 100)
+
+    with pytest.raises(
+        exceptions.InvalidDistribution, match="^Invalid distribution file"
+    ):
+        sdist.SDist(str(filepath)).read()
+
+
+def test_zst_not_supported(monkeypatch, tmp_path):
+    """Raise an exception when .tar.zst can't be decompressed."""
+    monkeypatch.setattr(sdist, "zstandard", None)
+    monkeypatch.setattr(sdist.TarZstSDist, "COMPRESSION", "unsupported")
+    filepath = tmp_path / "test-1.2.3.tar.zst"
+    filepath.write_bytes(b"")
+
+    with pytest.raises(exceptions.InvalidDistribution, match="requires Python 3.14"):
+        sdist.SDist(str(filepath)).read()
+
+
+def test_register_format(monkeypatch, tmp_path):
+    """Read sdists with a format that's been registered."""
+    monkeypatch.setattr(sdist, "FORMATS", dict(sdist.FORMATS))
+
+    class TarSDist(sdist.TarSDist):
+        COMPRESSION = ""
+
+    sdist.register_format(".tar", TarSDist)
+    filepath = build_archive(
+        tmp_path,
+        "test-1.2.3",
+        "tar",
+        {
+            "test-1.2.3/PKG-INFO": """
+                Metadata-Version: 1.1
+                Name: test
+                Version: 1.2.3
+             """,
+        },
+    )
+
+    dist = sdist.SDist(str(filepath))
+    assert isinstance(dist, TarSDist)
+    assert b"Name: test" in dist.read()
+
+
 def test_py_version(example_sdist):
     assert example_sdist.py_version == "source"
@@ -111,6 +111,38 @@ def test_settings_verify_feature_compatibility() -> None:
         )
 
 
+def test_skip_existing_with_index_url(write_config_file):
+    """Allow --skip-existing for any repository with a simple index URL."""
+    config_file = write_config_file("""
+        [distutils]
+        index-servers =
+            private
+
+        [private]
+        repository: https://upload.example.com/legacy/
+        index_url: https://example.com/simple/
+        username: someusername
+        password: password
+        """)
+
+    s = settings.Settings(
+        config_file=config_file, repository_name="private", skip_existing=True
+    )
+    assert s.index_url == "https://example.com/simple/"
+    s.verify_feature_capability()
+    assert s.create_repository().index_url == "https://example.com/simple/"
+
+    s = settings.Settings(
+        repository_url="https://upload.example.com/legacy/",
+        index_url="https://mirror.example.com/simple/",
+        skip_existing=True,
+        username="someusername",
+        password="password",
+    )
+    s.verify_feature_capability()
+    assert s.create_repository().index_url == "https://mirror.example.com/simple/"
+
+
 @pytest.mark.parametrize(
     "verbose, log_level", [(True, logging.INFO), (False, logging.WARNING)]
 )
@@ -176,6 +208,106 @@ def test_no_password_prompt_if_client_cert_and_non_interactive(entered_password)
     assert not settings_obj.password
 
 
+def test_jobs_must_be_positive():
+    """Reject a non-positive number of concurrent uploads."""
+    with pytest.raises(exceptions.InvalidConfiguration, match="jobs"):
+        settings.Settings(jobs=0)
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+@pytest.mark.parametrize("disable_progress_bar", [False, True])
+def test_concurrent_uploads_progress_bar(jobs, disable_progress_bar, make_settings):
+    """Display the progress of concurrent uploads, unless it's disabled."""
+    settings_obj = make_settings(jobs=jobs, disable_progress_bar=disable_progress_bar)
+    assert settings_obj.create_repository().disable_progress_bar is disable_progress_bar
+
+
+def test_timeouts_from_config_file(write_config_file):
+    """Read the timeouts from the repository's section, unless they're given."""
+    config_file = write_config_file("""
+        [distutils]
+        index-servers =
+            private
+
+        [private]
+        repository: https://upload.example.com/legacy/
+        username: someusername
+        password: password
+        connect_timeout: 10
+        read_timeout: 120
+        deadline: 600
+        """)
+
+    s = settings.Settings(
+        config_file=config_file, repository_name="private", read_timeout=30
+    )
+    repo = s.create_repository()
+    assert repo.timeout == (10, 30)
+    assert repo.deadline == 600
+    assert repo.stall_timeout is None
+
+
+@pytest.mark.parametrize(
+    "kwargs, config, message",
+    [
+        ({"connect_timeout": 0}, "", "connect_timeout must be a positive"),
+        ({}, "stall_timeout: soon", "stall_timeout must be a number of seconds"),
+    ],
+)
+def test_timeouts_must_be_positive(write_config_file, kwargs, config, message):
+    """Reject timeouts that aren't a positive number of seconds."""
+    config_file = write_config_file(f"""
+        [pypi]
+        username: __token__
+        password: pypi-token
+        {config}
+        """)
+
+    with pytest.raises(exceptions.InvalidConfiguration, match=message):
+        settings.Settings(config_file=config_file, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "max_rate, expected",
+    [
+        (None, None),
+        ("100000", 100000),
+        ("500K", 512000),
+        ("1.5m", 1572864),
+        (500000, 500000),
+        (1.5, 1.5),
+    ],
+)
+def test_max_rate(make_settings, max_rate, expected):
+    """Parse the maximum upload rate, which is shared by concurrent uploads."""
+    settings_obj = make_settings(max_rate=max_rate, jobs=4)
+    assert settings_obj.max_rate == expected
+
+    repo = settings_obj.create_repository()
+    if expected is None:
+        assert repo.rate_limiter is None
+    else:
+        assert repo.rate_limiter.rate == expected
+
+
+@pytest.mark.parametrize(
+    "max_rate", ["fast", "0", "-1K", "nan", "K", 0, -1, float("inf"), [1]]
+)
+def test_max_rate_must_be_positive(max_rate):
+    """Reject a maximum upload rate that isn't a positive number of bytes."""
+    with pytest.raises(exceptions.InvalidConfiguration, match="max_rate"):
+        settings.Settings(max_rate=max_rate)
+
+
+def test_digest_cache_in_user_cache_dir(monkeypatch, tmp_path):
+    """Store the digest cache under $XDG_CACHE_HOME."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    assert settings.Settings().digest_cache is None
+    digest_cache = settings.Settings(digest_cache=True).digest_cache
+    assert digest_cache.directory == str(tmp_path / "twine" / "digests")
+
+
 class TestArgumentParsing:
     @staticmethod
     def parse_args(args):
@@ -198,3 +330,14 @@ class TestArgumentParsing:
     def test_attestations_flag(self):
         args = self.parse_args(["--attestations"])
         assert args.attestations
+
+    def test_jobs_option(self):
+        assert self.parse_args([]).jobs == 1
+        assert self.parse_args(["--jobs", "4"]).jobs == 4
+
+    def test_digest_cache_option(self, monkeypatch):
+        assert not self.parse_args([]).digest_cache
+        assert self.parse_args(["--digest-cache"]).digest_cache
+        monkeypatch.setenv("TWINE_DIGEST_CACHE", "1")
+        assert self.parse_args([]).digest_cache
+        assert not self.parse_args(["--no-digest-cache"]).digest_cache
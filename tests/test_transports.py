@@ -0,0 +1,248 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import socket
+import threading
+
+import pytest
+import requests
+
+from tests import helpers
+from twine import exceptions
+from twine import package as package_file
+from twine import repository
+from twine import transports
+
+h2 = pytest.importorskip("h2")
+pytest.importorskip("httpx")
+
+import h2.config  # noqa: E402
+import h2.connection  # noqa: E402
+import h2.events  # noqa: E402
+import httpx  # noqa: E402
+
+
+class H2Server:
+    """A cleartext HTTP/2 server, which echoes each request as JSON."""
+
+    def __init__(self):
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        host, port = self.listener.getsockname()
+        self.url = f"http://{host}:{port}/legacy/"
+        self.connections = 0
+        self.requests = []
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self):
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self.handle, args=(sock,), daemon=True).start()
+
+    def handle(self, sock):
+        conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        sock.sendall(conn.data_to_send())
+        headers, bodies = {}, {}
+        with sock:
+            while data := sock.recv(65535):
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        headers[event.stream_id] = dict(
+                            (name.decode(), value.decode())
+                            for name, value in event.headers
+                        )
+                        bodies[event.stream_id] = b""
+                    elif isinstance(event, h2.events.DataReceived):
+                        bodies[event.stream_id] += event.data
+                        conn.acknowledge_received_data(
+                            event.flow_controlled_length, event.stream_id
+                        )
+                    elif isinstance(event, h2.events.StreamEnded):
+                        self.respond(
+                            conn, event.stream_id, headers[event.stream_id], bodies
+                        )
+                sock.sendall(conn.data_to_send())
+
+    def respond(self, conn, stream_id, headers, bodies):
+        body = bodies.pop(stream_id)
+        self.requests.append((headers, body))
+        content = json.dumps({"path": headers[":path"], "length": len(body)}).encode()
+        conn.send_headers(
+            stream_id,
+            [
+                (":status", "200"),
+                ("content-type", "application/json"),
+                ("content-length", str(len(content))),
+            ],
+        )
+        conn.send_data(stream_id, content, end_stream=True)
+
+    def close(self):
+        self.listener.close()
+
+
+@pytest.fixture
+def h2_server():
+    server = H2Server()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def http2_session():
+    session = requests.Session()
+    session.mount("http://", transports.HTTP2Adapter(http1=False))
+    yield session
+    session.close()
+
+
+@pytest.mark.enable_socket
+def test_requests_over_http2(h2_server, http2_session):
+    """Send requests over HTTP/2, returning ``requests`` responses."""
+    response = http2_session.post(h2_server.url, data=b"hello", timeout=5)
+
+    assert response.status_code == 200
+    assert response.reason == "OK"
+    assert response.headers["Content-Type"] == "application/json"
+    assert response.json() == {"path": "/legacy/", "length": 5}
+
+    headers, body = h2_server.requests[0]
+    assert headers[":method"] == "POST"
+    assert "connection" not in headers
+    assert body == b"hello"
+
+
+@pytest.mark.enable_socket
+def test_upload_over_http2(h2_server):
+    """Upload a distribution, sharing one connection for every request."""
+    repo = repository.Repository(
+        h2_server.url,
+        "username",
+        "password",
+        disable_progress_bar=True,
+        transport=transports.HTTP2Adapter(http1=False),
+    )
+    package = package_file.PackageFile.from_filename(helpers.WHEEL_FIXTURE, None)
+
+    for _ in range(3):
+        assert repo.upload(package).status_code == 200
+    repo.close()
+
+    assert h2_server.connections == 1
+    assert len(h2_server.requests) == 3
+    headers, body = h2_server.requests[0]
+    assert headers["content-type"].startswith("multipart/form-data")
+    assert headers["authorization"].startswith("Basic ")
+    assert int(headers["content-length"]) == len(body)
+    with open(helpers.WHEEL_FIXTURE, "rb") as fp:
+        assert fp.read() in body
+
+
+@pytest.mark.enable_socket
+def test_connection_error(http2_session):
+    """Raise ``requests`` exceptions for connection errors."""
+    with pytest.raises(requests.exceptions.ConnectionError):
+        http2_session.get("http://127.0.0.1:1/", timeout=5)
+
+
+@pytest.fixture
+def mock_http2_session(monkeypatch):
+    """Return a session with an HTTP/2 transport, with mock responses."""
+    requests_sent = []
+    responses = []
+
+    def handler(request):
+        requests_sent.append(request.method)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        # A stream that hasn't been read, which is timed like a real response
+        return httpx.Response(response, stream=httpx.ByteStream(b""))
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    adapter = transports.HTTP2Adapter()
+    monkeypatch.setattr(adapter, "_client", lambda verify, cert: client)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    yield session, requests_sent, responses
+    session.close()
+
+
+def test_get_retries_server_errors(mock_http2_session):
+    """Retry a GET request that fails with a server error."""
+    session, requests_sent, responses = mock_http2_session
+    responses.extend([503, 500, 200])
+
+    response = session.get("https://example.test/simple/twine/")
+
+    assert response.status_code == 200
+    assert requests_sent == ["GET"] * 3
+
+
+def test_post_does_not_retry_server_errors(mock_http2_session):
+    """Don't retry an upload that fails with a server error."""
+    session, requests_sent, responses = mock_http2_session
+    responses.extend([503, 200])
+
+    response = session.post("https://example.test/legacy/", data=b"upload")
+
+    assert response.status_code == 503
+    assert requests_sent == ["POST"]
+
+
+def test_retries_connection_errors(mock_http2_session):
+    """Retry any request that fails to connect, but not indefinitely."""
+    session, requests_sent, responses = mock_http2_session
+    responses.extend([httpx.ConnectError("refused"), 200])
+
+    response = session.post("https://example.test/legacy/", data=b"upload")
+
+    assert response.status_code == 200
+    assert requests_sent == ["POST"] * 2
+
+    responses.extend([httpx.ConnectError("refused")] * 6)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.get("https://example.test/simple/twine/")
+    assert requests_sent == ["POST"] * 2 + ["GET"] * 6
+
+
+def test_get_gives_up_on_server_errors(mock_http2_session):
+    """Raise an exception when a GET request keeps failing with server errors."""
+    session, requests_sent, responses = mock_http2_session
+    responses.extend([502] * 11)
+
+    with pytest.raises(requests.exceptions.RetryError):
+        session.get("https://example.test/simple/twine/")
+    assert len(requests_sent) == 11
+
+
+def test_settings_mount_http2_transport(make_settings):
+    """Use the HTTP/2 transport for the repository's requests."""
+    upload_settings = make_settings(http2=True)
+    repo = upload_settings.create_repository()
+
+    adapter = repo.session.get_adapter(repo.url)
+    assert adapter is upload_settings.transport
+    assert isinstance(adapter, transports.HTTP2Adapter)
+
+
+def test_http2_requires_httpx(monkeypatch, make_settings):
+    """Raise an exception when HTTP/2 is requested without httpx installed."""
+    monkeypatch.setattr(transports, "httpx", None)
+
+    with pytest.raises(exceptions.InvalidConfiguration, match="twine\\[http2\\]"):
+        make_settings(http2=True)
@@ -11,7 +11,10 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
 import os
+import time
+import zipfile
 
 import pretend
 import pytest
@@ -48,6 +51,7 @@ def stub_repository(stub_response):
         upload=pretend.call_recorder(lambda package: stub_response),
         close=lambda: None,
         release_urls=lambda packages: set(),
+        prefetch_uploaded_filenames=pretend.call_recorder(lambda packages: None),
     )
 
 
@@ -59,7 +63,7 @@ def upload_settings(make_settings, stub_repository):
     return upload_settings
 
 
-def test_make_package_pre_signed_dist(upload_settings, caplog):
+def test_make_packages_pre_signed_dist(upload_settings, caplog):
     """Create a PackageFile and print path, size, and user-provided signature."""
     filename = helpers.WHEEL_FIXTURE
     expected_size = "35.5 KB"
@@ -69,7 +73,9 @@ def test_make_package_pre_signed_dist(upload_settings, caplog):
     upload_settings.sign = True
     upload_settings.verbose = True
 
-    package = upload._make_package(filename, signatures, [], upload_settings)
+    (package,) = upload._make_packages(
+        [filename], signatures, {filename: []}, upload_settings
+    )
 
     assert package.filename == filename
     assert package.gpg_signature is not None
@@ -81,7 +87,7 @@ def test_make_package_pre_signed_dist(upload_settings, caplog):
     ]
 
 
-def test_make_package_unsigned_dist(upload_settings, monkeypatch, caplog):
+def test_make_packages_unsigned_dist(upload_settings, monkeypatch, caplog):
     """Create a PackageFile and print path, size, and Twine-generated signature."""
     filename = helpers.NEW_WHEEL_FIXTURE
     expected_size = "41.7 KB"
@@ -95,7 +101,9 @@ def test_make_package_unsigned_dist(upload_settings, monkeypatch, caplog):
 
     monkeypatch.setattr(package_file.PackageFile, "sign", stub_sign)
 
-    package = upload._make_package(filename, signatures, [], upload_settings)
+    (package,) = upload._make_packages(
+        [filename], signatures, {filename: []}, upload_settings
+    )
 
     assert package.filename == filename
     assert package.gpg_signature is not None
@@ -106,14 +114,92 @@ def test_make_package_unsigned_dist(upload_settings, monkeypatch, caplog):
     ]
 
 
-def test_make_package_attestations_flagged_but_missing(upload_settings):
+def test_make_packages_attestations_flagged_but_missing(upload_settings):
     """Fail when the user requests attestations but does not supply any attestations."""
     upload_settings.attestations = True
 
     with pytest.raises(
         exceptions.InvalidDistribution, match="Upload with attestations requested"
     ):
-        upload._make_package(helpers.NEW_WHEEL_FIXTURE, {}, [], upload_settings)
+        upload._make_packages(
+            [helpers.NEW_WHEEL_FIXTURE],
+            {},
+            {helpers.NEW_WHEEL_FIXTURE: []},
+            upload_settings,
+        )
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_make_packages_reports_first_invalid_dist(jobs, upload_settings, tmp_path):
+    """Report the first invalid distribution in input order, however many jobs."""
+    upload_settings.jobs = jobs
+    first = tmp_path / "first-1.0-py3-none-any.whl"
+    second = tmp_path / "second-1.0-py3-none-any.whl"
+    for invalid_wheel in (first, second):
+        with zipfile.ZipFile(invalid_wheel, "w"):
+            pass
+
+    with pytest.raises(exceptions.InvalidDistribution, match="first-1.0"):
+        upload._make_packages(
+            [helpers.WHEEL_FIXTURE, str(first), str(second)],
+            {},
+            {helpers.WHEEL_FIXTURE: [], str(first): [], str(second): []},
+            upload_settings,
+        )
+
+
+def test_make_packages_stops_reading_after_signing_fails(upload_settings, monkeypatch):
+    """Don't read the remaining files once an earlier one fails to be signed."""
+    upload_settings.jobs = 2
+    uploads = [f"{i}.whl" for i in range(10)]
+    started = []
+
+    def read_package(filename, upload_settings):
+        started.append(filename)
+        if filename != "0.whl":
+            time.sleep(0.1)
+        return pretend.stub(filename=filename)
+
+    def sign_and_attest_package(package, *args):
+        raise exceptions.InvalidSigningExecutable("gpg")
+
+    monkeypatch.setattr(upload, "_read_package", read_package)
+    monkeypatch.setattr(upload, "_sign_and_attest_package", sign_and_attest_package)
+
+    with pytest.raises(exceptions.InvalidSigningExecutable):
+        upload._make_packages(uploads, {}, dict.fromkeys(uploads, []), upload_settings)
+
+    # Only the files that were being read when the error was raised
+    assert len(started) <= 3
+
+
+def test_make_packages_preserves_order(upload_settings):
+    """Return packages in input order when reading them concurrently."""
+    upload_settings.jobs = 4
+    uploads = [
+        helpers.WHEEL_FIXTURE,
+        helpers.NEW_WHEEL_FIXTURE,
+        helpers.SDIST_FIXTURE,
+        helpers.NEW_SDIST_FIXTURE,
+    ]
+
+    packages = upload._make_packages(
+        uploads, {}, {filename: [] for filename in uploads}, upload_settings
+    )
+
+    assert [package.filename for package in packages] == uploads
+
+
+@pytest.mark.parametrize("single_pass_hashing", [False, True])
+def test_make_packages_single_pass_hashing(single_pass_hashing, upload_settings):
+    """Leave hashing to the repository when using single pass hashing."""
+    upload_settings.single_pass_hashing = single_pass_hashing
+
+    packages = upload._make_packages(
+        [helpers.WHEEL_FIXTURE], {}, {helpers.WHEEL_FIXTURE: []}, upload_settings
+    )
+
+    assert (packages[0].sha2_digest is None) is single_pass_hashing
 
 
 def test_success_prints_release_urls(upload_settings, stub_repository, capsys):
@@ -297,6 +383,183 @@ def test_exception_for_http_status(
         ]
 
 
+def test_report_json(upload_settings, stub_repository, stub_response, tmp_path):
+    """Write the timings of each distribution, and whether it was uploaded."""
+    report_path = tmp_path / "report.json"
+    upload_settings.report_json = str(report_path)
+    upload_settings.skip_existing = True
+    stub_response.text = ""
+    stub_repository.package_is_uploaded = lambda package: package.filetype == "sdist"
+
+    upload.upload(upload_settings, [helpers.WHEEL_FIXTURE, helpers.SDIST_FIXTURE])
+
+    report = json.loads(report_path.read_text())
+    assert report["repository"] == "https://upload.pypi.org/legacy/"
+    wheel, sdist = report["distributions"]
+    assert wheel["filename"] == os.path.basename(helpers.WHEEL_FIXTURE)
+    assert wheel["size"] == os.path.getsize(helpers.WHEEL_FIXTURE)
+    assert wheel["outcome"] == "uploaded"
+    assert list(wheel["seconds"]) == ["parse", "validate", "hash", "check_existing"]
+    assert sdist["outcome"] == "skipped"
+
+
+def test_report_json_after_failure(upload_settings, stub_repository, tmp_path):
+    """Write the timings of the distributions when an upload fails."""
+    report_path = tmp_path / "report.json"
+    upload_settings.report_json = str(report_path)
+    stub_repository.upload = pretend.raiser(requests.ConnectionError("Timed out"))
+
+    with pytest.raises(requests.ConnectionError):
+        upload.upload(upload_settings, [helpers.WHEEL_FIXTURE])
+
+    report = json.loads(report_path.read_text())
+    (wheel,) = report["distributions"]
+    assert wheel["outcome"] is None
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_progress_of_every_upload(jobs, upload_settings, stub_repository):
+    """Count every uploaded file towards the total progress."""
+    upload_settings.jobs = jobs
+    dists = [helpers.SDIST_FIXTURE, helpers.WHEEL_FIXTURE]
+
+    upload.upload(upload_settings, dists)
+
+    upload_progress = stub_repository.progress
+    assert upload_progress.finished_files == upload_progress.total_files == 2
+    (total,) = upload_progress._progress.tasks
+    assert total.completed == total.total == sum(map(os.path.getsize, dists))
+
+
+def test_concurrent_upload_uploads_wheels_first(upload_settings, stub_repository):
+    """Upload every wheel before any sdist when uploading concurrently."""
+    upload_settings.jobs = 4
+
+    result = upload.upload(
+        upload_settings,
+        [
+            helpers.SDIST_FIXTURE,
+            helpers.WHEEL_FIXTURE,
+            helpers.NEW_SDIST_FIXTURE,
+            helpers.NEW_WHEEL_FIXTURE,
+        ],
+    )
+    assert result is None
+
+    filetypes = [call.args[0].filetype for call in stub_repository.upload.calls]
+    assert filetypes == ["bdist_wheel", "bdist_wheel", "sdist", "sdist"]
+
+
+def test_concurrent_upload_release_urls_in_order(
+    upload_settings, stub_repository, capsys
+):
+    """Collect the uploaded packages in upload order, regardless of completion."""
+    upload_settings.jobs = 4
+    stub_repository.release_urls = lambda packages: [
+        package.basefilename for package in packages
+    ]
+
+    upload.upload(
+        upload_settings,
+        [
+            helpers.SDIST_FIXTURE,
+            helpers.WHEEL_FIXTURE,
+            helpers.NEW_WHEEL_FIXTURE,
+        ],
+    )
+
+    captured = capsys.readouterr()
+    assert captured.out.endswith(
+        "View at:\n"
+        "twine-4.0.2-py3-none-any.whl\n"
+        "twine-6.2.0-py3-none-any.whl\n"
+        "twine-1.5.0.tar.gz\n"
+    )
+
+
+def test_concurrent_upload_skips_existing(
+    upload_settings, stub_repository, stub_response, caplog
+):
+    """Skip packages that already exist when uploading concurrently."""
+    upload_settings.jobs = 2
+    upload_settings.skip_existing = True
+    stub_response.text = ""
+    stub_repository.package_is_uploaded = lambda package: package.filetype == "sdist"
+
+    upload.upload(upload_settings, [helpers.WHEEL_FIXTURE, helpers.SDIST_FIXTURE])
+
+    assert [call.args[0].filetype for call in stub_repository.upload.calls] == [
+        "bdist_wheel"
+    ]
+    assert caplog.messages == [
+        "Skipping twine-1.5.0.tar.gz because it appears to already exist"
+    ]
+
+
+def test_concurrent_upload_stops_after_failure(upload_settings, stub_response):
+    """Raise the error for a failed upload, without uploading the sdist."""
+    upload_settings.jobs = 2
+
+    failed_response = pretend.stub(
+        is_redirect=False,
+        url="https://test.pypi.org/legacy/",
+        status_code=403,
+        reason="Forbidden",
+        text="",
+        raise_for_status=pretend.raiser(requests.HTTPError("403 Forbidden")),
+    )
+
+    def upload_package(package):
+        if package.basefilename == "twine-4.0.2-py3-none-any.whl":
+            return failed_response
+        return stub_response
+
+    stub_repository = pretend.stub(
+        upload=pretend.call_recorder(upload_package),
+        close=lambda: None,
+        release_urls=lambda packages: set(),
+    )
+    upload_settings.create_repository = lambda: stub_repository
+
+    with pytest.raises(requests.HTTPError, match="403 Forbidden"):
+        upload.upload(
+            upload_settings,
+            [
+                helpers.WHEEL_FIXTURE,
+                helpers.NEW_WHEEL_FIXTURE,
+                helpers.SDIST_FIXTURE,
+            ],
+        )
+
+    # The other wheel may or may not have started before the failure was seen.
+    filetypes = {call.args[0].filetype for call in stub_repository.upload.calls}
+    assert filetypes == {"bdist_wheel"}
+
+
+def test_concurrent_upload_starts_nothing_after_failure(upload_settings, monkeypatch):
+    """Don't start any queued upload once one has failed, even before it's raised."""
+    upload_settings.jobs = 2
+    packages = [
+        pretend.stub(filetype="bdist_wheel", basefilename=f"{i}.whl") for i in range(12)
+    ]
+    started = []
+
+    def upload_and_finish(repository, package, upload_settings):
+        started.append(package.basefilename)
+        if package.basefilename == "0.whl":
+            # Still uploading when the next package fails
+            time.sleep(0.2)
+            return True
+        raise exceptions.PackageIntegrityMismatch("rejected")
+
+    monkeypatch.setattr(upload, "_upload_and_finish", upload_and_finish)
+
+    with pytest.raises(exceptions.PackageIntegrityMismatch, match="rejected"):
+        upload._upload_concurrently(None, packages, upload_settings)
+
+    assert sorted(started) == ["0.whl", "1.whl"]
+
+
 def test_get_config_old_format(make_settings, config_file):
     try:
         make_settings("""
@@ -410,6 +673,25 @@ def test_prints_skip_message_for_uploaded_package(
     assert caplog.messages == [
         "Skipping twine-4.0.2-py3-none-any.whl because it appears to already exist"
     ]
+    # The uploaded files are fetched once, before uploading.
+    (call,) = stub_repository.prefetch_uploaded_filenames.calls
+    assert [package.basefilename for package in call.args[0]] == [
+        "twine-4.0.2-py3-none-any.whl"
+    ]
+
+
+def test_fails_for_uploaded_package_with_different_contents(
+    upload_settings, stub_repository
+):
+    """Raise an error before uploading a file that was uploaded with other contents."""
+    upload_settings.skip_existing = True
+    error = exceptions.PackageIntegrityMismatch("different contents")
+    stub_repository.package_is_uploaded = pretend.raiser(error)
+
+    with pytest.raises(exceptions.PackageIntegrityMismatch):
+        upload.upload(upload_settings, [helpers.WHEEL_FIXTURE])
+
+    assert stub_repository.upload.calls == []
 
 
 def test_prints_skip_message_for_response(
@@ -366,3 +366,19 @@ def test_get_file_size(size_in_bytes, formatted_size, monkeypatch):
     file_size = utils.get_file_size(size_in_bytes)
 
     assert file_size == formatted_size
+
+
+def test_requests_sessions_share_connection_pools():
+    """Reuse connections across sessions, with enough for concurrent requests."""
+    session = utils.make_requests_session()
+    adapter = session.get_adapter("https://upload.pypi.org/legacy/")
+
+    assert utils.make_requests_session().get_adapter("https://pypi.org/") is adapter
+    assert utils.make_requests_session(4).get_adapter("https://pypi.org/") is adapter
+    assert adapter._pool_maxsize == utils.DEFAULT_POOL_SIZE
+
+    concurrent_adapter = utils.make_requests_session(32).get_adapter(
+        "https://pypi.org/"
+    )
+    assert concurrent_adapter is not adapter
+    assert concurrent_adapter._pool_maxsize == 32
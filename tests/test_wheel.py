@@ -34,7 +34,7 @@ def test_version_parsing(example_wheel):
 
 
 def test_version_parsing_missing_pyver(monkeypatch, example_wheel):
-    wheel.wheel_file_re = pretend.stub(match=lambda a: None)
+    monkeypatch.setattr(wheel, "wheel_file_re", pretend.stub(match=lambda a: None))
     assert example_wheel.py_version == "any"
 
 
@@ -94,3 +94,87 @@ def test_read_wheel_empty_metadata(tmpdir):
         ),
     ):
         wheel.Wheel(whl_file).read()
+
+
+METADATA = b"Metadata-Version: 2.1\nName: test-package\nVersion: 1.0\n"
+
+
+def build_wheel(path, metadata_name="test_package-1.0.dist-info/METADATA", **kwargs):
+    """Build a wheel with a METADATA file, after many other files."""
+    whl_file = path / "test_package-1.0-py3-none-any.whl"
+    with zipfile.ZipFile(whl_file, "w", **kwargs) as zip_file:
+        for i in range(10):
+            zip_file.writestr(f"test_package/METADATA_{i}.txt", "")
+        zip_file.writestr(metadata_name, METADATA)
+        zip_file.comment = b"A comment after the central directory"
+    return str(whl_file)
+
+
+@pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+def test_read_metadata_directly(compression, tmp_path, monkeypatch):
+    """Read METADATA without reading the names of every file in the wheel."""
+    whl_file = build_wheel(tmp_path, compression=compression)
+    monkeypatch.setattr(
+        wheel.zipfile, "ZipFile", pretend.raiser(AssertionError("Opened with zipfile"))
+    )
+
+    assert wheel.Wheel(whl_file).read() == METADATA
+
+
+def test_read_metadata_directly_zip64(tmp_path, monkeypatch):
+    """Read METADATA from a wheel with a ZIP64 end of central directory record."""
+    monkeypatch.setattr(zipfile, "ZIP_FILECOUNT_LIMIT", 5)
+    whl_file = build_wheel(tmp_path)
+    with open(whl_file, "rb") as fp:
+        assert b"PK\x06\x06" in fp.read()
+
+    with open(whl_file, "rb") as fp:
+        assert (
+            wheel._read_zip_member(fp, "test_package-1.0.dist-info/METADATA")
+            == METADATA
+        )
+
+
+@pytest.mark.parametrize(
+    "metadata_name",
+    [
+        "Test_Package-1.0.dist-info/METADATA",
+        "test_package-1.0.dist-info/METADATA.txt",
+    ],
+)
+def test_read_misnamed_metadata(metadata_name, tmp_path):
+    """Fall back to searching the wheel for METADATA when it's misnamed."""
+    whl_file = build_wheel(tmp_path, metadata_name)
+
+    with open(whl_file, "rb") as fp:
+        assert wheel._read_zip_member(fp, wheel.Wheel(whl_file).metadata_name) is None
+    assert wheel.Wheel(whl_file).read() == METADATA
+
+
+def test_read_metadata_after_data(tmp_path):
+    """Fall back to zipfile for a wheel with data before the archive."""
+    whl_file = build_wheel(tmp_path)
+    with open(whl_file, "rb") as fp:
+        contents = fp.read()
+    with open(whl_file, "wb") as fp:
+        fp.write(b"#!/bin/sh\n" + contents)
+
+    with open(whl_file, "rb") as fp:
+        assert wheel._read_zip_member(fp, wheel.Wheel(whl_file).metadata_name) is None
+    assert wheel.Wheel(whl_file).read() == METADATA
+
+
+def test_read_corrupt_metadata(tmp_path):
+    """Fall back to zipfile when METADATA doesn't match its checksum."""
+    whl_file = build_wheel(tmp_path, compression=zipfile.ZIP_STORED)
+    with open(whl_file, "rb") as fp:
+        contents = fp.read()
+    with open(whl_file, "wb") as fp:
+        fp.write(contents.replace(b"Version: 1.0", b"Version: 2.0"))
+
+    with open(whl_file, "rb") as fp:
+        assert wheel._read_zip_member(fp, wheel.Wheel(whl_file).metadata_name) is None
+
+
+def test_metadata_name(example_wheel):
+    assert example_wheel.metadata_name == "twine-4.0.2.dist-info/METADATA"
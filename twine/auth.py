@@ -3,6 +3,7 @@ import functools
 import getpass
 import json
 import logging
+import threading
 import time
 import typing as t
 from typing import cast
@@ -96,9 +97,14 @@ class Resolver:
         self,
         config: utils.RepositoryConfig,
         input: CredentialInput,
+        concurrency: int = 1,
     ) -> None:
         self.config = config
         self.input = input
+        self.concurrency = concurrency
+        # Held while a trusted publishing token is made, so that concurrent
+        # uploads wait for a single new token instead of each making one.
+        self._tp_lock = threading.Lock()
 
     @property
     @functools.lru_cache()
@@ -121,6 +127,13 @@ class Resolver:
             "could not determine credentials for configured repository"
         )
 
+    @property
+    @functools.lru_cache()
+    def session(self) -> requests.Session:
+        # Reused for every token refresh, and shares its connections with the
+        # repository's session.
+        return utils.make_requests_session(self.concurrency)
+
     @classmethod
     def choose(cls, interactive: bool) -> t.Type["Resolver"]:
         return cls if interactive else Private
@@ -158,10 +171,17 @@ class Resolver:
     def _make_trusted_publishing_token(self) -> t.Optional[TrustedPublishingToken]:
         if self._has_valid_cached_tp_token():
             return self._tp_token
+        with self._tp_lock:
+            # Another upload may have made a new token while this one waited.
+            if self._has_valid_cached_tp_token():
+                return self._tp_token
+            return self._mint_trusted_publishing_token()
+
+    def _mint_trusted_publishing_token(self) -> t.Optional[TrustedPublishingToken]:
         # Trusted publishing (OpenID Connect): get one token from the CI
         # system, and exchange that for a PyPI token.
         repository_domain = cast(str, urlparse(self.system).netloc)
-        session = utils.make_requests_session()
+        session = self.session
 
         # Indices are expected to support `https://{domain}/_/oidc/audience`,
         # which tells OIDC exchange clients which audience to use.
@@ -0,0 +1,65 @@
+"""Module containing twine's on-disk caches."""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def user_cache_dir() -> str:
+    """Return the directory for twine's caches.
+
+    This is ``$XDG_CACHE_HOME/twine``, defaulting to ``~/.cache/twine``.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "twine")
+
+
+def entry_path(directory: str, key: str) -> str:
+    """Return the path of the cache entry for an arbitrary ``key``."""
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return os.path.join(directory, digest[:2], f"{digest}.json")
+
+
+def read_json(path: str) -> Optional[Any]:
+    """Read a cache entry, returning ``None`` if it's missing or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: str, data: Any) -> None:
+    """Atomically write a cache entry, logging rather than failing on errors.
+
+    The entry is written to a temporary file that replaces ``path``, so concurrent
+    readers never see a partially written entry.
+    """
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=directory, suffix=".tmp", delete=False
+        ) as f:
+            json.dump(data, f)
+        os.replace(f.name, path)
+    except OSError as exc:
+        logger.info(f"Unable to write cache entry {path}: {exc}")
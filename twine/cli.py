@@ -22,6 +22,8 @@ import rich.logging
 import rich.theme
 
 import twine
+from twine import profiling
+from twine import utils
 
 args = argparse.Namespace()
 
@@ -117,6 +119,15 @@ def dispatch(argv: List[str]) -> Any:
         action="store_true",
         help="disable colored output",
     )
+    parser.add_argument(
+        "--profile",
+        action=utils.EnvironmentDefault,
+        env="TWINE_PROFILE",
+        required=False,
+        metavar="PATH",
+        help="profile the command with cProfile, and write the stats to PATH "
+        "(can also be set via %(env)s environment variable)",
+    )
     parser.add_argument(
         "command",
         choices=registered_commands.names,
@@ -132,4 +143,6 @@ def dispatch(argv: List[str]) -> Any:
 
     main = registered_commands[args.command].load()
 
+    if args.profile:
+        return profiling.run(args.profile, main, args.args)
     return main(args.args)
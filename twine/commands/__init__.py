@@ -23,6 +23,7 @@ import os.path
 from typing import Dict, List, NamedTuple
 
 from twine import exceptions
+from twine import profiling
 
 __all__: List[str] = []
 
@@ -38,21 +39,22 @@ def _group_wheel_files_first(files: List[str]) -> List[str]:
 
 
 def _find_dists(dists: List[str]) -> List[str]:
-    uploads = []
-    for filename in dists:
-        if os.path.exists(filename):
-            uploads.append(filename)
-            continue
-        # The filename didn't exist so it may be a glob
-        files = glob.glob(filename)
-        # If nothing matches, files is []
-        if not files:
-            raise exceptions.InvalidDistribution(
-                "Cannot find file (or expand pattern): '%s'" % filename
-            )
-        # Otherwise, files will be filenames that exist
-        uploads.extend(files)
-    return _group_wheel_files_first(uploads)
+    with profiling.span("find_dists"):
+        uploads = []
+        for filename in dists:
+            if os.path.exists(filename):
+                uploads.append(filename)
+                continue
+            # The filename didn't exist so it may be a glob
+            files = glob.glob(filename)
+            # If nothing matches, files is []
+            if not files:
+                raise exceptions.InvalidDistribution(
+                    "Cannot find file (or expand pattern): '%s'" % filename
+                )
+            # Otherwise, files will be filenames that exist
+            uploads.extend(files)
+        return _group_wheel_files_first(uploads)
 
 
 class Inputs(NamedTuple):
@@ -14,17 +14,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import argparse
+import concurrent.futures
 import email.message
+import functools
+import hashlib
+import importlib.metadata as importlib_metadata
 import io
+import json
 import logging
+import os
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import readme_renderer.rst
 from rich import print
 
+from twine import cache
 from twine import commands
+from twine import exceptions
 from twine import package as package_file
+from twine import profiling
+from twine import utils
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +73,73 @@ class _WarningStream(io.StringIO):
     def __str__(self) -> str:
         return self.getvalue().strip()
 
+    def replay(self, text: str) -> None:
+        """Write warnings from an earlier rendering, which are already reformatted."""
+        super().write(text)
+
+
+@functools.lru_cache(maxsize=None)
+def _renderer_versions() -> Tuple[Optional[str], ...]:
+    """Return the versions of the packages that affect rendering."""
+    versions: List[Optional[str]] = []
+    for dist in ("readme-renderer", "docutils"):
+        try:
+            versions.append(importlib_metadata.version(dist))
+        except importlib_metadata.PackageNotFoundError:
+            versions.append(None)
+    return tuple(versions)
+
+
+class _RenderCache:
+    """Cache the results of rendering descriptions, so each is only rendered once.
+
+    Entries are keyed by a hash of the description, its content type and
+    parameters, and the versions of readme_renderer and docutils. They're kept in
+    memory, and in ``directory`` if it's given, to reuse them in later runs.
+    """
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        self.directory = directory
+        self._entries: Dict[str, Tuple[bool, str]] = {}
+
+    @staticmethod
+    def key(description: str, content_type: str, params: Dict[str, str]) -> str:
+        data = [_renderer_versions(), content_type, sorted(params.items()), description]
+        return hashlib.sha256(json.dumps(data).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[bool, str]]:
+        """Return whether rendering succeeded, and its warnings, if it's cached."""
+        if key in self._entries or self.directory is None:
+            return self._entries.get(key)
+
+        entry = cache.read_json(cache.entry_path(self.directory, key))
+        if not isinstance(entry, dict):
+            return None
+        is_ok, warnings = entry.get("ok"), entry.get("warnings")
+        if not isinstance(is_ok, bool) or not isinstance(warnings, str):
+            return None
+        self._entries[key] = (is_ok, warnings)
+        return is_ok, warnings
+
+    def set(self, key: str, is_ok: bool, warnings: str) -> None:
+        """Store whether rendering succeeded, and its warnings."""
+        self._entries[key] = (is_ok, warnings)
+        if self.directory is not None:
+            cache.write_json(
+                cache.entry_path(self.directory, key),
+                {"ok": is_ok, "warnings": warnings},
+            )
+
+
+# The rendered descriptions of the current run, in this process
+_render_cache = _RenderCache()
+
+
+def _start_render_cache(directory: Optional[str]) -> None:
+    """Start caching rendered descriptions, e.g. in each worker process."""
+    global _render_cache
+    _render_cache = _RenderCache(directory)
+
 
 def _parse_content_type(value: str) -> Tuple[str, Dict[str, str]]:
     """Implement logic of deprecated cgi.parse_header().
@@ -81,7 +158,10 @@ def _check_file(
     warnings = []
     is_ok = True
 
-    package = package_file.PackageFile.from_filename(filename, comment=None)
+    # The digests aren't checked, so don't read the whole file to compute them.
+    package = package_file.PackageFile.from_filename(
+        filename, comment=None, hash_file=False
+    )
 
     metadata = package.metadata_dictionary()
     description = metadata.get("description")
@@ -99,18 +179,39 @@ def _check_file(
     if not description or description.rstrip() == "UNKNOWN":
         warnings.append("`long_description` missing.")
     elif renderer:
-        rendering_result = renderer.render(
-            description, stream=render_warning_stream, **params
-        )
-        if rendering_result is None:
-            is_ok = False
+        # Identical descriptions, e.g. of every wheel of a project, are only
+        # rendered once, and their warnings are replayed.
+        key = _RenderCache.key(description, content_type, params)
+        cached = _render_cache.get(key)
+        if cached is None:
+            rendering_stream = _WarningStream()
+            with profiling.span("render"):
+                rendering_result = renderer.render(
+                    description, stream=rendering_stream, **params
+                )
+            cached = (rendering_result is not None, rendering_stream.getvalue())
+            _render_cache.set(key, *cached)
+        is_ok, rendering_warnings = cached
+        render_warning_stream.replay(rendering_warnings)
 
     return warnings, is_ok
 
 
+def _check_file_output(filename: str) -> Tuple[List[str], bool, str]:
+    """Check given distribution, returning the rendering warnings as text.
+
+    This can be run in another process, since its result can be pickled.
+    """
+    render_warning_stream = _WarningStream()
+    warnings, is_ok = _check_file(filename, render_warning_stream)
+    return warnings, is_ok, str(render_warning_stream)
+
+
 def check(
     dists: List[str],
     strict: bool = False,
+    jobs: int = 1,
+    render_cache: bool = False,
 ) -> bool:
     """Check that a distribution will render correctly on PyPI and display the results.
 
@@ -123,10 +224,21 @@ def check(
         The destination of the resulting output.
     :param strict:
         If ``True``, treat warnings as errors.
+    :param jobs:
+        The number of processes to check distributions in. The results are still
+        displayed in the order of ``dists``.
+    :param render_cache:
+        Cache the results of rendering each description in the user's cache
+        directory, so they aren't rendered again by later runs.
 
     :return:
         ``True`` if there are rendering errors, otherwise ``False``.
     """
+    if jobs < 1:
+        raise exceptions.InvalidConfiguration(
+            f"jobs must be a positive number, not {jobs}"
+        )
+
     dists = commands._find_dists(dists)
     uploads, _, _ = commands._split_inputs(dists)
     if not uploads:  # Return early, if there are no files to check.
@@ -134,33 +246,54 @@ def check(
         return False
 
     failure = False
+    render_cache_dir = (
+        os.path.join(cache.user_cache_dir(), "renders") if render_cache else None
+    )
+    _start_render_cache(render_cache_dir)
+
+    # Rendering is CPU-bound, so distributions are checked in parallel in a pool
+    # of processes, rather than threads.
+    executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+    results: Iterator[Tuple[List[str], bool, str]]
+    if jobs > 1 and len(uploads) > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(jobs, len(uploads)),
+            initializer=_start_render_cache,
+            initargs=(render_cache_dir,),
+        )
+        results = executor.map(_check_file_output, uploads)
+    else:
+        results = map(_check_file_output, uploads)
 
-    for filename in uploads:
-        print(f"Checking {filename}: ", end="")
-        render_warning_stream = _WarningStream()
-        warnings, is_ok = _check_file(filename, render_warning_stream)
-
-        # Print the status and/or error
-        if not is_ok:
-            failure = True
-            print("[red]FAILED[/red]")
-            logger.error(
-                "`long_description` has syntax errors in markup"
-                " and would not be rendered on PyPI."
-                f"\n{render_warning_stream}"
-            )
-        elif warnings:
-            if strict:
+    try:
+        for filename in uploads:
+            print(f"Checking {filename}: ", end="")
+            warnings, is_ok, render_warnings = next(results)
+
+            # Print the status and/or error
+            if not is_ok:
                 failure = True
-                print("[red]FAILED due to warnings[/red]")
+                print("[red]FAILED[/red]")
+                logger.error(
+                    "`long_description` has syntax errors in markup"
+                    " and would not be rendered on PyPI."
+                    f"\n{render_warnings}"
+                )
+            elif warnings:
+                if strict:
+                    failure = True
+                    print("[red]FAILED due to warnings[/red]")
+                else:
+                    print("[yellow]PASSED with warnings[/yellow]")
             else:
-                print("[yellow]PASSED with warnings[/yellow]")
-        else:
-            print("[green]PASSED[/green]")
+                print("[green]PASSED[/green]")
 
-        # Print warnings after the status and/or error
-        for message in warnings:
-            logger.warning(message)
+            # Print warnings after the status and/or error
+            for message in warnings:
+                logger.warning(message)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
 
     return failure
 
@@ -188,8 +321,32 @@ def main(args: List[str]) -> bool:
         required=False,
         help="Fail on warnings",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Check up to N distributions in parallel, in separate processes. "
+        "[default: %(default)s]",
+    )
+    parser.add_argument(
+        "--render-cache",
+        action=argparse.BooleanOptionalAction,
+        default=utils.EnvironmentFlag.bool_from_env(
+            os.environ.get("TWINE_RENDER_CACHE")
+        ),
+        help="Cache the results of rendering each description in the user's "
+        "cache directory, so identical descriptions aren't rendered again by "
+        "later runs. (Can also be set via TWINE_RENDER_CACHE environment "
+        "variable.)",
+    )
 
     parsed_args = parser.parse_args(args)
 
     # Call the check function with the arguments from the command line
-    return check(parsed_args.dists, strict=parsed_args.strict)
+    return check(
+        parsed_args.dists,
+        strict=parsed_args.strict,
+        jobs=parsed_args.jobs,
+        render_cache=parsed_args.render_cache,
+    )
@@ -14,8 +14,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import argparse
+import concurrent.futures
 import logging
-from typing import Dict, List, cast
+import os
+import threading
+import time
+from typing import Dict, List, Optional, cast
 
 import requests
 from rich import print
@@ -23,6 +27,10 @@ from rich import print
 from twine import commands
 from twine import exceptions
 from twine import package as package_file
+from twine import profiling
+from twine import progress as progress_display
+from twine import report
+from twine import repository as repository_module
 from twine import settings
 from twine import utils
 
@@ -64,24 +72,41 @@ def skip_upload(
     )
 
 
-def _make_package(
-    filename: str,
+def _read_package(
+    filename: str, upload_settings: settings.Settings
+) -> package_file.PackageFile:
+    """Read the metadata of a package, and hash its contents.
+
+    The contents aren't hashed with ``--single-pass-hashing``, unless their digests
+    have been cached, since they're hashed while being uploaded.
+    """
+    with profiling.span("read_package"):
+        package = package_file.PackageFile.from_filename(
+            filename,
+            upload_settings.comment,
+            hash_file=not upload_settings.single_pass_hashing,
+            digest_cache=upload_settings.digest_cache,
+        )
+        package.compute_digests()
+        return package
+
+
+def _sign_and_attest_package(
+    package: package_file.PackageFile,
     signatures: Dict[str, str],
     attestations: List[str],
     upload_settings: settings.Settings,
 ) -> package_file.PackageFile:
-    """Create and sign a package, based off of filename, signatures, and settings.
+    """Sign a package, and attach any supplied attestations.
 
-    Additionally, any supplied attestations are attached to the package when
-    the settings indicate to do so.
+    The attestations are only attached when the settings indicate to do so.
     """
-    package = package_file.PackageFile.from_filename(filename, upload_settings.comment)
-
     signed_name = package.signed_basefilename
     if signed_name in signatures:
         package.add_gpg_signature(signatures[signed_name], signed_name)
     elif upload_settings.sign:
-        package.sign(upload_settings.sign_with, upload_settings.identity)
+        with package.timings.time("sign"):
+            package.sign(upload_settings.sign_with, upload_settings.identity)
 
     # Attestations are only attached if explicitly requested with `--attestations`.
     if upload_settings.attestations:
@@ -90,7 +115,7 @@ def _make_package(
         if not attestations:
             raise exceptions.InvalidDistribution(
                 "Upload with attestations requested, but "
-                f"{filename} has no associated attestations"
+                f"{package.filename} has no associated attestations"
             )
         package.add_attestations(attestations)
 
@@ -102,6 +127,168 @@ def _make_package(
     return package
 
 
+def _make_packages(
+    uploads: List[str],
+    signatures: Dict[str, str],
+    attestations_by_dist: Dict[str, List[str]],
+    upload_settings: settings.Settings,
+) -> List[package_file.PackageFile]:
+    """Create and sign a package for each of ``uploads``.
+
+    Reading the metadata and hashing the contents of each file is done over a pool
+    of ``upload_settings.jobs`` threads. Signing and attaching attestations is done
+    one package at a time, in order, so errors are reported for the first invalid
+    distribution in ``uploads``, and GPG never prompts for more than one file at
+    a time.
+    """
+    with (
+        profiling.span("make_packages"),
+        concurrent.futures.ThreadPoolExecutor(
+            max_workers=upload_settings.jobs
+        ) as executor,
+    ):
+        packages = executor.map(
+            lambda filename: _read_package(filename, upload_settings), uploads
+        )
+        try:
+            return [
+                _sign_and_attest_package(
+                    package,
+                    signatures,
+                    attestations_by_dist[package.filename],
+                    upload_settings,
+                )
+                for package in packages
+            ]
+        except BaseException:
+            # Don't read the remaining files before reporting the error.
+            executor.shutdown(cancel_futures=True)
+            raise
+
+
+def _upload_package(
+    repository: repository_module.Repository,
+    package: package_file.PackageFile,
+    upload_settings: settings.Settings,
+) -> bool:
+    """Upload a single package, honoring ``--skip-existing``.
+
+    :return:
+        ``True`` if the package was uploaded, or ``False`` if it was skipped.
+    """
+    repository_url = cast(str, upload_settings.repository_config["repository"])
+    skip_message = (
+        f"Skipping {package.basefilename} because it appears to already exist"
+    )
+
+    # Note: The skip_existing check *needs* to be first, because otherwise
+    #       we're going to generate extra HTTP requests against a hardcoded
+    #       URL for no reason.
+    if upload_settings.skip_existing:
+        with package.timings.time("check_existing"):
+            is_uploaded = repository.package_is_uploaded(package)
+        if is_uploaded:
+            logger.warning(skip_message)
+            package.timings.outcome = "skipped"
+            return False
+
+    resp = repository.upload(package)
+    logger.info(f"Response from {resp.url}:\n{resp.status_code} {resp.reason}")
+    if resp.text:
+        logger.info(resp.text)
+
+    # Bug 92. If we get a redirect we should abort because something seems
+    # funky. The behaviour is not well defined and redirects being issued
+    # by PyPI should never happen in reality. This should catch malicious
+    # redirects as well.
+    if resp.is_redirect:
+        raise exceptions.RedirectDetected.from_args(
+            utils.sanitize_url(repository_url),
+            utils.sanitize_url(resp.headers["location"]),
+        )
+
+    if skip_upload(resp, upload_settings.skip_existing, package):
+        logger.warning(skip_message)
+        package.timings.outcome = "skipped"
+        return False
+
+    utils.check_status_code(resp, upload_settings.verbose)
+
+    package.timings.outcome = "uploaded"
+    return True
+
+
+def _upload_and_finish(
+    repository: repository_module.Repository,
+    package: package_file.PackageFile,
+    upload_settings: settings.Settings,
+) -> bool:
+    """Upload a single package, and count it as finished in the progress display."""
+    with profiling.span("upload"):
+        uploaded = _upload_package(repository, package, upload_settings)
+    if repository.progress is not None:
+        repository.progress.finish(os.path.getsize(package.filename))
+    return uploaded
+
+
+def _upload_concurrently(
+    repository: repository_module.Repository,
+    packages: List[package_file.PackageFile],
+    upload_settings: settings.Settings,
+) -> List[package_file.PackageFile]:
+    """Upload packages over a pool of ``upload_settings.jobs`` threads.
+
+    Wheels are uploaded before any other distribution, as with a sequential upload,
+    so that an sdist is never the only file available for a new release.
+
+    :return:
+        The packages that were uploaded, in upload order. If any upload fails, no
+        further uploads are started, and the error for the earliest failing package
+        is raised once the uploads in progress have finished.
+    """
+    wheels = [p for p in packages if p.filetype == "bdist_wheel"]
+    others = [p for p in packages if p.filetype != "bdist_wheel"]
+    # Set once an upload fails, so a queued upload that a worker has already taken
+    # isn't started.
+    failed = threading.Event()
+
+    def upload_unless_failed(package: package_file.PackageFile) -> Optional[bool]:
+        if failed.is_set():
+            return None
+        try:
+            return _upload_and_finish(repository, package, upload_settings)
+        except BaseException:
+            failed.set()
+            raise
+
+    uploaded_packages: List[package_file.PackageFile] = []
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=upload_settings.jobs
+    ) as executor:
+        for batch in (wheels, others):
+            futures = [executor.submit(upload_unless_failed, p) for p in batch]
+            try:
+                concurrent.futures.wait(
+                    futures, return_when=concurrent.futures.FIRST_EXCEPTION
+                )
+            except BaseException:
+                executor.shutdown(cancel_futures=True)
+                raise
+
+            if failed.is_set():
+                # Wait for the uploads in progress, then raise the earliest error.
+                executor.shutdown(cancel_futures=True)
+                for future in futures:
+                    if not future.cancelled():
+                        future.result()
+
+            uploaded_packages.extend(
+                package for package, future in zip(batch, futures) if future.result()
+            )
+
+    return uploaded_packages
+
+
 def upload(upload_settings: settings.Settings, dists: List[str]) -> None:
     """Upload one or more distributions to a repository, and display the progress.
 
@@ -124,6 +311,7 @@ def upload(upload_settings: settings.Settings, dists: List[str]) -> None:
     :raises requests.HTTPError:
         The repository responded with an error.
     """
+    started = time.monotonic()
     upload_settings.check_repository_url()
     upload_settings.verify_feature_capability()
     repository_url = cast(str, upload_settings.repository_config["repository"])
@@ -146,12 +334,9 @@ def upload(upload_settings: settings.Settings, dists: List[str]) -> None:
 
     print(f"Uploading distributions to {utils.sanitize_url(repository_url)}")
 
-    packages_to_upload = [
-        _make_package(
-            filename, signatures, attestations_by_dist[filename], upload_settings
-        )
-        for filename in uploads
-    ]
+    packages_to_upload = _make_packages(
+        uploads, signatures, attestations_by_dist, upload_settings
+    )
 
     if any(p.gpg_signature for p in packages_to_upload):
         if repository_url.startswith((utils.DEFAULT_REPOSITORY, utils.TEST_REPOSITORY)):
@@ -174,7 +359,6 @@ def upload(upload_settings: settings.Settings, dists: List[str]) -> None:
             )
 
     repository = upload_settings.create_repository()
-    uploaded_packages = []
 
     if signatures and not packages_to_upload:
         raise exceptions.InvalidDistribution(
@@ -182,41 +366,37 @@ def upload(upload_settings: settings.Settings, dists: List[str]) -> None:
             "corresponding distribution file."
         )
 
-    for package in packages_to_upload:
-        skip_message = (
-            f"Skipping {package.basefilename} because it appears to already exist"
-        )
-
-        # Note: The skip_existing check *needs* to be first, because otherwise
-        #       we're going to generate extra HTTP requests against a hardcoded
-        #       URL for no reason.
-        if upload_settings.skip_existing and repository.package_is_uploaded(package):
-            logger.warning(skip_message)
-            continue
-
-        resp = repository.upload(package)
-        logger.info(f"Response from {resp.url}:\n{resp.status_code} {resp.reason}")
-        if resp.text:
-            logger.info(resp.text)
-
-        # Bug 92. If we get a redirect we should abort because something seems
-        # funky. The behaviour is not well defined and redirects being issued
-        # by PyPI should never happen in reality. This should catch malicious
-        # redirects as well.
-        if resp.is_redirect:
-            raise exceptions.RedirectDetected.from_args(
+    if upload_settings.skip_existing:
+        repository.prefetch_uploaded_filenames(packages_to_upload)
+
+    try:
+        # A single display of the progress of every upload, including concurrent ones
+        with progress_display.UploadProgress(
+            len(packages_to_upload),
+            sum(os.path.getsize(package.filename) for package in packages_to_upload),
+            disable=upload_settings.disable_progress_bar,
+        ) as progress:
+            repository.progress = progress
+            if upload_settings.jobs > 1:
+                uploaded_packages = _upload_concurrently(
+                    repository, packages_to_upload, upload_settings
+                )
+            else:
+                uploaded_packages = [
+                    package
+                    for package in packages_to_upload
+                    if _upload_and_finish(repository, package, upload_settings)
+                ]
+    finally:
+        # Report the timings of failed uploads too, to show where they failed.
+        if upload_settings.report_json:
+            report.write(
+                upload_settings.report_json,
                 utils.sanitize_url(repository_url),
-                utils.sanitize_url(resp.headers["location"]),
+                {package.filename: package.timings for package in packages_to_upload},
+                time.monotonic() - started,
             )
 
-        if skip_upload(resp, upload_settings.skip_existing, package):
-            logger.warning(skip_message)
-            continue
-
-        utils.check_status_code(resp, upload_settings.verbose)
-
-        uploaded_packages.append(package)
-
     release_urls = repository.release_urls(uploaded_packages)
     if release_urls:
         print("\n[green]View at:")
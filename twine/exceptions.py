@@ -47,6 +47,50 @@ class RedirectDetected(TwineException):
         )
 
 
+class PackageIntegrityMismatch(TwineException):
+    """A file with the same name, but different contents, was already uploaded.
+
+    Package indexes don't allow an uploaded file to be replaced, so uploading it
+    again would fail.
+    """
+
+    @classmethod
+    def from_args(
+        cls, filename: str, local_digest: str, uploaded_digest: str
+    ) -> "PackageIntegrityMismatch":
+        return cls(
+            f"{filename} has already been uploaded with different contents.\n"
+            f"Local sha256 digest: {local_digest}\n"
+            f"Uploaded sha256 digest: {uploaded_digest}\n"
+            "Uploaded files can't be replaced. Build the distribution with a new "
+            "version and try again.",
+        )
+
+
+class UploadStalled(TwineException):
+    """No data of an upload was sent for longer than the stall timeout.
+
+    Like a timeout, this is retried.
+    """
+
+    @classmethod
+    def from_args(cls, filename: str, stall_timeout: float) -> "UploadStalled":
+        return cls(
+            f"Uploading {filename} stalled: no data was sent for "
+            f"{stall_timeout:g} seconds."
+        )
+
+
+class DeadlineExceeded(TwineException):
+    """The deadline for uploading to the repository has passed."""
+
+    @classmethod
+    def from_args(cls, deadline: float) -> "DeadlineExceeded":
+        return cls(
+            f"The upload didn't finish within the deadline of {deadline:g} seconds."
+        )
+
+
 class UploadToDeprecatedPyPIDetected(TwineException):
     """An upload attempt was detected to deprecated PyPI domains.
 
@@ -0,0 +1,261 @@
+"""Module containing a streaming ``multipart/form-data`` body for uploads."""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import os
+import threading
+import time
+import uuid
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+import urllib3
+
+
+class Reader(Protocol):
+    """A file-like object that the contents of a field are read from."""
+
+    def read(self, size: int = -1) -> bytes: ...
+
+
+# A reader is kept with its length, and its position when the body was created.
+_Part = Union[bytes, Tuple[Reader, int, Optional[int]]]
+
+
+def _reader_length(reader: Any) -> int:
+    """Return the number of bytes that remain to be read from ``reader``."""
+    if hasattr(reader, "__len__"):
+        return len(reader)
+    position: int = reader.tell()
+    return os.fstat(reader.fileno()).st_size - position
+
+
+class TokenBucket:
+    """Limit the rate that bytes are sent, across every thread that shares it.
+
+    Tokens accumulate at ``rate`` per second, up to ``capacity``. Sending a chunk
+    takes a token for each of its bytes, waiting first if there aren't enough.
+
+    :param rate:
+        The maximum average number of bytes per second.
+    :param capacity:
+        The maximum number of bytes that can be sent at once, after sending
+        nothing for a while. Defaults to one second's worth.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = rate if capacity is None else capacity
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def chunk_size(self) -> int:
+        """A chunk size for bodies limited by this, so the rate is smooth.
+
+        A chunk is sent about every tenth of a second, even at low rates, so an
+        upload isn't mistaken for a stalled one between chunks.
+        """
+        return max(1, min(MultipartBody.DEFAULT_CHUNK_SIZE, int(self.rate / 10)))
+
+    def acquire(self, amount: int) -> None:
+        """Wait until ``amount`` bytes can be sent."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            # Tokens can be borrowed, which makes the next caller wait longer, so
+            # chunks bigger than the capacity can be sent, in order.
+            self._tokens -= amount
+            wait = -self._tokens / self.rate
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+class MultipartBody:
+    """A ``multipart/form-data`` request body that is streamed in large chunks.
+
+    This can be passed as the ``data`` of a request. Since it has a length, it's
+    sent with a ``Content-Length`` header, rather than chunked.
+
+    :param fields:
+        The form fields, as ``(name, value)`` pairs. A value is either a string, or a
+        ``(filename, contents)`` or ``(filename, contents, content_type)`` tuple for
+        a file, where ``contents`` is bytes or a file-like object. A file-like object
+        without a ``fileno()`` must have a ``__len__``, which need only be correct
+        before it's read.
+    :param chunk_size:
+        The size of the chunks of the body. Small fields are combined into a single
+        chunk.
+    :param callback:
+        Called with the number of bytes of the body that have been produced so far,
+        at most once every ``callback_interval`` seconds, and once at the end.
+    :param callback_interval:
+        The minimum number of seconds between calls to ``callback``.
+    :param rate_limiter:
+        Limits the rate that chunks are produced.
+    """
+
+    DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(
+        self,
+        fields: Sequence[Tuple[str, Any]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        callback: Optional[Callable[[int], None]] = None,
+        callback_interval: float = 0.1,
+        rate_limiter: Optional[TokenBucket] = None,
+    ) -> None:
+        self.boundary = uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.callback = callback
+        self.callback_interval = callback_interval
+        self.rate_limiter = rate_limiter
+        self.bytes_read = 0
+        # When the body first started being produced, and when the last time it
+        # was produced finished, by ``time.monotonic()``
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+        self._parts: List[_Part] = []
+        for name, value in fields:
+            self._add_field(name, value)
+        self._parts.append(f"--{self.boundary}--\r\n".encode())
+
+        self._length = sum(
+            len(part) if isinstance(part, bytes) else part[1] for part in self._parts
+        )
+        # The part to start from, and the number of its bytes to skip.
+        self._offset = 0
+        self._start = (0, 0)
+
+    @property
+    def content_type(self) -> str:
+        """The ``Content-Type`` header for the body, including its boundary."""
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        """Return the length of the body, for the ``Content-Length`` header."""
+        return self._length - self._offset
+
+    def seek(self, offset: int) -> None:
+        """Produce the body from ``offset`` onwards, e.g. to resume sending it.
+
+        The length of the body becomes the number of bytes from ``offset``. The
+        file-like objects of the fields must support ``seek()`` and ``tell()``.
+        """
+        if not 0 <= offset <= self._length:
+            raise ValueError(f"Offset {offset} is outside the body")
+        self._offset = self.bytes_read = offset
+        self._start = (len(self._parts), 0)
+
+        position = 0
+        for index, part in enumerate(self._parts):
+            length = len(part) if isinstance(part, bytes) else part[1]
+            skip = max(offset - position, 0)
+            position += length
+            if skip >= length:
+                continue
+            if self._start[0] > index:
+                self._start = (index, skip)
+            if not isinstance(part, bytes):
+                reader, _, start = part
+                cast(Any, reader).seek(cast(int, start) + skip)
+
+    def _add_field(self, name: str, value: Any) -> None:
+        filename = content_type = None
+        if isinstance(value, tuple):
+            if len(value) == 3:
+                filename, value, content_type = value
+            else:
+                filename, value = value
+
+        # Reuse urllib3's rendering of the part headers, which escapes names
+        # the same way as ``requests`` does for ``files=``.
+        field = urllib3.fields.RequestField(name, b"", filename=filename)
+        field.make_multipart(content_type=content_type)
+        self._parts.append(f"--{self.boundary}\r\n".encode())
+        self._parts.append(field.render_headers().encode())
+
+        if isinstance(value, str):
+            self._parts.append(value.encode())
+        elif isinstance(value, bytes):
+            self._parts.append((io.BytesIO(value), len(value), 0))
+        else:
+            start = value.tell() if hasattr(value, "tell") else None
+            self._parts.append((value, _reader_length(value), start))
+        self._parts.append(b"\r\n")
+
+    def _chunks(self) -> Iterator[bytes]:
+        pending = bytearray()
+        index, skip = self._start
+        for part in self._parts[index:]:
+            if isinstance(part, bytes):
+                pending += part[skip:]
+            else:
+                reader = part[0]
+                # ``pending`` is always shorter than a chunk here, so this reads
+                # at least one byte.
+                while content := reader.read(self.chunk_size - len(pending)):
+                    pending += content
+                    if len(pending) >= self.chunk_size:
+                        yield bytes(pending)
+                        pending.clear()
+
+            skip = 0
+            if len(pending) >= self.chunk_size:
+                yield bytes(pending)
+                pending.clear()
+
+        if pending:
+            yield bytes(pending)
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Produce the body in chunks, reporting the progress to ``callback``.
+
+        Each chunk is produced when ``rate_limiter`` allows it to be sent, so the
+        progress reflects the limited rate.
+        """
+        last_callback = time.monotonic()
+        if self.started is None:
+            self.started = last_callback
+        self.finished = None
+        for chunk in self._chunks():
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(len(chunk))
+            self.bytes_read += len(chunk)
+            if self.callback is not None:
+                now = time.monotonic()
+                if now - last_callback >= self.callback_interval:
+                    self.callback(self.bytes_read)
+                    last_callback = now
+            yield chunk
+
+        # The last chunk has been sent once the next one is requested.
+        self.finished = time.monotonic()
+        if self.callback is not None:
+            self.callback(self.bytes_read)
@@ -11,21 +11,37 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import concurrent.futures
+import functools
 import hashlib
 import io
 import json
 import logging
+import mmap
 import os
 import re
 import subprocess
-from typing import Any, Dict, List, NamedTuple, Optional, Tuple, TypedDict
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypedDict,
+    Union,
+)
 
 from packaging import errors
 from packaging import metadata
 from packaging import version
 from rich import print
 
+from twine import cache
 from twine import exceptions
+from twine import report
 from twine import sdist
 from twine import wheel
 
@@ -34,14 +50,24 @@ DIST_TYPES = {
     "sdist": sdist.SDist,
 }
 
-DIST_EXTENSIONS = {
-    ".whl": "bdist_wheel",
-    ".tar.gz": "sdist",
-    ".zip": "sdist",
-}
-
 logger = logging.getLogger(__name__)
 
+# Anything that can be passed to ``update()`` of a ``hashlib`` object
+_Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+def _dist_type(filename: str) -> Optional[str]:
+    """Return the type of a distribution from its filename, if it's known.
+
+    The extensions of sdists are those in :data:`twine.sdist.FORMATS`, including
+    any formats that have been registered since importing this module.
+    """
+    if filename.endswith(".whl"):
+        return "bdist_wheel"
+    if filename.endswith(tuple(sdist.FORMATS)):
+        return "sdist"
+    return None
+
 
 def _safe_name(name: str) -> str:
     """Convert an arbitrary string to a standard distribution name.
@@ -157,6 +183,9 @@ class PackageFile:
         metadata: metadata.RawMetadata,
         python_version: str,
         filetype: str,
+        hash_file: bool = True,
+        digest_cache: Optional["DigestCache"] = None,
+        timings: Optional[report.Timings] = None,
     ) -> None:
         self.filename = filename
         self.basefilename = os.path.basename(filename)
@@ -171,35 +200,105 @@ class PackageFile:
         self.gpg_signature: Optional[Tuple[str, bytes]] = None
         self.attestations: Optional[List[Dict[Any, str]]] = None
 
-        hasher = HashManager(filename)
-        hasher.hash()
-        hexdigest = hasher.hexdigest()
+        # The digests are computed on first access, so commands like ``check`` that
+        # never use them don't read the whole file. When ``hash_file`` is false,
+        # they're left for the repository to compute while uploading the file,
+        # unless they have been cached.
+        self._hash_file = hash_file
+        self._digest_cache = digest_cache
+        self._hexdigest: Optional[Hexdigest] = None
+
+        # The time taken by each phase of preparing and uploading the file
+        self.timings = report.Timings() if timings is None else timings
+
+    def compute_digests(self) -> "Hexdigest":
+        """Compute the digests of the file, if that hasn't been done already.
+
+        This is done automatically on first access to the digests, but can be used
+        to do it in advance, e.g. on another thread.
+        """
+        if self._hexdigest is not None:
+            return self._hexdigest
+
+        digest_cache = self._digest_cache
+        hexdigest = digest_cache.get(self.filename) if digest_cache else None
+        if hexdigest is not None:
+            self._hexdigest = hexdigest
+        elif self._hash_file:
+            self._hexdigest = self.set_digests()
+        else:
+            self._hexdigest = Hexdigest(None, None)
+        return self._hexdigest
+
+    def set_digests(self, hexdigest: Optional["Hexdigest"] = None) -> "Hexdigest":
+        """Hash the file, or use the digests of its contents, and cache them.
 
-        self.sha2_digest = hexdigest.sha2
-        self.blake2_256_digest = hexdigest.blake2
+        :param hexdigest:
+            The digests of the file, if they were computed while reading it for
+            something else, e.g. an upload. Otherwise, the file is hashed.
+        :return:
+            The digests of the file.
+        """
+        if hexdigest is None:
+            with self.timings.time("hash"):
+                hasher = HashManager(self.filename)
+                hasher.hash()
+                hexdigest = hasher.hexdigest()
+        if self._digest_cache:
+            self._digest_cache.set(self.filename, hexdigest)
+        self._hexdigest = hexdigest
+        return hexdigest
+
+    @property
+    def sha2_digest(self) -> Optional[str]:
+        """The SHA-256 digest of the file."""
+        return self.compute_digests().sha2
+
+    @sha2_digest.setter
+    def sha2_digest(self, value: Optional[str]) -> None:
+        hexdigest = self._hexdigest or Hexdigest(None, None)
+        self._hexdigest = hexdigest._replace(sha2=value)
+
+    @property
+    def blake2_256_digest(self) -> Optional[str]:
+        """The BLAKE2b-256 digest of the file, or ``None`` in FIPS mode."""
+        return self.compute_digests().blake2
+
+    @blake2_256_digest.setter
+    def blake2_256_digest(self, value: Optional[str]) -> None:
+        hexdigest = self._hexdigest or Hexdigest(None, None)
+        self._hexdigest = hexdigest._replace(blake2=value)
 
     @classmethod
-    def from_filename(cls, filename: str, comment: Optional[str]) -> "PackageFile":
+    def from_filename(
+        cls,
+        filename: str,
+        comment: Optional[str],
+        hash_file: bool = True,
+        digest_cache: Optional["DigestCache"] = None,
+    ) -> "PackageFile":
+        timings = report.Timings()
+        started = time.monotonic()
+
         # Extract the metadata from the package
-        for ext, dtype in DIST_EXTENSIONS.items():
-            if filename.endswith(ext):
-                try:
-                    dist = DIST_TYPES[dtype](filename)
-                    data = dist.read()
-                    py_version = dist.py_version
-                except EOFError:
-                    raise exceptions.InvalidDistribution(
-                        "Invalid distribution file: '%s'" % os.path.basename(filename)
-                    )
-                else:
-                    break
-        else:
+        dtype = _dist_type(filename)
+        if dtype is None:
             raise exceptions.InvalidDistribution(
                 "Unknown distribution format: '%s'" % os.path.basename(filename)
             )
+        try:
+            dist = DIST_TYPES[dtype](filename)
+            data = dist.read()
+            py_version = dist.py_version
+        except EOFError:
+            raise exceptions.InvalidDistribution(
+                "Invalid distribution file: '%s'" % os.path.basename(filename)
+            )
 
         # Parse and validate metadata.
         meta, unparsed = metadata.parse_email(data)
+        parsed = time.monotonic()
+        timings.add("parse", parsed - started)
 
         # setuptools emits License-File metadata fields while declaring
         # Metadata-Version 2.1. This is invalid because the metadata
@@ -236,7 +335,18 @@ class PackageFile:
                 )
             )
 
-        return cls(filename, comment, meta, py_version, dtype)
+        timings.add("validate", time.monotonic() - parsed)
+
+        return cls(
+            filename,
+            comment,
+            meta,
+            py_version,
+            dtype,
+            hash_file,
+            digest_cache,
+            timings,
+        )
 
     def metadata_dictionary(self) -> PackageMetadata:
         """Merge multiple sources of metadata into a single dictionary.
@@ -339,15 +449,71 @@ class Hexdigest(NamedTuple):
     blake2: Optional[str]
 
 
+class DigestCache:
+    """Cache the digests of files, so they aren't hashed again by later commands.
+
+    Entries are keyed by the real path of the file, and are only used while the
+    file's size, modification and change times, inode, and device are unchanged.
+    Otherwise, the entry is ignored, and replaced when the file is hashed again.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def _entry_path(self, filename: str) -> str:
+        return cache.entry_path(self.directory, os.path.realpath(filename))
+
+    @staticmethod
+    def _fingerprint(filename: str) -> Dict[str, int]:
+        stat = os.stat(filename)
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "ctime_ns": stat.st_ctime_ns,
+            "inode": stat.st_ino,
+            "device": stat.st_dev,
+        }
+
+    def get(self, filename: str) -> Optional[Hexdigest]:
+        """Return the cached digests of ``filename``, if they are still valid."""
+        entry = cache.read_json(self._entry_path(filename))
+        if not isinstance(entry, dict):
+            return None
+
+        try:
+            if entry.get("fingerprint") != self._fingerprint(filename):
+                return None
+            return Hexdigest(entry["sha256"], entry["blake2_256"])
+        except (OSError, KeyError):
+            return None
+
+    def set(self, filename: str, hexdigest: Hexdigest) -> None:
+        """Store the digests of ``filename``."""
+        cache.write_json(
+            self._entry_path(filename),
+            {
+                "fingerprint": self._fingerprint(filename),
+                "sha256": hexdigest.sha2,
+                "blake2_256": hexdigest.blake2,
+            },
+        )
+
+
 class HashManager:
     """Manage our hashing objects for simplicity.
 
     This will also allow us to better test this logic.
     """
 
-    def __init__(self, filename: str) -> None:
-        """Initialize our manager and hasher objects."""
+    def __init__(self, filename: str, threaded: bool = False) -> None:
+        """Initialize our manager and hasher objects.
+
+        :param threaded:
+            Whether to compute the sha256 and blake2 digests of large files on
+            separate threads, which can be faster with more than one CPU.
+        """
         self.filename = filename
+        self.threaded = threaded
 
         self._sha2_hasher = hashlib.sha256()
 
@@ -358,7 +524,18 @@ class HashManager:
             # FIPS mode disables blake2
             pass
 
-    def _sha2_update(self, content: bytes) -> None:
+    #: The size of the buffer that files are read into for hashing.
+    BUFFER_SIZE = 1024 * 1024
+
+    #: Files at least this large are memory-mapped and hashed with a single call to
+    #: each hasher, which releases the GIL for the whole file.
+    MMAP_THRESHOLD = 16 * 1024 * 1024
+
+    #: When hashing on separate threads, files at least this large have each
+    #: digest computed on its own thread.
+    THREADED_THRESHOLD = 4 * 1024 * 1024
+
+    def _sha2_update(self, content: _Buffer) -> None:
         if self._sha2_hasher is not None:
             self._sha2_hasher.update(content)
 
@@ -367,7 +544,7 @@ class HashManager:
             return self._sha2_hasher.hexdigest()
         return None
 
-    def _blake_update(self, content: bytes) -> None:
+    def _blake_update(self, content: _Buffer) -> None:
         if self._blake_hasher is not None:
             self._blake_hasher.update(content)
 
@@ -376,12 +553,71 @@ class HashManager:
             return self._blake_hasher.hexdigest()
         return None
 
+    def update(self, content: _Buffer) -> None:
+        """Hash a chunk of the file contents."""
+        self._sha2_update(content)
+        self._blake_update(content)
+
+    def _update_concurrently(
+        self, content: _Buffer, executor: concurrent.futures.Executor
+    ) -> None:
+        # hashlib releases the GIL while hashing large buffers, so the digests
+        # are computed in parallel. Both must be finished before returning, in
+        # case ``content`` is about to be overwritten.
+        blake = executor.submit(self._blake_update, content)
+        self._sha2_update(content)
+        blake.result()
+
+    def _hash_buffered(
+        self, fp: io.BufferedReader, update: Callable[[_Buffer], None]
+    ) -> None:
+        # Reuse one buffer, rather than allocating a new bytes object per read.
+        buffer = memoryview(bytearray(self.BUFFER_SIZE))
+        while size := fp.readinto(buffer):
+            update(buffer[:size])
+
+    def _hash_mmap(
+        self, fp: io.BufferedReader, update: Callable[[_Buffer], None]
+    ) -> bool:
+        try:
+            contents = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, OverflowError):
+            # For example, on a filesystem that doesn't support mmap, or for a
+            # file larger than the address space.
+            return False
+
+        with contents:
+            update(contents)
+        return True
+
+    def _hash_file(
+        self, fp: io.BufferedReader, size: int, update: Callable[[_Buffer], None]
+    ) -> None:
+        if size >= self.MMAP_THRESHOLD and self._hash_mmap(fp, update):
+            return
+        self._hash_buffered(fp, update)
+
     def hash(self) -> None:
-        """Hash the file contents."""
+        """Hash the file contents.
+
+        Large files are memory-mapped when possible, and otherwise read in chunks of
+        :attr:`BUFFER_SIZE` bytes.
+        """
         with open(self.filename, "rb") as fp:
-            for content in iter(lambda: fp.read(io.DEFAULT_BUFFER_SIZE), b""):
-                self._sha2_update(content)
-                self._blake_update(content)
+            size = os.fstat(fp.fileno()).st_size
+            if (
+                self.threaded
+                and self._blake_hasher is not None
+                and size >= self.THREADED_THRESHOLD
+            ):
+                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                    self._hash_file(
+                        fp,
+                        size,
+                        functools.partial(self._update_concurrently, executor=executor),
+                    )
+            else:
+                self._hash_file(fp, size, self.update)
 
     def hexdigest(self) -> Hexdigest:
         """Return the hexdigest for the file."""
@@ -0,0 +1,77 @@
+"""Module containing the profiling of commands, for ``twine --profile``."""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import contextlib
+import cProfile
+import marshal
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# The filename of spans in the stats, which pstats shows as ``<twine>:0(name)``
+SPAN_FILENAME = "<twine>"
+
+# The number of times each span was entered, and the total seconds spent in it,
+# while profiling
+_spans: Optional[Dict[str, Tuple[int, float]]] = None
+_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a phase of a command, if it's being profiled.
+
+    cProfile only profiles the thread that runs the command, so the wall time of
+    each span is added to the stats, including the time spent on other threads,
+    e.g. for ``--jobs``.
+    """
+    if _spans is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        with _lock:
+            if _spans is not None:
+                count, seconds = _spans.get(name, (0, 0.0))
+                _spans[name] = (count + 1, seconds + elapsed)
+
+
+def run(path: str, func: Callable[..., T], *args: Any) -> T:
+    """Call ``func`` with ``args`` under cProfile, and write the stats to ``path``.
+
+    The stats can be read with :mod:`pstats`, or tools like SnakeViz. Each span is
+    included as a function in ``<twine>``, with its wall time as its cumulative
+    time. The stats are written even if ``func`` raises an exception.
+    """
+    global _spans
+    _spans = {}
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(func, *args)
+    finally:
+        with _lock:
+            spans, _spans = _spans, None
+
+        profile.create_stats()
+        stats: Dict[Tuple[str, int, str], Any] = getattr(profile, "stats")
+        for name, (count, seconds) in spans.items():
+            # (primitive calls, calls, internal time, cumulative time, callers)
+            stats[(SPAN_FILENAME, 0, name)] = (count, count, 0.0, seconds, {})
+        with open(path, "wb") as fp:
+            marshal.dump(stats, fp)
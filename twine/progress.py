@@ -0,0 +1,131 @@
+"""Module containing the live display of the progress of uploads."""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import contextlib
+import threading
+from typing import Any, Callable, Dict, Iterator
+
+import rich.progress
+
+
+class UploadProgress:
+    """A single live display of the progress of uploading several files.
+
+    The display has a bar for every file, with the total throughput and time
+    remaining, and a row for each upload in progress. It's rendered a few times a
+    second on a separate thread, so updates from uploads only record the progress.
+
+    This is a context manager, which displays the progress while it's active.
+
+    :param total_files:
+        The number of files that will be uploaded.
+    :param total_size:
+        The total size of the files, in bytes.
+    :param disable:
+        Don't display the progress.
+    """
+
+    def __init__(
+        self, total_files: int, total_size: int, disable: bool = False
+    ) -> None:
+        self._progress = rich.progress.Progress(
+            rich.progress.TextColumn("{task.description}"),
+            rich.progress.BarColumn(),
+            "[progress.percentage]{task.percentage:>3.0f}%",
+            rich.progress.DownloadColumn(),
+            "•",
+            rich.progress.TimeRemainingColumn(
+                compact=True,
+                elapsed_when_finished=True,
+            ),
+            "•",
+            rich.progress.TransferSpeedColumn(),
+            disable=disable,
+            refresh_per_second=4,
+        )
+        self.total_files = total_files
+        self.finished_files = 0
+        self._total_task = self._progress.add_task(
+            self._total_description(), total=total_size
+        )
+        # The bytes of finished files, and the progress of each upload, scaled to
+        # the size of its file
+        self._finished_size = 0
+        self._uploading: Dict[rich.progress.TaskID, int] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "UploadProgress":
+        """Start displaying the progress."""
+        self._progress.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Stop displaying the progress."""
+        self._progress.stop()
+
+    def _total_description(self) -> str:
+        return f"Total ({self.finished_files}/{self.total_files} files)"
+
+    def _update_total(self) -> None:
+        self._progress.update(
+            self._total_task,
+            completed=self._finished_size + sum(self._uploading.values()),
+            description=self._total_description(),
+        )
+
+    @contextlib.contextmanager
+    def track(
+        self, description: str, total: int, size: int
+    ) -> Iterator[Callable[[int], None]]:
+        """Display a row for an upload while it's in progress.
+
+        :param description:
+            The description of the upload, e.g. its filename.
+        :param total:
+            The number of bytes that will be sent, including any form fields.
+        :param size:
+            The size of the file, which its progress counts towards in the total.
+        :return:
+            A callback for the number of bytes that have been sent.
+        """
+        task_id = self._progress.add_task(description, total=total)
+        with self._lock:
+            self._uploading[task_id] = 0
+
+        def update(bytes_sent: int) -> None:
+            with self._lock:
+                # Ignore an abandoned upload that's still being sent.
+                if task_id not in self._uploading:
+                    return
+                self._uploading[task_id] = bytes_sent * size // max(total, 1)
+                self._progress.update(task_id, completed=bytes_sent)
+                self._update_total()
+
+        try:
+            yield update
+        finally:
+            with self._lock:
+                del self._uploading[task_id]
+                self._progress.remove_task(task_id)
+                self._update_total()
+
+    def finish(self, size: int) -> None:
+        """Count a file as finished, whether it was uploaded or skipped.
+
+        :param size:
+            The size of the file, in bytes.
+        """
+        with self._lock:
+            self.finished_files += 1
+            self._finished_size += size
+            self._update_total()
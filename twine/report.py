@@ -0,0 +1,141 @@
+"""Module containing the timings of uploads, for ``--report-json``."""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import contextlib
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+#: The phases of preparing and uploading a distribution, in order.
+PHASES = (
+    "parse",
+    "validate",
+    "hash",
+    "sign",
+    "check_existing",
+    "connect",
+    "transfer",
+    "response",
+)
+
+
+class Timings:
+    """The time taken by each phase of uploading a distribution.
+
+    The time of a phase that happens more than once, e.g. for each attempt of an
+    upload, is the total of every time. Phases that didn't happen are omitted.
+    """
+
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = {}
+        # The bytes of the upload's body that were sent, including by failed
+        # attempts, and the number of retries
+        self.bytes_sent = 0
+        self.retries = 0
+        # "uploaded" or "skipped", once the upload has finished
+        self.outcome: Optional[str] = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Add ``seconds`` to the time taken by ``phase``."""
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def time(self, phase: str) -> Iterator[None]:
+        """Add the time taken by the body of the ``with`` statement to ``phase``."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(phase, time.monotonic() - started)
+
+    def add_request(
+        self,
+        sent: float,
+        body_started: Optional[float],
+        body_finished: Optional[float],
+        received: float,
+    ) -> None:
+        """Add the phases of a request that sent a body, from their start times.
+
+        The time until the body started being sent is counted as ``connect``,
+        which includes the TLS handshake and sending the headers, or is nearly
+        nothing when a connection is reused. The time after the body was sent is
+        counted as ``response``.
+
+        :param sent:
+            When the request was made.
+        :param body_started:
+            When the body started being sent, if it did.
+        :param body_finished:
+            When all of the body was sent, if it was.
+        :param received:
+            When the response was received, or the request failed.
+        """
+        if body_started is None:
+            self.add("connect", received - sent)
+            return
+        self.add("connect", body_started - sent)
+        if body_finished is None:
+            self.add("transfer", received - body_started)
+            return
+        self.add("transfer", body_finished - body_started)
+        self.add("response", received - body_finished)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the timings as JSON-compatible values, with phases in order."""
+        return {
+            "outcome": self.outcome,
+            "bytes_sent": self.bytes_sent,
+            "retries": self.retries,
+            "seconds": {
+                phase: round(self.seconds[phase], 6)
+                for phase in PHASES
+                if phase in self.seconds
+            },
+        }
+
+
+def write(
+    path: str, repository_url: str, distributions: Dict[str, Timings], elapsed: float
+) -> None:
+    """Write a JSON report of the timings of uploading ``distributions``.
+
+    :param path:
+        The path of the report.
+    :param repository_url:
+        The URL of the repository, without credentials.
+    :param distributions:
+        The timings of each distribution, by its filename.
+    :param elapsed:
+        The number of seconds taken by the whole upload.
+    """
+    entries: List[Dict[str, Any]] = [
+        {
+            "filename": os.path.basename(filename),
+            "size": os.path.getsize(filename),
+            **timings.as_dict(),
+        }
+        for filename, timings in distributions.items()
+    ]
+    with open(path, "w", encoding="utf-8") as fp:
+        json.dump(
+            {
+                "repository": repository_url,
+                "seconds": round(elapsed, 6),
+                "distributions": entries,
+            },
+            fp,
+            indent=2,
+        )
+        fp.write("\n")
@@ -11,15 +11,42 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import concurrent.futures
+import contextlib
+import html.parser
 import logging
-from typing import Any, Dict, List, Optional, Set, Tuple
+import math
+import os
+import posixpath
+import threading
+import time
+import warnings
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
+from urllib.parse import urljoin
+from urllib.parse import urlparse
 
 import requests
-import requests_toolbelt
 import rich.progress
+from packaging.utils import canonicalize_name
 from rich import print
 
+from twine import cache
+from twine import exceptions
+from twine import multipart
 from twine import package as package_file
+from twine import progress as progress_display
+from twine import retry
 from twine.utils import make_requests_session
 
 LEGACY_PYPI = "https://pypi.python.org/"
@@ -29,20 +56,156 @@ OLD_WAREHOUSE = "https://upload.pypi.io/"
 TEST_WAREHOUSE = "https://test.pypi.org/"
 WAREHOUSE_WEB = "https://pypi.org/"
 
+SIMPLE_JSON_CONTENT_TYPE = "application/vnd.pypi.simple.v1+json"
+
+# The version of the resumable uploads draft that's implemented, for the
+# Upload-Draft-Interop-Version header
+RESUMABLE_UPLOAD_INTEROP_VERSION = "6"
+
 logger = logging.getLogger(__name__)
 
 
+class _HashingReader:
+    """Wrap a file, hashing its contents as they are read."""
+
+    def __init__(self, fp: IO[bytes], hasher: package_file.HashManager) -> None:
+        self._fp = fp
+        self._hasher = hasher
+
+    def read(self, size: int = -1) -> bytes:
+        content = self._fp.read(size)
+        self._hasher.update(content)
+        return content
+
+    def fileno(self) -> int:
+        return self._fp.fileno()
+
+    def tell(self) -> int:
+        return self._fp.tell()
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether the whole file has been read, and thus hashed."""
+        return self._fp.tell() >= os.fstat(self._fp.fileno()).st_size
+
+
+class _DeferredDigest:
+    """A form field for a digest that is only known once the file has been read.
+
+    This is read by ``MultipartBody`` after the preceding file, whose length
+    is taken from ``__len__``. Since a hex digest has the same length regardless
+    of the content, the length is known before the file has been hashed.
+    """
+
+    def __init__(self, hexdigest: Callable[[], Optional[str]]) -> None:
+        self._hexdigest = hexdigest
+        self._value: Optional[bytes] = None
+        self._length = len(self._hexdigest() or "")
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, size: int = -1) -> bytes:
+        if self._value is None:
+            self._value = (self._hexdigest() or "").encode()
+        if size < 0:
+            size = len(self._value)
+        content, self._value = self._value[:size], self._value[size:]
+        self._length -= len(content)
+        return content
+
+    @classmethod
+    def fields(cls, hasher: package_file.HashManager) -> List[Tuple[str, Any]]:
+        """Return the upload form fields for the digests computed by ``hasher``."""
+        fields: List[Tuple[str, Any]] = [
+            ("sha256_digest", cls(lambda: hasher.hexdigest().sha2))
+        ]
+        # FIPS mode disables blake2
+        if hasher.hexdigest().blake2 is not None:
+            fields.append(("blake2_256_digest", cls(lambda: hasher.hexdigest().blake2)))
+        return fields
+
+
+class _SimpleIndexParser(html.parser.HTMLParser):
+    """Collect the links to files from a :pep:`503` project page."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.files: Dict[str, Optional[str]] = {}
+        self._href: Optional[str] = None
+        self._text = ""
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag == "a":
+            self._href = dict(attrs).get("href") or ""
+            self._text = ""
+
+    def handle_data(self, data: str) -> None:
+        if self._href is not None:
+            self._text += data
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "a" and self._href is not None:
+            url, _, fragment = self._href.partition("#")
+            filename = self._text.strip() or posixpath.basename(urlparse(url).path)
+            hash_name, _, value = fragment.partition("=")
+            self.files[filename] = value if hash_name == "sha256" else None
+            self._href = None
+
+
+def _parse_simple_index_project(
+    response: requests.Response,
+) -> Dict[str, Optional[str]]:
+    """Parse the files from a JSON (:pep:`691`) or HTML simple index project page."""
+    content_type = response.headers.get("Content-Type", "")
+    if content_type.startswith(SIMPLE_JSON_CONTENT_TYPE):
+        return {
+            file["filename"]: file.get("hashes", {}).get("sha256")
+            for file in response.json()["files"]
+        }
+
+    parser = _SimpleIndexParser()
+    parser.feed(response.text)
+    parser.close()
+    return parser.files
+
+
 class Repository:
+    # The number of times an interrupted resumable upload is resumed
+    MAX_RESUMES = 5
+    # The number of seconds between checks for stalled uploads
+    WATCHDOG_INTERVAL = 0.5
+    # The progress of a body is only seen once each chunk has been sent, so with a
+    # stall timeout, the chunks are small enough that an upload at this many bytes
+    # per second is seen to progress several times in the timeout.
+    STALL_MIN_RATE = 16 * 1024
+
     def __init__(
         self,
         repository_url: str,
         username: Optional[str],
         password: Optional[str],
         disable_progress_bar: bool = False,
+        concurrency: int = 1,
+        transport: Optional[requests.adapters.BaseAdapter] = None,
+        release_cache_dir: Optional[str] = None,
+        index_url: Optional[str] = None,
+        resumable: bool = False,
+        retry_policy: Optional[retry.RetryPolicy] = None,
+        timeout: retry.Timeout = None,
+        deadline: Optional[float] = None,
+        stall_timeout: Optional[float] = None,
+        max_rate: Optional[float] = None,
     ) -> None:
         self.url = repository_url
-
-        self.session = make_requests_session()
+        # Every request is limited by the deadline, from now
+        self.deadline = deadline
+        self._deadline = None if deadline is None else time.monotonic() + deadline
+
+        self.session = make_requests_session(concurrency)
+        if transport is not None:
+            for scheme in ("http://", "https://"):
+                self.session.mount(scheme, transport)
         # requests.Session.auth should be Union[None, Tuple[str, str], ...]
         # But username or password could be None
         # See TODO for utils.RepositoryConfig
@@ -52,9 +215,23 @@ class Repository:
         logger.info(f"username: {username if username else '<empty>'}")
         logger.info(f"password: <{'hidden' if password else 'empty'}>")
 
-        # Working around https://github.com/python/typing/issues/182
-        self._releases_json_data: Dict[str, Dict[str, Any]] = {}
+        # The digests of the files uploaded for each (name, version), or for
+        # each (name, None) when using a simple index
+        self._uploaded_files: Dict[
+            Tuple[str, Optional[str]], Dict[str, Optional[str]]
+        ] = {}
+        self.index_url = index_url
+        self.release_cache_dir = release_cache_dir
+        self.resumable = resumable
+        self.retry_policy = retry_policy or retry.RetryPolicy()
+        self.timeout = timeout
+        self.stall_timeout = stall_timeout
+        # Shared by every upload, so concurrent uploads are limited together
+        self.rate_limiter = multipart.TokenBucket(max_rate) if max_rate else None
         self.disable_progress_bar = disable_progress_bar
+        # A display of the progress of several uploads, set by the upload command,
+        # instead of a progress bar for each upload
+        self.progress: Optional[progress_display.UploadProgress] = None
 
     def close(self) -> None:
         self.session.close()
@@ -91,123 +268,525 @@ class Repository:
         if clientcert:
             self.session.cert = clientcert
 
-    def _upload(self, package: package_file.PackageFile) -> requests.Response:
+    def _timeout(self, timeout: retry.Timeout = None) -> retry.Timeout:
+        """Return the timeout for a request, limited by the deadline.
+
+        :param timeout:
+            The timeout for the request, instead of ``timeout``.
+        :raises twine.exceptions.DeadlineExceeded:
+            The deadline has passed.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        if self._deadline is None:
+            return timeout
+
+        remaining = self._deadline - time.monotonic()
+        if remaining <= 0:
+            raise exceptions.DeadlineExceeded.from_args(cast(float, self.deadline))
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        return (
+            remaining if connect is None else min(connect, remaining),
+            remaining if read is None else min(read, remaining),
+        )
+
+    def _watch(
+        self,
+        package: package_file.PackageFile,
+        body: multipart.MultipartBody,
+        send: Callable[[], requests.Response],
+    ) -> requests.Response:
+        """Send ``body`` with ``send``, watching its progress.
+
+        The timeouts of ``requests`` don't limit the time taken to send a body. So,
+        it's sent on another thread, which is abandoned if none of the body is sent
+        for ``stall_timeout`` seconds, or if the deadline passes.
+
+        :raises twine.exceptions.UploadStalled:
+            None of the body was sent for ``stall_timeout`` seconds.
+        :raises twine.exceptions.DeadlineExceeded:
+            The deadline passed.
+        """
+        if self.stall_timeout is None and self._deadline is None:
+            return send()
+
+        future: "concurrent.futures.Future[requests.Response]"
+        future = concurrent.futures.Future()
+
+        def run() -> None:
+            try:
+                future.set_result(send())
+            except BaseException as exc:
+                future.set_exception(exc)
+
+        end = body.bytes_read + len(body)
+        bytes_read, progressed = body.bytes_read, time.monotonic()
+
+        # A daemon thread, so a stalled upload doesn't prevent twine from exiting
+        threading.Thread(target=run, daemon=True).start()
+        while True:
+            try:
+                return future.result(timeout=self.WATCHDOG_INTERVAL)
+            except concurrent.futures.TimeoutError:
+                pass
+
+            now = time.monotonic()
+            if self._deadline is not None and now >= self._deadline:
+                raise exceptions.DeadlineExceeded.from_args(cast(float, self.deadline))
+            if body.bytes_read != bytes_read:
+                bytes_read, progressed = body.bytes_read, now
+            elif (
+                self.stall_timeout is not None
+                # After the body is sent, the read timeout applies instead.
+                and bytes_read < end
+                and now - progressed >= self.stall_timeout
+            ):
+                raise exceptions.UploadStalled.from_args(
+                    package.basefilename, self.stall_timeout
+                )
+
+    @contextlib.contextmanager
+    def _track_progress(
+        self, package: package_file.PackageFile, total: int
+    ) -> Iterator[Callable[[int], None]]:
+        """Display the progress of an upload, in ``progress`` if it's set.
+
+        :return:
+            A callback for the number of bytes that have been sent.
+        """
+        if self.progress is not None:
+            with self.progress.track(
+                package.basefilename, total, os.path.getsize(package.filename)
+            ) as callback:
+                yield callback
+            return
+
+        with rich.progress.Progress(
+            "[progress.percentage]{task.percentage:>3.0f}%",
+            rich.progress.BarColumn(),
+            rich.progress.DownloadColumn(),
+            "•",
+            rich.progress.TimeRemainingColumn(
+                compact=True,
+                elapsed_when_finished=True,
+            ),
+            "•",
+            rich.progress.TransferSpeedColumn(),
+            disable=self.disable_progress_bar,
+        ) as progress:
+            task_id = progress.add_task("", total=total)
+            yield lambda bytes_read: progress.update(task_id, completed=bytes_read)
+
+    def _upload(
+        self, package: package_file.PackageFile, timeout: retry.Timeout = None
+    ) -> requests.Response:
         print(f"Uploading {package.basefilename}")
 
+        if self.resumable and package.sha2_digest is None:
+            # Resuming an upload reads part of the file again, so it can't be
+            # hashed while it's being sent.
+            package.set_digests()
+
         metadata = package.metadata_dictionary()
         data_to_send = self._convert_metadata_to_list_of_tuples(metadata)
         data_to_send.append((":action", "file_upload"))
         data_to_send.append(("protocol_version", "1"))
         with open(package.filename, "rb") as fp:
+            content: Any = fp
+            hasher = None
+            if "sha256_digest" not in metadata:
+                # The file hasn't been hashed in advance, so hash it while it's
+                # being sent, and send the digests after it.
+                hasher = package_file.HashManager(package.filename)
+                content = _HashingReader(fp, hasher)
+
             data_to_send.append(
                 (
                     "content",
-                    (package.basefilename, fp, "application/octet-stream"),
+                    (package.basefilename, content, "application/octet-stream"),
                 )
             )
-            encoder = requests_toolbelt.MultipartEncoder(data_to_send)
-
-            with rich.progress.Progress(
-                "[progress.percentage]{task.percentage:>3.0f}%",
-                rich.progress.BarColumn(),
-                rich.progress.DownloadColumn(),
-                "•",
-                rich.progress.TimeRemainingColumn(
-                    compact=True,
-                    elapsed_when_finished=True,
-                ),
-                "•",
-                rich.progress.TransferSpeedColumn(),
-                disable=self.disable_progress_bar,
-            ) as progress:
-                task_id = progress.add_task("", total=encoder.len)
-
-                monitor = requests_toolbelt.MultipartEncoderMonitor(
-                    encoder,
-                    lambda monitor: progress.update(
-                        task_id,
-                        completed=monitor.bytes_read,
-                    ),
+            if hasher is not None:
+                data_to_send.extend(_DeferredDigest.fields(hasher))
+            body = multipart.MultipartBody(data_to_send)
+            if self.rate_limiter is not None:
+                body.rate_limiter = self.rate_limiter
+                body.chunk_size = self.rate_limiter.chunk_size
+            if self.stall_timeout is not None:
+                body.chunk_size = min(
+                    body.chunk_size,
+                    max(1, int(self.stall_timeout * self.STALL_MIN_RATE / 4)),
                 )
 
-                resp = self.session.post(
-                    self.url,
-                    data=monitor,
+            with self._track_progress(package, len(body)) as callback:
+                body.callback = callback
+
+                sent = time.monotonic()
+                try:
+                    if self.resumable:
+                        resp = self._watch(
+                            package, body, lambda: self._post_resumable(body, timeout)
+                        )
+                    else:
+                        resp = self._watch(
+                            package,
+                            body,
+                            lambda: self.session.post(
+                                self.url,
+                                data=body,
+                                allow_redirects=False,
+                                headers={"Content-Type": body.content_type},
+                                timeout=timeout,
+                            ),
+                        )
+                finally:
+                    package.timings.add_request(
+                        sent, body.started, body.finished, time.monotonic()
+                    )
+                    package.timings.bytes_sent += body.bytes_read
+
+            if hasher is not None and content.exhausted:
+                # Keep the digests, so a retry can send them up front, and cache
+                # them for later commands.
+                package.set_digests(hasher.hexdigest())
+
+        return resp
+
+    def _post_resumable(
+        self, body: multipart.MultipartBody, timeout: retry.Timeout = None
+    ) -> requests.Response:
+        """Send ``body`` as a resumable upload, resuming it if it's interrupted.
+
+        This follows the `resumable uploads`_ draft: an empty upload is created,
+        and then the body is appended to it. If the connection fails, the offset
+        that the repository has received is fetched, and the rest of the body is
+        appended from there, up to ``MAX_RESUMES`` times. The response is the
+        repository's response to the complete body.
+
+        Repositories that don't create the upload are sent the body in a single
+        request instead.
+
+        .. _resumable uploads:
+            https://datatracker.ietf.org/doc/draft-ietf-httpbis-resumable-upload/
+        """
+        headers = {"Upload-Draft-Interop-Version": RESUMABLE_UPLOAD_INTEROP_VERSION}
+        resp = self.session.post(
+            self.url,
+            allow_redirects=False,
+            headers={
+                **headers,
+                "Content-Type": body.content_type,
+                "Upload-Complete": "?0",
+                "Upload-Length": str(len(body)),
+            },
+            timeout=timeout,
+        )
+        location = resp.headers.get("Location")
+        if resp.status_code != requests.codes.CREATED or not location:
+            logger.warning(
+                f"{self.url} doesn't support resumable uploads."
+                " Uploading in a single request."
+            )
+            return self.session.post(
+                self.url,
+                data=body,
+                allow_redirects=False,
+                headers={"Content-Type": body.content_type},
+                timeout=timeout,
+            )
+        upload_url = urljoin(self.url, location)
+
+        offset = 0
+        resumes = 0
+        while True:
+            body.seek(offset)
+            try:
+                resp = self.session.patch(
+                    upload_url,
+                    data=body,
                     allow_redirects=False,
-                    headers={"Content-Type": monitor.content_type},
+                    headers={
+                        **headers,
+                        "Content-Type": "application/partial-upload",
+                        "Upload-Complete": "?1",
+                        "Upload-Offset": str(offset),
+                    },
+                    timeout=timeout,
                 )
+            except (requests.ConnectionError, requests.Timeout):
+                received = None
+                if resumes < self.MAX_RESUMES:
+                    received = self._upload_offset(upload_url, headers, timeout)
+                if received is None:
+                    raise
+            else:
+                # A conflict means that the offset was wrong, e.g. when received
+                # data was lost by the repository.
+                if resp.status_code != requests.codes.CONFLICT:
+                    return resp
+                received = None
+                if resumes < self.MAX_RESUMES:
+                    received = self._upload_offset(upload_url, headers, timeout)
+                if received is None:
+                    return resp
+
+            resumes += 1
+            offset = received
+            logger.warning(
+                f"Upload interrupted. Resuming from byte {offset}"
+                f" ({resumes} of {self.MAX_RESUMES})."
+            )
 
-        return resp
+    def _upload_offset(
+        self, upload_url: str, headers: Dict[str, str], timeout: retry.Timeout = None
+    ) -> Optional[int]:
+        """Fetch the number of bytes of a resumable upload that have been received.
+
+        :return:
+            The offset, or ``None`` if it can't be fetched.
+        """
+        try:
+            resp = self.session.head(upload_url, headers=headers, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            return None
+        offset = resp.headers.get("Upload-Offset", "")
+        if not resp.ok or not offset.isdigit():
+            return None
+        return int(offset)
 
     def upload(
-        self, package: package_file.PackageFile, max_redirects: int = 5
+        self,
+        package: package_file.PackageFile,
+        max_redirects: Optional[int] = None,
+        *,
+        max_retries: Optional[int] = None,
     ) -> requests.Response:
-        number_of_redirects = 0
-        while number_of_redirects < max_redirects:
-            resp = self._upload(package)
+        """Upload a package, retrying according to ``retry_policy``.
 
-            if resp.status_code == requests.codes.OK:
-                return resp
-            if 500 <= resp.status_code < 600:
-                number_of_redirects += 1
-                logger.warning(
-                    f'Received "{resp.status_code}: {resp.reason}"'
-                    "\nPackage upload appears to have failed."
-                    f" Retry {number_of_redirects} of {max_redirects}."
-                )
+        :param package:
+            The package file to upload.
+        :param max_redirects:
+            Deprecated, use ``max_retries``. The maximum number of attempts to
+            upload the package, including the first.
+        :param max_retries:
+            The number of times to retry the upload, instead of the
+            ``max_retries`` of ``retry_policy``.
+        :return:
+            The response to the last attempt.
+        :raises requests.ConnectionError:
+            The last attempt failed to connect, or timed out.
+        :raises twine.exceptions.UploadStalled:
+            The last attempt stalled.
+        :raises twine.exceptions.DeadlineExceeded:
+            The deadline passed.
+        """
+        policy = self.retry_policy
+        if max_redirects is not None:
+            warnings.warn(
+                "max_redirects is deprecated, use max_retries, which doesn't count "
+                "the first attempt",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            if max_retries is None:
+                max_retries = max(max_redirects - 1, 0)
+        if max_retries is None:
+            max_retries = policy.max_retries
+        deadline = self._deadline
+        if policy.deadline is not None:
+            deadline = min(deadline or math.inf, time.monotonic() + policy.deadline)
+
+        retries = 0
+        while True:
+            started = time.monotonic()
+            error: Optional[Exception] = None
+            resp: Optional[requests.Response] = None
+            try:
+                resp = self._upload(package, self._timeout(policy.attempt_timeout))
+            except (
+                requests.ConnectionError,
+                requests.Timeout,
+                exceptions.UploadStalled,
+            ) as exc:
+                error = exc
+                outcome = f"{type(exc).__name__}: {exc}"
             else:
+                outcome = f'Received "{resp.status_code}: {resp.reason}"'
+            elapsed = time.monotonic() - started
+
+            if resp is not None and not policy.is_retryable(resp):
+                logger.info(f"Upload attempt {retries + 1} took {elapsed:.2f}s")
                 return resp
+            logger.info(f"Upload attempt {retries + 1} failed after {elapsed:.2f}s")
+
+            delay = policy.delay(retries + 1, resp)
+            if retries == max_retries or (
+                deadline is not None and time.monotonic() + delay > deadline
+            ):
+                if error is not None:
+                    raise error
+                return cast(requests.Response, resp)
+
+            retries += 1
+            package.timings.retries += 1
+            logger.warning(
+                f"{outcome}"
+                "\nPackage upload appears to have failed."
+                f" Retry {retries} of {max_retries} in {delay:.1f} seconds."
+            )
+            time.sleep(delay)
 
-        return resp
+    def _get_uploaded_files(
+        self,
+        url: str,
+        accept: str,
+        parse: Callable[[requests.Response], Dict[str, Optional[str]]],
+    ) -> Dict[str, Optional[str]]:
+        """Fetch the files that have been uploaded, from a listing at ``url``.
+
+        If the listing was fetched by an earlier run, the request is conditional on
+        its ETag, and a cached copy of the files is used if it's unchanged.
+
+        :return:
+            The sha256 digest of each file by its name, or ``None`` if the
+            listing doesn't include it.
+        """
+        headers = {"Accept": accept}
+
+        cache_path = None
+        cached = None
+        if self.release_cache_dir:
+            cache_path = cache.entry_path(self.release_cache_dir, url)
+            cached = cache.read_json(cache_path)
+            if isinstance(cached, dict) and {"etag", "files"} <= cached.keys():
+                headers["If-None-Match"] = cached["etag"]
+            else:
+                cached = None
+
+        response = self.session.get(url, headers=headers, timeout=self._timeout())
+        if response.status_code == 304 and cached:
+            return cast(Dict[str, Optional[str]], cached["files"])
+        if response.status_code != 200:
+            return {}
+
+        files = parse(response)
+        etag = response.headers.get("ETag")
+        if cache_path and etag:
+            cache.write_json(cache_path, {"etag": etag, "files": files})
+        return files
+
+    def _fetch_release_files(
+        self, safe_name: str, version: str
+    ) -> Dict[str, Optional[str]]:
+        """Fetch the files of a release from PyPI's JSON API."""
+        return self._get_uploaded_files(
+            f"{LEGACY_PYPI}pypi/{safe_name}/{version}/json",
+            "application/json",
+            lambda response: {
+                file["filename"]: file.get("digests", {}).get("sha256")
+                for file in response.json()["urls"]
+            },
+        )
+
+    def _fetch_simple_index_files(self, project: str) -> Dict[str, Optional[str]]:
+        """Fetch the files of a project from the simple index at ``index_url``.
+
+        The JSON form of the project page (:pep:`691`) is requested, but indexes
+        that only support the HTML form (:pep:`503`) are also supported.
+        """
+        index_url = cast(str, self.index_url)
+        return self._get_uploaded_files(
+            f"{index_url.rstrip('/')}/{project}/",
+            f"{SIMPLE_JSON_CONTENT_TYPE}, text/html;q=0.1",
+            _parse_simple_index_project,
+        )
+
+    def _uploaded_files_key(
+        self, package: package_file.PackageFile
+    ) -> Tuple[str, Optional[str]]:
+        # A simple index lists all the files of a project, rather than a release.
+        if self.index_url:
+            return (canonicalize_name(package.safe_name), None)
+        return (package.safe_name, package.version)
+
+    def _fetch_uploaded_files(
+        self, key: Tuple[str, Optional[str]]
+    ) -> Dict[str, Optional[str]]:
+        name, version = key
+        if version is None:
+            return self._fetch_simple_index_files(name)
+        return self._fetch_release_files(name, version)
+
+    def _supports_uploaded_files(self) -> bool:
+        # NOTE(sigmavirus24): Not all indices are PyPI and pypi.io doesn't
+        # have a similar interface for finding the package versions.
+        return bool(self.index_url) or self.url.startswith(
+            (LEGACY_PYPI, WAREHOUSE, OLD_WAREHOUSE)
+        )
+
+    def prefetch_uploaded_filenames(
+        self, packages: List[package_file.PackageFile]
+    ) -> None:
+        """Fetch the uploaded files of each release, for :meth:`package_is_uploaded`.
+
+        This makes one request per release (or per project, with a simple index),
+        rather than one per package.
+        """
+        if not self._supports_uploaded_files():
+            return
+
+        for key in dict.fromkeys(map(self._uploaded_files_key, packages)):
+            self._uploaded_files[key] = self._fetch_uploaded_files(key)
+
+    def _files_uploaded_with(
+        self, package: package_file.PackageFile, bypass_cache: bool = False
+    ) -> Dict[str, Optional[str]]:
+        """Return the uploaded files of the release (or project) of ``package``."""
+        key = self._uploaded_files_key(package)
+        files = None
+
+        if not bypass_cache:
+            files = self._uploaded_files.get(key)
+
+        if files is None:
+            files = self._fetch_uploaded_files(key)
+            self._uploaded_files[key] = files
+
+        return files
 
     def package_is_uploaded(
         self, package: package_file.PackageFile, bypass_cache: bool = False
     ) -> bool:
-        """Determine if a package has been uploaded to PyPI already.
+        """Determine if a package has been uploaded to the repository already.
 
-        .. warning:: This does not support indexes other than PyPI or TestPyPI
+        For PyPI, this uses its JSON API. For other repositories, this uses the
+        simple index at ``index_url``, if it's configured. An uploaded file with the
+        same name is checked with :meth:`verify_package_integrity`.
 
         :param package:
             The package file that will otherwise be uploaded.
         :type package:
             :class:`~twine.package.PackageFile`
         :param bypass_cache:
-            Force a request to PyPI.
+            Force a request to the repository.
         :type bypass_cache:
             bool
         :returns:
             True if package has already been uploaded, False otherwise
         :rtype:
             bool
+        :raises twine.exceptions.PackageIntegrityMismatch:
+            A file with the same name, but a different digest, has been uploaded.
         """
-        # NOTE(sigmavirus24): Not all indices are PyPI and pypi.io doesn't
-        # have a similar interface for finding the package versions.
-        if not self.url.startswith((LEGACY_PYPI, WAREHOUSE, OLD_WAREHOUSE)):
+        if not self._supports_uploaded_files():
             return False
 
-        safe_name = package.safe_name
-        releases = None
-
-        if not bypass_cache:
-            releases = self._releases_json_data.get(safe_name)
-
-        if releases is None:
-            url = f"{LEGACY_PYPI}pypi/{safe_name}/json"
-            headers = {"Accept": "application/json"}
-            response = self.session.get(url, headers=headers)
-            if response.status_code == 200:
-                releases = response.json()["releases"]
-            else:
-                releases = {}
-            self._releases_json_data[safe_name] = releases
-
-        packages = releases.get(package.version, [])
-
-        for uploaded_package in packages:
-            if uploaded_package["filename"] == package.basefilename:
-                return True
+        files = self._files_uploaded_with(package, bypass_cache)
+        if package.basefilename not in files:
+            return False
 
-        return False
+        self.verify_package_integrity(package)
+        return True
 
     def release_urls(self, packages: List[package_file.PackageFile]) -> Set[str]:
         if self.url.startswith(WAREHOUSE):
@@ -223,6 +802,28 @@ class Repository:
         }
 
     def verify_package_integrity(self, package: package_file.PackageFile) -> None:
-        # TODO(sigmavirus24): Add a way for users to download the package and
-        # check its hash against what it has locally.
-        pass
+        """Verify that an uploaded file with the name of ``package`` is the same.
+
+        The sha256 digest of ``package`` is compared to the digest published by the
+        repository. If the repository doesn't publish a digest for the file, or
+        there's no such file, there's nothing to compare.
+
+        :raises twine.exceptions.PackageIntegrityMismatch:
+            The digests are different.
+        """
+        if not self._supports_uploaded_files():
+            return
+
+        uploaded_digest = self._files_uploaded_with(package).get(package.basefilename)
+        if uploaded_digest is None:
+            return
+
+        if package.sha2_digest is None:
+            # The file wasn't hashed before uploading, but that's cheaper than
+            # uploading it again.
+            package.set_digests()
+
+        if package.sha2_digest != uploaded_digest:
+            raise exceptions.PackageIntegrityMismatch.from_args(
+                package.basefilename, cast(str, package.sha2_digest), uploaded_digest
+            )
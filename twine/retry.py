@@ -0,0 +1,102 @@
+"""Module containing the policy for retrying failed uploads."""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import random
+from typing import FrozenSet, Optional, Tuple, Union
+
+import requests
+import urllib3
+
+#: A timeout for ``requests``, in seconds: either a single value, or a
+#: ``(connect, read)`` tuple.
+Timeout = Union[None, float, Tuple[Optional[float], Optional[float]]]
+
+DEFAULT_RETRY_STATUSES = frozenset([requests.codes.TOO_MANY_REQUESTS, *range(500, 600)])
+
+
+class RetryPolicy:
+    """How an upload is retried when it fails.
+
+    An upload is retried when the repository responds with one of
+    ``retry_statuses``, or when the request fails with a connection error or a
+    timeout, or stalls. Since the file may have been received before a timeout, a
+    retry can be rejected because the file already exists.
+
+    The delay before each retry grows exponentially, and is randomly reduced by
+    up to ``jitter`` of itself, so that many clients don't retry at once. A
+    ``Retry-After`` header in the response is honored, if it's longer.
+
+    :param max_retries:
+        The number of times to retry an upload.
+    :param backoff_factor:
+        The delay before the first retry, in seconds, which doubles for each
+        subsequent retry.
+    :param max_backoff:
+        The maximum delay before a retry, in seconds, except for a ``Retry-After``.
+    :param jitter:
+        The fraction of the delay, between 0 and 1, that is randomly skipped.
+    :param attempt_timeout:
+        The ``requests`` timeout for each attempt, i.e. the number of seconds to
+        wait to connect, and for the repository to send data.
+    :param deadline:
+        The number of seconds after the first attempt started, after which there
+        are no more retries. ``None`` for no deadline.
+    :param retry_statuses:
+        The response statuses that are retried.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        backoff_factor: float = 1.0,
+        max_backoff: float = 60.0,
+        jitter: float = 1.0,
+        attempt_timeout: Timeout = None,
+        deadline: Optional[float] = None,
+        retry_statuses: FrozenSet[int] = DEFAULT_RETRY_STATUSES,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.attempt_timeout = attempt_timeout
+        self.deadline = deadline
+        self.retry_statuses = retry_statuses
+
+    def is_retryable(self, response: requests.Response) -> bool:
+        """Return whether an upload with ``response`` should be retried."""
+        return response.status_code in self.retry_statuses
+
+    def delay(self, retry: int, response: Optional[requests.Response] = None) -> float:
+        """Return the number of seconds to wait before a retry.
+
+        :param retry:
+            The number of the retry, starting from 1.
+        :param response:
+            The response to the failed attempt, if there was one.
+        """
+        backoff = min(self.backoff_factor * 2.0 ** (retry - 1), self.max_backoff)
+        backoff *= 1 - self.jitter * random.random()
+
+        retry_after = None
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                # Use urllib3's parsing of seconds or an HTTP date.
+                seconds: float = urllib3.Retry().parse_retry_after(retry_after)
+            except urllib3.exceptions.InvalidHeader:
+                pass
+            else:
+                backoff = max(backoff, seconds)
+        return backoff
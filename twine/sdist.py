@@ -1,22 +1,38 @@
+import contextlib
 import os
 import tarfile
 import zipfile
 from contextlib import suppress
+from typing import (
+    TYPE_CHECKING,
+    ContextManager,
+    Dict,
+    Iterator,
+    Literal,
+    Optional,
+    Type,
+    cast,
+)
 
 from twine import distribution
 from twine import exceptions
 
+# zstandard is only required for .tar.zst sdists before Python 3.14, via the
+# ``zstd`` extra.
+if TYPE_CHECKING:
+    import zstandard
+else:
+    try:
+        import zstandard
+    except ModuleNotFoundError:  # pragma: no cover
+        zstandard = None
+
 
 class SDist(distribution.Distribution):
     def __new__(cls, filename: str) -> "SDist":
         if cls is not SDist:
             return object.__new__(cls)
 
-        FORMATS = {
-            ".tar.gz": TarGzSDist,
-            ".zip": ZipSDist,
-        }
-
         for extension, impl in FORMATS.items():
             if filename.endswith(extension):
                 return impl(filename)
@@ -32,19 +48,57 @@ class SDist(distribution.Distribution):
         return "source"
 
 
-class TarGzSDist(SDist):
+class TarSDist(SDist):
+    """A tar archive, compressed with the ``COMPRESSION`` of :func:`tarfile.open`."""
+
+    COMPRESSION = ""
+    # The number of bytes after PKG-INFO whose members are still checked to be in
+    # the top-level directory
+    SCAN_LIMIT = 1024 * 1024
 
     def read(self) -> bytes:
-        with tarfile.open(self.filename, "r:gz") as sdist:
+        """Read PKG-INFO, decompressing the archive only until it's found.
+
+        Every member up to PKG-INFO is checked to be in the top-level directory, and
+        so are the members in the following ``SCAN_LIMIT`` bytes, rather than
+        decompressing the whole archive to check every member.
+
+        As a result, an archive that's truncated or corrupted after those members
+        isn't reported as invalid, since that part of it is never decompressed.
+        """
+        try:
+            with self._open() as sdist:
+                data = self._read_pkg_info(sdist)
+        except tarfile.ReadError:
+            # A truncated archive fails when it's streamed, rather than raising
+            # EOFError.
+            raise exceptions.InvalidDistribution(
+                f"Invalid distribution file: '{os.path.basename(self.filename)}'"
+            )
+
+        if data is not None and b"Metadata-Version" in data:
+            return data
+
+        raise exceptions.InvalidDistribution(
+            "No PKG-INFO in archive or "
+            f"PKG-INFO missing 'Metadata-Version': {self.filename}"
+        )
+
+    def _read_pkg_info(self, sdist: tarfile.TarFile) -> Optional[bytes]:
+        root: Optional[str] = None
+        data: Optional[bytes] = None
+        scan_end: Optional[int] = None
+        for member in sdist:
             # The sdist must contain a single top-level directory...
-            root = os.path.commonpath(sdist.getnames())
-            if root in {".", "/", ""}:
+            parts = [part for part in member.name.split("/") if part not in {"", "."}]
+            if member.name.startswith("/") or not parts or root not in {None, parts[0]}:
                 raise exceptions.InvalidDistribution(
                     f"Too many top-level members in sdist archive: {self.filename}"
                 )
+            root = parts[0]
+
             # ...containing the package metadata in a ``PKG-INFO`` file.
-            with suppress(KeyError):
-                member = sdist.getmember(root.rstrip("/") + "/PKG-INFO")
+            if data is None and parts[1:] == ["PKG-INFO"]:
                 if not member.isfile():
                     raise exceptions.InvalidDistribution(
                         f"PKG-INFO is not a regular file: {self.filename}"
@@ -52,13 +106,55 @@ class TarGzSDist(SDist):
                 fd = sdist.extractfile(member)
                 assert fd is not None, "for mypy"
                 data = fd.read()
-                if b"Metadata-Version" in data:
-                    return data
+                scan_end = member.offset_data + member.size + self.SCAN_LIMIT
 
-        raise exceptions.InvalidDistribution(
-            "No PKG-INFO in archive or "
-            f"PKG-INFO missing 'Metadata-Version': {self.filename}"
-        )
+            if scan_end is not None and member.offset_data + member.size > scan_end:
+                break
+
+        return data
+
+    def _open(self) -> ContextManager[tarfile.TarFile]:
+        """Open the archive to be decompressed as its members are read."""
+        # typeshed only accepts the modes of tarfile.open() as literals
+        mode = cast(Literal["r|"], f"r|{self.COMPRESSION}")
+        return tarfile.open(self.filename, mode)
+
+
+class TarGzSDist(TarSDist):
+    COMPRESSION = "gz"
+
+
+class TarBz2SDist(TarSDist):
+    COMPRESSION = "bz2"
+
+
+class TarXzSDist(TarSDist):
+    COMPRESSION = "xz"
+
+
+class TarZstSDist(TarSDist):
+    COMPRESSION = "zst"
+
+    def _open(self) -> ContextManager[tarfile.TarFile]:
+        if zstandard is not None:
+            return self._open_zstandard()
+        try:
+            return super()._open()
+        except tarfile.CompressionError:
+            raise exceptions.InvalidDistribution(
+                "Reading a .tar.zst sdist requires Python 3.14 or zstandard. "
+                "Install it with: pip install 'twine[zstd]'"
+            )
+
+    @contextlib.contextmanager
+    def _open_zstandard(self) -> Iterator[tarfile.TarFile]:
+        with open(self.filename, "rb") as fp:
+            reader = zstandard.ZstdDecompressor().stream_reader(fp)
+            try:
+                with tarfile.open(fileobj=reader, mode="r|") as sdist:
+                    yield sdist
+            except zstandard.ZstdError:
+                raise tarfile.ReadError("invalid zstd data")
 
 
 class ZipSDist(SDist):
@@ -81,3 +177,23 @@ class ZipSDist(SDist):
             "No PKG-INFO in archive or "
             f"PKG-INFO missing 'Metadata-Version': {self.filename}"
         )
+
+
+#: The class that reads each format of sdist, by the extension of its filename.
+FORMATS: Dict[str, Type[SDist]] = {
+    ".tar.gz": TarGzSDist,
+    ".tar.bz2": TarBz2SDist,
+    ".tar.xz": TarXzSDist,
+    ".tar.zst": TarZstSDist,
+    ".zip": ZipSDist,
+}
+
+
+def register_format(extension: str, impl: Type[SDist]) -> None:
+    """Read sdists whose filename ends with ``extension`` with ``impl``.
+
+    A tar archive with another compression can subclass :class:`TarSDist`, and
+    override ``_open`` to decompress it as a stream, so that its ``PKG-INFO`` is
+    read without decompressing the rest of the archive.
+    """
+    FORMATS[extension] = impl
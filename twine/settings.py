@@ -16,13 +16,20 @@
 import argparse
 import contextlib
 import logging
-from typing import Any, Optional, cast
+import os
+from typing import Any, Optional, Union, cast
 
 from twine import auth
+from twine import cache
 from twine import exceptions
+from twine import package
 from twine import repository
+from twine import transports
 from twine import utils
 
+# The multipliers of the suffixes of --max-rate
+_RATE_SUFFIXES = {"K": 1024, "M": 1024**2, "G": 1024**3}
+
 
 class Settings:
     """Object that manages the configuration for Twine.
@@ -61,6 +68,18 @@ class Settings:
         repository_url: Optional[str] = None,
         verbose: bool = False,
         disable_progress_bar: bool = False,
+        jobs: int = 1,
+        single_pass_hashing: bool = False,
+        digest_cache: bool = False,
+        http2: bool = False,
+        index_url: Optional[str] = None,
+        resumable_upload: bool = False,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        stall_timeout: Optional[float] = None,
+        max_rate: Union[None, str, float] = None,
+        report_json: Optional[str] = None,
         **ignored_kwargs: Any,
     ) -> None:
         """Initialize our settings instance.
@@ -107,16 +126,69 @@ class Settings:
             Show verbose output.
         :param disable_progress_bar:
             Disable the progress bar.
+        :param jobs:
+            The number of distributions to read and upload concurrently.
+        :param single_pass_hashing:
+            Compute the digests of each distribution while uploading it, instead
+            of reading it beforehand.
+        :param digest_cache:
+            Cache the digests of each distribution, so they aren't computed again
+            when the same file is uploaded again.
+        :param http2:
+            Make requests to the repository over HTTP/2, which requires ``httpx``.
+        :param index_url:
+            The URL of the simple index (package index) for the repository, used
+            to find existing files for ``skip_existing``. This overrides the
+            ``index_url`` in the config file.
+        :param resumable_upload:
+            Upload each distribution as a resumable upload, which is resumed if
+            the connection fails, when the repository supports it.
+        :param connect_timeout:
+            The number of seconds to wait to connect to the repository. This
+            overrides the ``connect_timeout`` in the config file.
+        :param read_timeout:
+            The number of seconds to wait for the repository to send data. This
+            overrides the ``read_timeout`` in the config file.
+        :param deadline:
+            The number of seconds that uploading to the repository may take in
+            total. This overrides the ``deadline`` in the config file.
+        :param stall_timeout:
+            The number of seconds that an upload may send no data before it's
+            abandoned, and retried. This overrides the ``stall_timeout`` in the
+            config file.
+        :param max_rate:
+            The maximum rate to upload at, in bytes per second. This can be a
+            number, or a string, optionally with a ``K``, ``M``, or ``G`` suffix,
+            e.g. ``"500K"``. This is shared by concurrent uploads.
+        :param report_json:
+            The path to write a JSON report of the time taken by each phase of
+            uploading each distribution.
         """
         self.config_file = config_file
         self.comment = comment
         self.verbose = verbose
         self.disable_progress_bar = disable_progress_bar
         self.skip_existing = skip_existing
+        self.single_pass_hashing = single_pass_hashing
+        self.resumable_upload = resumable_upload
+        self.report_json = report_json
+        self.digest_cache = (
+            package.DigestCache(os.path.join(cache.user_cache_dir(), "digests"))
+            if digest_cache
+            else None
+        )
+        self._handle_concurrency(jobs)
+        self._handle_max_rate(max_rate)
+        self.transport = transports.HTTP2Adapter() if http2 else None
         self._handle_repository_options(
             repository_name=repository_name,
             repository_url=repository_url,
         )
+        self.index_url = index_url or self.repository_config.get("index_url")
+        self.connect_timeout = self._get_timeout("connect_timeout", connect_timeout)
+        self.read_timeout = self._get_timeout("read_timeout", read_timeout)
+        self.deadline = self._get_timeout("deadline", deadline)
+        self.stall_timeout = self._get_timeout("stall_timeout", stall_timeout)
         self.attestations = attestations
         self._handle_package_signing(
             sign=sign,
@@ -128,6 +200,7 @@ class Settings:
         self.auth = auth.Resolver.choose(not non_interactive)(
             self.repository_config,
             auth.CredentialInput(username, password),
+            concurrency=self.jobs,
         )
 
     @property
@@ -179,6 +252,17 @@ class Settings:
             " This overrides --repository. "
             "(Can also be set via %(env)s environment variable.)",
         )
+        parser.add_argument(
+            "--index-url",
+            action=utils.EnvironmentDefault,
+            env="TWINE_INDEX_URL",
+            default=None,
+            required=False,
+            help="The simple index URL of the repository, e.g. "
+            "https://example.com/simple/, used by --skip-existing to find the "
+            "files that have already been uploaded, before uploading them. "
+            "(Can also be set via %(env)s environment variable.)",
+        )
         parser.add_argument(
             "--attestations",
             action="store_true",
@@ -278,6 +362,116 @@ class Settings:
             action="store_true",
             help="Disable the progress bar.",
         )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=1,
+            metavar="N",
+            help="Read and upload up to N distributions concurrently. Wheels "
+            "are still uploaded before the source distribution. "
+            "[default: %(default)s]",
+        )
+        parser.add_argument(
+            "--single-pass-hashing",
+            default=False,
+            action="store_true",
+            help="Compute the digests of each distribution while uploading it, "
+            "so it is only read once. The digests are sent after the file "
+            "contents, which some package indexes may not support.",
+        )
+        parser.add_argument(
+            "--digest-cache",
+            action=argparse.BooleanOptionalAction,
+            default=utils.EnvironmentFlag.bool_from_env(
+                os.environ.get("TWINE_DIGEST_CACHE")
+            ),
+            help="Cache the digests of each distribution in the user's cache "
+            "directory, so that uploading the same files again doesn't read "
+            "them again. A cached digest is only used while the file's size, "
+            "modification time, and inode are unchanged. (Can also be set via "
+            "TWINE_DIGEST_CACHE environment variable.)",
+        )
+        parser.add_argument(
+            "--http2",
+            default=False,
+            action="store_true",
+            help="Upload over HTTP/2 when the repository supports it, so "
+            "concurrent uploads share a single connection. Requires httpx, "
+            "from the twine[http2] extra.",
+        )
+        parser.add_argument(
+            "--resumable-upload",
+            default=False,
+            action="store_true",
+            help="Upload each distribution as a resumable upload, so an upload "
+            "that is interrupted continues from the last byte the repository "
+            "received, instead of starting again. Repositories that don't "
+            "support resumable uploads are sent each distribution in a single "
+            "request.",
+        )
+        parser.add_argument(
+            "--connect-timeout",
+            action=utils.EnvironmentDefault,
+            env="TWINE_CONNECT_TIMEOUT",
+            required=False,
+            type=float,
+            metavar="SECONDS",
+            help="The number of seconds to wait to connect to the repository. "
+            "(Can also be set via %(env)s environment variable.)",
+        )
+        parser.add_argument(
+            "--read-timeout",
+            action=utils.EnvironmentDefault,
+            env="TWINE_READ_TIMEOUT",
+            required=False,
+            type=float,
+            metavar="SECONDS",
+            help="The number of seconds to wait for the repository to send data, "
+            "e.g. to respond after an upload. (Can also be set via %(env)s "
+            "environment variable.)",
+        )
+        parser.add_argument(
+            "--deadline",
+            action=utils.EnvironmentDefault,
+            env="TWINE_DEADLINE",
+            required=False,
+            type=float,
+            metavar="SECONDS",
+            help="The number of seconds that uploading to the repository may "
+            "take in total, including retries. (Can also be set via %(env)s "
+            "environment variable.)",
+        )
+        parser.add_argument(
+            "--stall-timeout",
+            action=utils.EnvironmentDefault,
+            env="TWINE_STALL_TIMEOUT",
+            required=False,
+            type=float,
+            metavar="SECONDS",
+            help="Abandon and retry an upload when none of it has been sent for "
+            "this many seconds. (Can also be set via %(env)s environment "
+            "variable.)",
+        )
+        parser.add_argument(
+            "--max-rate",
+            action=utils.EnvironmentDefault,
+            env="TWINE_MAX_RATE",
+            required=False,
+            metavar="RATE",
+            help="Upload at most RATE bytes per second in total, e.g. 500K or "
+            "10M, including concurrent uploads. (Can also be set via %(env)s "
+            "environment variable.)",
+        )
+        parser.add_argument(
+            "--report-json",
+            action=utils.EnvironmentDefault,
+            env="TWINE_REPORT_JSON",
+            required=False,
+            metavar="PATH",
+            help="Write a JSON report to PATH of the time taken by each phase of "
+            "uploading each distribution, with the bytes sent and the number of "
+            "retries. (Can also be set via %(env)s environment variable.)",
+        )
 
     @classmethod
     def from_argparse(cls, args: argparse.Namespace) -> "Settings":
@@ -298,6 +492,47 @@ class Settings:
         self.sign_with = sign_with
         self.identity = identity
 
+    def _handle_concurrency(self, jobs: int) -> None:
+        if jobs < 1:
+            raise exceptions.InvalidConfiguration(
+                f"jobs must be a positive number, not {jobs}"
+            )
+        self.jobs = jobs
+
+    def _handle_max_rate(self, max_rate: Union[None, str, float]) -> None:
+        self.max_rate: Optional[float] = None
+        if max_rate is None or max_rate == "":
+            return
+
+        number, suffix = max_rate, ""
+        if isinstance(max_rate, str) and max_rate[-1].upper() in _RATE_SUFFIXES:
+            number, suffix = max_rate[:-1], max_rate[-1].upper()
+        try:
+            self.max_rate = float(number) * _RATE_SUFFIXES.get(suffix, 1)
+        except (TypeError, ValueError):
+            pass
+        if self.max_rate is None or not 0 < self.max_rate < float("inf"):
+            raise exceptions.InvalidConfiguration(
+                "max_rate must be a positive number of bytes per second, "
+                f"optionally with a K, M, or G suffix, not {max_rate!r}"
+            )
+
+    def _get_timeout(self, name: str, value: Optional[float]) -> Optional[float]:
+        """Get a number of seconds from ``value``, or the repository config."""
+        if value is None and self.repository_config.get(name) is not None:
+            config_value = cast(str, self.repository_config[name])
+            try:
+                value = float(config_value)
+            except ValueError:
+                raise exceptions.InvalidConfiguration(
+                    f"{name} must be a number of seconds, not {config_value!r}"
+                )
+        if value is not None and not value > 0:
+            raise exceptions.InvalidConfiguration(
+                f"{name} must be a positive number of seconds, not {value:g}"
+            )
+        return value
+
     def _handle_repository_options(
         self, repository_name: str, repository_url: Optional[str]
     ) -> None:
@@ -317,7 +552,8 @@ class Settings:
         """Verify configured settings are supported for the configured repository.
 
         This presently checks:
-        - ``--skip-existing`` was only provided for PyPI and TestPyPI
+        - ``--skip-existing`` was only provided for PyPI and TestPyPI, or with
+          ``--index-url``
 
         :raises twine.exceptions.UnsupportedConfiguration:
             The configured features are not available with the configured
@@ -325,8 +561,12 @@ class Settings:
         """
         repository_url = cast(str, self.repository_config["repository"])
 
-        if self.skip_existing and not repository_url.startswith(
-            (repository.WAREHOUSE, repository.TEST_WAREHOUSE)
+        if (
+            self.skip_existing
+            and not self.index_url
+            and not repository_url.startswith(
+                (repository.WAREHOUSE, repository.TEST_WAREHOUSE)
+            )
         ):
             raise exceptions.UnsupportedConfiguration.Builder().with_feature(
                 "--skip-existing"
@@ -354,6 +594,15 @@ class Settings:
             self.username,
             self.password,
             self.disable_progress_bar,
+            concurrency=self.jobs,
+            transport=self.transport,
+            release_cache_dir=os.path.join(cache.user_cache_dir(), "releases"),
+            index_url=self.index_url,
+            resumable=self.resumable_upload,
+            timeout=(self.connect_timeout, self.read_timeout),
+            deadline=self.deadline,
+            stall_timeout=self.stall_timeout,
+            max_rate=self.max_rate,
         )
         repo.set_certificate_authority(self.cacert)
         repo.set_client_certificate(self.client_cert)
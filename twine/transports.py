@@ -0,0 +1,231 @@
+"""Module containing alternative transports for a repository's requests.
+
+A transport is a :class:`requests.adapters.BaseAdapter` that is mounted on the
+repository's session, so the requests themselves are unchanged.
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import os
+import ssl
+import threading
+import typing as t
+
+import requests
+import requests.adapters
+import requests.structures
+import requests.utils
+import urllib3
+
+from twine import exceptions
+from twine import utils
+
+# httpx is only required for HTTP/2, via the ``http2`` extra.
+if t.TYPE_CHECKING:
+    import httpx
+else:
+    try:
+        import httpx
+    except ModuleNotFoundError:  # pragma: no cover
+        httpx = None
+
+# Headers that are managed by httpx, some of which aren't allowed in HTTP/2.
+_HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "transfer-encoding", "upgrade"}
+
+_Verify = t.Union[bool, str]
+_Cert = t.Union[None, bytes, str, t.Tuple[t.Union[bytes, str], t.Union[bytes, str]]]
+_Timeout = t.Union[None, float, t.Tuple[t.Optional[float], t.Optional[float]]]
+
+
+def _ssl_context(verify: _Verify, cert: _Cert) -> ssl.SSLContext:
+    """Create an SSL context for the ``verify`` and ``cert`` of a request."""
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    else:
+        ca = requests.utils.DEFAULT_CA_BUNDLE_PATH
+        if isinstance(verify, str):
+            ca = verify
+        if os.path.isdir(ca):
+            context = ssl.create_default_context(capath=ca)
+        else:
+            context = ssl.create_default_context(cafile=ca)
+
+    if isinstance(cert, (bytes, str)):
+        context.load_cert_chain(cert)
+    elif cert:
+        context.load_cert_chain(*cert)
+    return context
+
+
+def _timeout(timeout: _Timeout) -> "httpx.Timeout":
+    """Convert a ``requests`` timeout, which applies to connecting and reading."""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+    else:
+        connect = read = timeout
+    return httpx.Timeout(None, connect=connect, read=read)
+
+
+class HTTP2Adapter(requests.adapters.BaseAdapter):
+    """A transport that makes requests over HTTP/2, using ``httpx``.
+
+    Concurrent requests to the same host are multiplexed over a single connection,
+    rather than each using its own. Servers that don't support HTTP/2 are sent
+    HTTP/1.1 requests instead.
+
+    Proxies are taken from the environment, as with ``requests``, but the
+    ``proxies`` of a session are ignored.
+
+    :param http1:
+        Whether to fall back to HTTP/1.1. If ``False``, HTTP/2 is used without
+        negotiating it, including for ``http://`` URLs.
+    :param max_retries:
+        How requests are retried, which defaults to the retries of the sessions
+        made by :func:`twine.utils.make_requests_session`.
+
+    :raises twine.exceptions.InvalidConfiguration:
+        ``httpx`` isn't installed.
+    """
+
+    def __init__(
+        self, http1: bool = True, max_retries: t.Optional[urllib3.Retry] = None
+    ) -> None:
+        if httpx is None:
+            raise exceptions.InvalidConfiguration(
+                "HTTP/2 requires httpx. Install it with: pip install 'twine[http2]'"
+            )
+        super().__init__()
+        self.http1 = http1
+        self.max_retries = utils.REQUEST_RETRIES if max_retries is None else max_retries
+        self._clients: t.Dict[t.Tuple[_Verify, _Cert], httpx.Client] = {}
+        self._lock = threading.Lock()
+
+    def _client(self, verify: _Verify, cert: _Cert) -> "httpx.Client":
+        # The TLS settings of an httpx client can't be changed per request.
+        key = (verify, cert)
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = httpx.Client(
+                    verify=_ssl_context(verify, cert),
+                    http1=self.http1,
+                    http2=True,
+                )
+            return self._clients[key]
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: _Timeout = None,
+        verify: _Verify = True,
+        cert: _Cert = None,
+        proxies: t.Optional[t.Mapping[str, str]] = None,
+    ) -> requests.Response:
+        """Send a prepared request, returning its response.
+
+        The request is retried with ``max_retries``, as it would be by the
+        :class:`requests.adapters.HTTPAdapter` that this replaces.
+        """
+        method = t.cast(str, request.method)
+        url = t.cast(str, request.url)
+        retries = self.max_retries
+        while True:
+            try:
+                http_response = self._request(request, timeout, verify, cert)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as exc:
+                # Nothing was sent, so the request can be retried, like urllib3
+                # retries a connection error.
+                try:
+                    retries = retries.increment(
+                        method, url, error=urllib3.exceptions.ConnectTimeoutError(exc)
+                    )
+                except urllib3.exceptions.MaxRetryError:
+                    raise _request_exception(exc, request) from exc
+                retries.sleep()
+                continue
+            except httpx.TransportError as exc:
+                raise _request_exception(exc, request) from exc
+
+            has_retry_after = "Retry-After" in http_response.headers
+            if not retries.is_retry(method, http_response.status_code, has_retry_after):
+                return _response(request, http_response)
+
+            retried_response = urllib3.HTTPResponse(
+                headers=dict(http_response.headers),
+                status=http_response.status_code,
+            )
+            try:
+                retries = retries.increment(method, url, response=retried_response)
+            except urllib3.exceptions.MaxRetryError as exc:
+                raise requests.exceptions.RetryError(exc, request=request) from exc
+            retries.sleep(retried_response)
+
+    def _request(
+        self,
+        request: requests.PreparedRequest,
+        timeout: _Timeout,
+        verify: _Verify,
+        cert: _Cert,
+    ) -> "httpx.Response":
+        body = request.body
+        if isinstance(body, str):
+            body = body.encode()
+
+        return self._client(verify, cert).request(
+            t.cast(str, request.method),
+            t.cast(str, request.url),
+            headers={
+                name: value
+                for name, value in request.headers.items()
+                if name.lower() not in _HOP_BY_HOP_HEADERS
+            },
+            content=body,
+            timeout=_timeout(timeout),
+        )
+
+    def close(self) -> None:
+        """Close the connections of every client."""
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+def _request_exception(
+    exc: Exception, request: requests.PreparedRequest
+) -> requests.exceptions.RequestException:
+    """Convert an ``httpx`` exception to the one raised by ``requests``."""
+    if isinstance(exc, httpx.ConnectTimeout):
+        return requests.exceptions.ConnectTimeout(exc, request=request)
+    if isinstance(exc, httpx.TimeoutException):
+        return requests.exceptions.ReadTimeout(exc, request=request)
+    return requests.exceptions.ConnectionError(exc, request=request)
+
+
+def _response(
+    request: requests.PreparedRequest, http_response: "httpx.Response"
+) -> requests.Response:
+    """Convert an ``httpx`` response to a ``requests`` response."""
+    response = requests.Response()
+    response.status_code = http_response.status_code
+    response.reason = http_response.reason_phrase
+    response.headers = requests.structures.CaseInsensitiveDict(http_response.headers)
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    # The content has already been decoded by httpx.
+    response.raw = io.BytesIO(http_response.content)
+    response.url = t.cast(str, request.url)
+    response.request = request
+    response.elapsed = http_response.elapsed
+    return response
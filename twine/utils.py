@@ -40,6 +40,9 @@ TEST_REPOSITORY = "https://test.pypi.org/legacy/"
 
 DEFAULT_CONFIG_FILE = "~/.pypirc"
 
+# The minimum number of connections kept open to each host.
+DEFAULT_POOL_SIZE = requests.adapters.DEFAULT_POOLSIZE
+
 # TODO: In general, it seems to be assumed that the values retrieved from
 # instances of this type aren't None, except for username and password.
 # Type annotations would be cleaner if this were Dict[str, str], but that
@@ -135,6 +138,11 @@ def get_config(path: str) -> Dict[str, RepositoryConfig]:
             "password",
             "ca_cert",
             "client_cert",
+            "index_url",
+            "connect_timeout",
+            "read_timeout",
+            "deadline",
+            "stall_timeout",
         ]:
             if parser.has_option(repository, key):
                 config[repository][key] = parser.get(repository, key)
@@ -354,19 +362,37 @@ get_cacert = functools.partial(get_userpass_value, key="ca_cert")
 get_clientcert = functools.partial(get_userpass_value, key="client_cert")
 
 
-def make_requests_session() -> requests.Session:
-    """Prepare a requests Session with retries & twine's user-agent string."""
-    s = requests.Session()
+#: How requests are retried: connection errors for every request, and server
+#: errors for ``GET`` requests.
+REQUEST_RETRIES = urllib3.Retry(
+    allowed_methods=["GET"],
+    connect=5,
+    total=10,
+    status_forcelist=[500, 501, 502, 503],
+)
 
-    retry = urllib3.Retry(
-        allowed_methods=["GET"],
-        connect=5,
-        total=10,
-        status_forcelist=[500, 501, 502, 503],
-    )
 
+@functools.lru_cache(maxsize=None)
+def _shared_http_adapter(pool_size: int) -> HTTPAdapter:
+    return HTTPAdapter(max_retries=REQUEST_RETRIES, pool_maxsize=pool_size)
+
+
+def make_requests_session(concurrency: int = 1) -> requests.Session:
+    """Prepare a requests Session with retries & twine's user-agent string.
+
+    The connection pools of the session are shared with every other session
+    created with the same ``concurrency``, so connections are kept alive across
+    sessions, e.g. between minting a Trusted Publishing token and uploading.
+
+    :param concurrency:
+        The number of requests that might be made at once. Enough connections are
+        kept open to each host for this many requests.
+    """
+    s = requests.Session()
+
+    adapter = _shared_http_adapter(max(concurrency, DEFAULT_POOL_SIZE))
     for scheme in ("http://", "https://"):
-        s.mount(scheme, HTTPAdapter(max_retries=retry))
+        s.mount(scheme, adapter)
 
     s.headers["User-Agent"] = (
         user_agent.UserAgentBuilder("twine", twine.__version__)
@@ -13,8 +13,10 @@
 # limitations under the License.
 import os
 import re
+import struct
 import zipfile
-from typing import List
+import zlib
+from typing import IO, List, Optional
 
 from twine import distribution
 from twine import exceptions
@@ -26,6 +28,108 @@ wheel_file_re = re.compile(
     re.VERBOSE,
 )
 
+# The records of a zip archive that are used to read a single file, from
+# https://pkware.cachefly.net/webdocs/casestudies/APPNOTE.TXT
+_END_OF_CENTRAL_DIRECTORY = struct.Struct("<4s4H2LH")
+_ZIP64_END_OF_CENTRAL_DIRECTORY = struct.Struct("<4sQ2H2L4Q")
+_ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR = struct.Struct("<4sLQL")
+_CENTRAL_DIRECTORY_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+_LOCAL_FILE_HEADER = struct.Struct("<4s2B4HL2L2H")
+_MAX_COMMENT_LENGTH = 0xFFFF
+
+
+def _read_zip_member(fp: IO[bytes], name: str) -> Optional[bytes]:
+    """Read a file from a zip archive, without reading the entries of other files.
+
+    :mod:`zipfile` parses the central directory entry of every file when the archive
+    is opened, which is slow for archives with many files. Instead, this searches
+    the central directory for ``name``.
+
+    :return:
+        The contents of the file, or ``None`` if it isn't found, or the archive uses
+        a feature that isn't supported here, like encryption, compression other
+        than deflate, or data before the archive, so that :mod:`zipfile` can read
+        it instead.
+    """
+    size = fp.seek(0, os.SEEK_END)
+    tail_size = min(size, _END_OF_CENTRAL_DIRECTORY.size + _MAX_COMMENT_LENGTH)
+    fp.seek(size - tail_size)
+    tail = fp.read()
+
+    end = tail.rfind(b"PK\x05\x06")
+    if end == -1 or len(tail) - end < _END_OF_CENTRAL_DIRECTORY.size:
+        return None
+    *_, directory_size, directory_offset, _ = _END_OF_CENTRAL_DIRECTORY.unpack_from(
+        tail, end
+    )
+    directory_end = size - tail_size + end
+
+    # Archives with more than 65535 files have a ZIP64 end of central directory
+    # record, with the real size and offset of the central directory.
+    locator = end - _ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR.size
+    if locator >= 0 and tail.startswith(b"PK\x06\x07", locator):
+        _, _, directory_end, _ = _ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR.unpack_from(
+            tail, locator
+        )
+        fp.seek(directory_end)
+        record = fp.read(_ZIP64_END_OF_CENTRAL_DIRECTORY.size)
+        if len(record) != _ZIP64_END_OF_CENTRAL_DIRECTORY.size:
+            return None
+        if not record.startswith(b"PK\x06\x06"):
+            return None
+        *_, directory_size, directory_offset = _ZIP64_END_OF_CENTRAL_DIRECTORY.unpack(
+            record
+        )
+
+    # Archives with data before them, like self-extracting archives, have offsets
+    # relative to the start of the archive.
+    if directory_offset + directory_size != directory_end:
+        return None
+    fp.seek(directory_offset)
+    directory = fp.read(directory_size)
+
+    encoded_name = name.encode()
+    start = 0
+    while (index := directory.find(encoded_name, start)) != -1:
+        start = index + 1
+        offset = index - _CENTRAL_DIRECTORY_HEADER.size
+        if offset < 0:
+            continue
+        header = _CENTRAL_DIRECTORY_HEADER.unpack_from(directory, offset)
+        if header[0] == b"PK\x01\x02" and header[12] == len(encoded_name):
+            break
+    else:
+        return None
+
+    flag_bits, compress_type, _, _, crc = header[5:10]
+    compress_size, file_size, header_offset = header[10], header[11], header[18]
+    if (
+        flag_bits & 0x1
+        or compress_type not in {zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED}
+        # The sizes and offset are in a ZIP64 extra field.
+        or 0xFFFFFFFF in {compress_size, file_size, header_offset}
+    ):
+        return None
+
+    fp.seek(header_offset)
+    local_header = fp.read(_LOCAL_FILE_HEADER.size)
+    if len(local_header) < _LOCAL_FILE_HEADER.size:
+        return None
+    local = _LOCAL_FILE_HEADER.unpack(local_header)
+    if local[0] != b"PK\x03\x04" or fp.read(local[10]) != encoded_name:
+        return None
+    fp.seek(local[11], os.SEEK_CUR)
+    data = fp.read(compress_size)
+
+    try:
+        if compress_type == zipfile.ZIP_DEFLATED:
+            data = zlib.decompress(data, -zlib.MAX_WBITS)
+    except zlib.error:
+        return None
+    if len(data) != file_size or zlib.crc32(data) != crc:
+        return None
+    return data
+
 
 class Wheel(distribution.Distribution):
     def __init__(self, filename: str) -> None:
@@ -41,6 +145,14 @@ class Wheel(distribution.Distribution):
         else:
             return wheel_info.group("pyver")
 
+    @property
+    def metadata_name(self) -> Optional[str]:
+        """The name of the METADATA file, according to the wheel's filename."""
+        wheel_info = wheel_file_re.match(os.path.basename(self.filename))
+        if wheel_info is None or wheel_info.group("ver") is None:
+            return None
+        return f"{wheel_info.group('namever')}.dist-info/METADATA"
+
     @staticmethod
     def find_candidate_metadata_files(names: List[str]) -> List[List[str]]:
         """Filter files that may be METADATA files."""
@@ -53,6 +165,15 @@ class Wheel(distribution.Distribution):
             raise exceptions.InvalidDistribution("No such file: %s" % fqn)
 
         if fqn.endswith(".whl"):
+            # Look up the METADATA file directly, falling back to searching every
+            # file of the wheel, e.g. if the .dist-info directory is misnamed.
+            metadata_name = self.metadata_name
+            if metadata_name is not None:
+                with open(fqn, "rb") as fp:
+                    data = _read_zip_member(fp, metadata_name)
+                if data is not None and b"Metadata-Version" in data:
+                    return data
+
             archive = zipfile.ZipFile(fqn)
             names = archive.namelist()
 